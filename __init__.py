@@ -21,6 +21,17 @@ import bpy
 import os
 
 from . import addon_registration
+from . import startup_profiler
+
+# import_modules arguments
+
+# Modules which are only imported when they are needed
+modules_to_defer = (
+    "properties_data_modifier",
+    "edit_mesh_utils",
+    "attribute_utils",
+    "modifier_profiling",
+)
 
 # register_bl_classes arguments
 
@@ -49,12 +60,15 @@ addon_keymaps = []
 
 
 def register():
-    addon_registration.import_modules("modules")
-    addon_registration.register_bl_classes(modules_to_ignore=modules_to_ignore,
-                                           classes_to_ignore=classes_to_ignore,
-                                           panel_order=panel_order,
-                                           addon_name_for_counter=__package__)
-    addon_registration.call_register(module_order=module_order)
+    startup_profiler.start()
+
+    with startup_profiler.timed("total", "register"):
+        addon_registration.import_modules("modules", modules_to_defer=modules_to_defer)
+        addon_registration.register_bl_classes(modules_to_ignore=modules_to_ignore,
+                                               classes_to_ignore=classes_to_ignore,
+                                               panel_order=panel_order,
+                                               addon_name_for_counter=__package__)
+        addon_registration.call_register(module_order=module_order)
 
     # === Keymap ===
     wm = bpy.context.window_manager
@@ -94,7 +108,12 @@ def register():
             kmi.properties.type = 'remove modifier'
             addon_keymaps.append((km, kmi))
 
+    startup_profiler.wrap_load_post_handlers(__package__)
+    startup_profiler.dump()
+
 def unregister():
+    startup_profiler.unwrap_handlers()
+
     # === Keymap ===
     for km, kmi in addon_keymaps:
         km.keymap_items.remove(kmi)
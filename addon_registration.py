@@ -1,27 +1,34 @@
 """Utility module for registering classes and properties"""
 
+import hashlib
 import importlib
 import inspect
+import json
 import os
 import sys
+import tomllib
 import types
 
 from bpy.types import bpy_struct, WorkSpaceTool
 from bpy.utils import register_class, unregister_class
 from typing import Optional, Iterable
 import bpy
-from .modules.icons import load_icons
-from bpy.app.handlers import persistent
+from .startup_profiler import timed
 
 imported_modules: list[types.ModuleType] = []
+# Modules which are not imported on registration but on first use.
+deferred_modules: list[str] = []
 sorted_classes = []
 
-@persistent
-def load_icons_after_loading_file(dummy):
-    import functools
-    bpy.app.timers.register(functools.partial(load_icons), first_interval=2.0)
-    # second time to be sure, sometimes the first time is not enoght!
-    bpy.app.timers.register(functools.partial(load_icons), first_interval=12.0)
+# Bump this when the structure of the manifest changes so that old
+# manifests get discarded.
+MANIFEST_VERSION = 1
+
+# The manifest of the current registration. It's either read from the
+# disk (when the checksum still matches) or built during discovery.
+_manifest: dict = {}
+_manifest_needs_writing = False
+
 
 # Finding and importing modules
 # ======================================================================
@@ -57,7 +64,7 @@ def _find_modules(root_dir: str) -> set[str]:
     return modules
 
 
-def _import_modules(modules: set[str]) -> list[types.ModuleType]:
+def _import_modules(modules: Iterable[str]) -> list[types.ModuleType]:
     """Imports or reloads the given modules and returns them in a list.
 
     Modules must contain their relative paths.
@@ -68,8 +75,19 @@ def _import_modules(modules: set[str]) -> list[types.ModuleType]:
                 sys.modules.pop(mod.__name__)
             except KeyError:
                 pass
+
+    # Deferred modules may have been imported on demand, so they have to
+    # be reloaded too.
+    for mod in deferred_modules:
+        sys.modules.pop(f"{__package__}.{mod}", None)
     #print("modules import", modules)
-    return [importlib.import_module("." + mod, package=__package__) for mod in modules]
+    imported = []
+
+    for mod in modules:
+        with timed("import", mod):
+            imported.append(importlib.import_module("." + mod, package=__package__))
+
+    return imported
 
 
 def _store_modules(modules: list[types.ModuleType]) -> None:
@@ -176,6 +194,160 @@ def _sort_modules(module_order: list[str]) -> list[types.ModuleType]:
     return sorted_modules + unsorted_modules
 
 
+# Registration manifest
+# ======================================================================
+
+# Discovering modules and classes means walking the directory tree,
+# inspecting every module and sorting the found classes. The result only
+# changes when the source files change, so it's stored in a manifest
+# which is replayed on the next startup as long as its checksum matches.
+# The checksum only needs the directories listed in the manifest, so a
+# valid manifest avoids walking the tree.
+
+def _manifest_path() -> str:
+    config_dir = bpy.utils.user_resource('CONFIG')
+    return os.path.join(config_dir, __package__, "registration_manifest.json")
+
+
+def _get_addon_version() -> str:
+    manifest_file = os.path.join(os.path.dirname(__file__), "blender_manifest.toml")
+
+    try:
+        with open(manifest_file, 'rb') as f:
+            return str(tomllib.load(f).get("version", ""))
+    except (OSError, tomllib.TOMLDecodeError):
+        return ""
+
+
+def _get_module_directories(root_dir: str, module_names: Iterable[str]) -> list[str]:
+    """Returns the directories, relative to the add-on directory, which
+    contain the given modules, including root_dir.
+    """
+    directories = {root_dir}
+
+    for name in module_names:
+        directories.add(os.path.join(*name.split(".")[:-1]))
+
+    return sorted(directories)
+
+
+def _calc_checksum(root_dir: str, module_names: Iterable[str]) -> str:
+    """Calculates a checksum from the add-on version and the
+    modification times of the directories containing the given modules.
+
+    A directory's modification time changes when a file or directory is
+    added to, removed from or renamed in it, so the tree doesn't have to
+    be walked and every file doesn't have to be stat'ed. Editing a file
+    in place doesn't change the checksum; updating the add-on changes
+    its version.
+    """
+    current_directory = os.path.dirname(__file__)
+
+    hasher = hashlib.sha1()
+    hasher.update(repr((MANIFEST_VERSION, tuple(bpy.app.version), root_dir,
+                        _get_addon_version())).encode())
+
+    for directory in _get_module_directories(root_dir, module_names):
+        try:
+            mtime = os.stat(os.path.join(current_directory, directory)).st_mtime_ns
+        except OSError:
+            mtime = None
+        hasher.update(f"{directory}:{mtime}".encode())
+
+    return hasher.hexdigest()
+
+
+def _read_manifest() -> Optional[dict]:
+    """Reads the manifest from the disk. Returns None if it doesn't
+    exist or if it was written by another version of this module.
+    """
+    manifest_file = _manifest_path()
+
+    if not os.path.exists(manifest_file):
+        return None
+
+    with open(manifest_file, encoding='utf-8') as f:
+        try:
+            manifest = json.load(f)
+        except json.decoder.JSONDecodeError:
+            return None
+
+    if manifest.get("version") != MANIFEST_VERSION or not isinstance(manifest.get("modules"), list):
+        return None
+
+    return manifest
+
+
+def _write_manifest() -> None:
+    global _manifest_needs_writing
+
+    manifest_file = _manifest_path()
+
+    try:
+        os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(_manifest, f, indent=4)
+    except OSError as e:
+        print(f"{__package__}: Couldn't write the registration manifest: {e}")
+
+    _manifest_needs_writing = False
+
+
+def _get_manifest_items(key: str, args) -> Optional[list]:
+    """Returns the items stored under the given key if they were stored
+    with the same arguments. Otherwise returns None.
+    """
+    entry = _manifest.get(key)
+
+    if entry and entry["args"] == repr(args):
+        return entry["items"]
+
+    return None
+
+
+def _set_manifest_items(key: str, args, items: list) -> None:
+    global _manifest_needs_writing
+    _manifest[key] = {"args": repr(args), "items": items}
+    _manifest_needs_writing = True
+
+
+def _relative_module_name(module_name: str) -> str:
+    """Strips the add-on package from the given module name."""
+    return module_name[len(__package__) + 1:]
+
+
+def _imported_modules_by_name() -> dict[str, types.ModuleType]:
+    return {_relative_module_name(mod.__name__): mod for mod in imported_modules}
+
+
+def _modules_from_manifest(module_names: list[str]) -> Optional[list[types.ModuleType]]:
+    """Returns the imported modules matching the given names or None if
+    some module is missing.
+    """
+    modules_by_name = _imported_modules_by_name()
+
+    try:
+        return [modules_by_name[name] for name in module_names]
+    except KeyError:
+        return None
+
+
+def _classes_from_manifest(class_items: list[list[str]]) -> Optional[list]:
+    """Returns the classes matching the given module and class names or
+    None if some class can't be found.
+    """
+    modules_by_name = _imported_modules_by_name()
+    classes = []
+
+    for module_name, class_name in class_items:
+        cls = getattr(modules_by_name.get(module_name), class_name, None)
+        if not inspect.isclass(cls):
+            return None
+        classes.append(cls)
+
+    return classes
+
+
 # Registering classes
 # ======================================================================
 
@@ -183,7 +355,8 @@ def _register_classes(classes, addon_name_for_counter=None):
     """Registers all add-on classes that inherit from bpy_struct from
     all modules."""
     for cls in classes:
-        register_class(cls)
+        with timed("register_class", cls.__name__):
+            register_class(cls)
 
     if addon_name_for_counter:
         print(f"{addon_name_for_counter}: Registered {str(len(classes))} classes")
@@ -192,13 +365,52 @@ def _register_classes(classes, addon_name_for_counter=None):
 # Public functions
 # ======================================================================
 
-def import_modules(root_dir):
+def import_modules(root_dir, modules_to_defer=None):
     """Imports all modules in the given directory in order to make them
     available for other functions in addon_registration.
+
+    If the registration manifest is still valid, the modules are
+    imported in the order stored in it. Otherwise the modules are
+    discovered and a new manifest is started.
+
+    Modules in modules_to_defer are not imported. They are expected to
+    be imported by the code that uses them. This means they can't
+    contain classes to register or a register function.
     """
-    modules = _find_modules(root_dir)
-    modules = _import_modules(modules)
+    global _manifest, _manifest_needs_writing, deferred_modules
+
+    with timed("manifest", "read"):
+        manifest = _read_manifest()
+        if manifest is not None:
+            checksum = _calc_checksum(root_dir, manifest["modules"])
+            if manifest.get("checksum") != checksum:
+                manifest = None
+
+    if manifest is None:
+        with timed("manifest", "find_modules"):
+            found_modules = sorted(_find_modules(root_dir))
+            checksum = _calc_checksum(root_dir, found_modules)
+        _manifest = {
+            "version": MANIFEST_VERSION,
+            "checksum": checksum,
+            "modules": found_modules
+        }
+        _manifest_needs_writing = True
+    else:
+        _manifest = manifest
+        _manifest_needs_writing = False
+
+    module_names = _manifest["modules"]
+
+    if modules_to_defer:
+        deferred = [m for m in module_names if m.split(".")[-1] in modules_to_defer]
+        module_names = [m for m in module_names if m not in deferred]
+    else:
+        deferred = []
+
+    modules = _import_modules(module_names)
     _store_modules(modules)
+    deferred_modules = deferred
 
 
 def register_bl_classes(modules_to_ignore=None, classes_to_ignore=None, panel_order=None,
@@ -222,7 +434,27 @@ def register_bl_classes(modules_to_ignore=None, classes_to_ignore=None, panel_or
     If you have panel classes, panel_order is needed because the order
     of panels in Blender's UI is defined by the order they are
     registered in.
+
+    The classes are read from the registration manifest when it's valid
+    for the given arguments; otherwise they are discovered and stored
+    in the manifest.
     """
+    args = (modules_to_ignore, classes_to_ignore, panel_order)
+    class_items = _get_manifest_items("classes", args)
+    classes = _classes_from_manifest(class_items) if class_items is not None else None
+
+    if classes is None:
+        with timed("manifest", "discover_classes"):
+            classes = _discover_bl_classes(modules_to_ignore, classes_to_ignore, panel_order)
+        class_items = [[_relative_module_name(cls.__module__), cls.__name__] for cls in classes]
+        _set_manifest_items("classes", args, class_items)
+
+    _store_classes(classes)
+    _register_classes(classes, addon_name_for_counter)
+
+
+def _discover_bl_classes(modules_to_ignore=None, classes_to_ignore=None, panel_order=None):
+    """Finds and sorts the add-on classes of the imported modules."""
     if modules_to_ignore:
         modules = [m for m in imported_modules
                    if m.__name__.split(".")[-1] not in modules_to_ignore]
@@ -238,8 +470,7 @@ def register_bl_classes(modules_to_ignore=None, classes_to_ignore=None, panel_or
     if panel_order:
         classes = _sort_panel_classes(classes, panel_order)
 
-    _store_classes(classes)
-    _register_classes(classes, addon_name_for_counter)
+    return classes
 
 
 def unregister_bl_classes(addon_name_for_counter=None):
@@ -270,14 +501,21 @@ def call_register(module_order=None):
 
     import_modules must have been called before this.
     """
-    modules = _sort_modules(module_order) if module_order else imported_modules
+    module_names = _get_manifest_items("register_hooks", module_order)
+    modules = _modules_from_manifest(module_names) if module_names is not None else None
+
+    if modules is None:
+        sorted_modules = _sort_modules(module_order) if module_order else imported_modules
+        modules = [mod for mod in sorted_modules if hasattr(mod, "register")]
+        module_names = [_relative_module_name(mod.__name__) for mod in modules]
+        _set_manifest_items("register_hooks", module_order, module_names)
 
     for mod in modules:
-        if hasattr(mod, "register"):
+        with timed("register", _relative_module_name(mod.__name__)):
             mod.register()
 
-    # needed since sometimes it fails to properly load the icons in some files due to a Blender bug! This is a workaround
-    bpy.app.handlers.load_post.append(load_icons_after_loading_file)
+    if _manifest_needs_writing:
+        _write_manifest()
 
 
 def call_unregister(module_order: Optional[list[str]] = None) -> None:
@@ -293,6 +531,4 @@ def call_unregister(module_order: Optional[list[str]] = None) -> None:
     for mod in modules:
         if hasattr(mod, "unregister"):
             mod.unregister()
-
-    bpy.app.handlers.load_post.remove(load_icons_after_loading_file)
     
\ No newline at end of file
@@ -0,0 +1,481 @@
+"""Implementation of the attribute operations of the Attributes panel.
+
+This module isn't imported when the add-on is enabled. The operator in
+ui/attributes_ui.py imports it when it's executed for the first time.
+
+Attribute values and selection are read and written with
+foreach_get/foreach_set over NumPy arrays. In Edit Mode, this requires
+switching to Object Mode and back once per operation. Small edit meshes
+are instead accessed through the layers of the edit BMesh, element by
+element, which is faster than the mode switch for them. Attributes which
+have no BMesh layer type, e.g. quaternions, always use the mode switch.
+"""
+
+from contextlib import contextmanager
+
+import bpy
+
+
+# Property used with foreach_get/foreach_set, number of components and
+# NumPy dtype per attribute data type. STRING attributes can't be
+# accessed in bulk, so they are not supported.
+ATTRIBUTE_LAYOUTS = {
+    'FLOAT': ("value", 1, 'float32'),
+    'INT': ("value", 1, 'int32'),
+    'INT8': ("value", 1, 'int32'),
+    'BOOLEAN': ("value", 1, 'bool'),
+    'FLOAT_VECTOR': ("vector", 3, 'float32'),
+    'FLOAT2': ("vector", 2, 'float32'),
+    'INT32_2D': ("value", 2, 'int32'),
+    'FLOAT_COLOR': ("color", 4, 'float32'),
+    'BYTE_COLOR': ("color", 4, 'float32'),
+    'QUATERNION': ("value", 4, 'float32'),
+    'FLOAT4X4': ("value", 16, 'float32'),
+}
+
+# Values which "Remove" resets the attribute to
+_CLEARED_VALUES = {
+    'BOOLEAN': False,
+    'QUATERNION': (1.0, 0.0, 0.0, 0.0),
+    'FLOAT4X4': (1.0, 0.0, 0.0, 0.0,
+                 0.0, 1.0, 0.0, 0.0,
+                 0.0, 0.0, 1.0, 0.0,
+                 0.0, 0.0, 0.0, 1.0),
+}
+
+# BMesh layer type per attribute data type
+_BMESH_LAYER_TYPES = {
+    'FLOAT': "float",
+    'INT': "int",
+    'BOOLEAN': "bool",
+    'FLOAT_VECTOR': "float_vector",
+    'FLOAT_COLOR': "float_color",
+    'BYTE_COLOR': "color",
+}
+
+# Edit meshes with more elements in the attribute's domain than this are
+# accessed in Object Mode with NumPy instead of through the edit BMesh
+BMESH_MAX_ELEMENTS = 10000
+
+# Data types whose values are sequences
+_VECTOR_TYPES = {'FLOAT_VECTOR', 'FLOAT_COLOR', 'BYTE_COLOR'}
+
+_SELECT_MODES = {
+    'POINT': (True, False, False),
+    'EDGE': (False, True, False),
+    'FACE': (False, False, True),
+    'CORNER': (True, False, False),
+}
+
+
+def is_supported(attribute):
+    return attribute is not None and attribute.data_type in ATTRIBUTE_LAYOUTS
+
+
+@contextmanager
+def _mesh_data_access(obj):
+    """Makes the mesh data of the object up to date for the duration of
+    the with block. In Edit Mode, the object is switched to Object Mode
+    and back, which also writes the changes back to the edit mesh.
+    """
+    in_edit_mode = obj.mode == 'EDIT'
+
+    if in_edit_mode:
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    try:
+        yield
+    finally:
+        if in_edit_mode:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+
+# Edit Mode
+# ======================================================================
+
+def _get_bmesh_layer(bm, mesh, attribute):
+    """Returns the BMesh layer of the attribute or None if its data type
+    has no BMesh layer type or the mesh is too large to be accessed
+    element by element.
+    """
+    layer_type = _BMESH_LAYER_TYPES.get(attribute.data_type)
+
+    if layer_type is None:
+        return None
+
+    # Loops can't be counted in the BMesh, the mesh data from the last
+    # sync is close enough
+    element_count = {'POINT': len(bm.verts), 'EDGE': len(bm.edges),
+                     'FACE': len(bm.faces), 'CORNER': len(mesh.loops)}[attribute.domain]
+
+    if element_count > BMESH_MAX_ELEMENTS:
+        return None
+
+    elements = {'POINT': bm.verts, 'EDGE': bm.edges, 'FACE': bm.faces,
+                'CORNER': bm.loops}[attribute.domain]
+    layers = getattr(elements.layers, layer_type, None)
+
+    return layers.get(attribute.name) if layers is not None else None
+
+
+def _iter_bmesh_elements(bm, domain, selected_only=False):
+    """Yields the elements of the domain. A face corner is selected when
+    its face is selected.
+    """
+    if domain == 'CORNER':
+        for face in bm.faces:
+            if not selected_only or face.select:
+                yield from face.loops
+        return
+
+    elements = {'POINT': bm.verts, 'EDGE': bm.edges, 'FACE': bm.faces}[domain]
+
+    for elem in elements:
+        if not selected_only or elem.select:
+            yield elem
+
+
+def _bmesh_set_selected_values(mesh, attribute, value):
+    """Sets the attribute of the selected elements of the edit mesh.
+    Returns False if the attribute isn't accessed through BMesh.
+    """
+    import bmesh
+
+    bm = bmesh.from_edit_mesh(mesh)
+    layer = _get_bmesh_layer(bm, mesh, attribute)
+
+    if layer is None:
+        return False
+
+    for elem in _iter_bmesh_elements(bm, attribute.domain, selected_only=True):
+        elem[layer] = value
+
+    bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+
+    return True
+
+
+def _bmesh_select(mesh, attribute):
+    """Selects the visible elements of the edit mesh where the attribute
+    isn't zero. Returns False if the attribute isn't accessed through
+    BMesh.
+    """
+    import bmesh
+
+    bm = bmesh.from_edit_mesh(mesh)
+    layer = _get_bmesh_layer(bm, mesh, attribute)
+
+    if layer is None:
+        return False
+
+    is_vector = attribute.data_type in _VECTOR_TYPES
+    is_corner = attribute.domain == 'CORNER'
+
+    for elem in _iter_bmesh_elements(bm, attribute.domain):
+        value = elem[layer]
+        if not (any(value) if is_vector else value):
+            continue
+        # Selecting a corner selects its vertex
+        target = elem.vert if is_corner else elem
+        if not target.hide:
+            target.select_set(True)
+
+    bm.select_flush_mode()
+    bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+
+    return True
+
+
+# Reading and writing
+# ======================================================================
+
+def read_attribute(attribute):
+    """Returns the values of the attribute as an array with one row per
+    element.
+    """
+    import numpy as np
+
+    value_key, size, dtype = ATTRIBUTE_LAYOUTS[attribute.data_type]
+    values = np.empty(len(attribute.data) * size, dtype=dtype)
+    attribute.data.foreach_get(value_key, values)
+
+    return values.reshape(-1, size)
+
+
+def _write_attribute(attribute, values):
+    value_key = ATTRIBUTE_LAYOUTS[attribute.data_type][0]
+    attribute.data.foreach_set(value_key, values.ravel())
+
+
+def _read_bools(collection, prop):
+    import numpy as np
+
+    values = np.empty(len(collection), dtype=bool)
+    collection.foreach_get(prop, values)
+
+    return values
+
+
+def _read_ints(collection, prop, size=1):
+    import numpy as np
+
+    values = np.empty(len(collection) * size, dtype=np.int32)
+    collection.foreach_get(prop, values)
+
+    return values.reshape(-1, size) if size > 1 else values
+
+
+def get_selection_mask(mesh, domain):
+    """Returns a boolean array of the selected elements of the given
+    domain. A face corner is selected when its face is selected.
+    """
+    import numpy as np
+
+    if domain == 'POINT':
+        return _read_bools(mesh.vertices, "select")
+    if domain == 'EDGE':
+        return _read_bools(mesh.edges, "select")
+    if domain == 'FACE':
+        return _read_bools(mesh.polygons, "select")
+    if domain == 'CORNER':
+        face_selection = _read_bools(mesh.polygons, "select")
+        return np.repeat(face_selection, _read_ints(mesh.polygons, "loop_total"))
+
+    return np.zeros(0, dtype=bool)
+
+
+def _get_hidden_mask(mesh, domain):
+    """Returns a boolean array of the hidden elements of the given
+    domain. A face corner is hidden when its vertex is hidden.
+    """
+    if domain == 'EDGE':
+        return _read_bools(mesh.edges, "hide")
+    if domain == 'FACE':
+        return _read_bools(mesh.polygons, "hide")
+
+    vert_hidden = _read_bools(mesh.vertices, "hide")
+
+    if domain == 'CORNER':
+        return vert_hidden[_read_ints(mesh.loops, "vertex_index")]
+
+    return vert_hidden
+
+
+def _set_values(attribute, mask, value):
+    values = read_attribute(attribute)
+    values[mask] = value
+    _write_attribute(attribute, values)
+
+
+def _get_value_to_assign(context, data_type):
+    wm = context.window_manager
+
+    if data_type == 'BOOLEAN':
+        return True
+    if data_type == 'FLOAT':
+        return wm.atri_float_value
+    if data_type in {'INT', 'INT8'}:
+        return wm.atri_int_value
+    if data_type == 'INT32_2D':
+        return (wm.atri_int_value, wm.atri_int_value)
+    if data_type == 'FLOAT_VECTOR':
+        return tuple(wm.atri_vector_value)
+    if data_type == 'FLOAT2':
+        return tuple(wm.atri_vector_value)[:2]
+    if data_type in {'FLOAT_COLOR', 'BYTE_COLOR'}:
+        return tuple(wm.atri_float_color_value)
+
+    # There's no input for quaternions and matrices
+    return None
+
+
+def _set_selected_values(obj, value):
+    """Sets the active attribute of the selected elements to the value."""
+    mesh = obj.data
+
+    if obj.mode == 'EDIT' and _bmesh_set_selected_values(mesh, mesh.attributes.active, value):
+        return
+
+    with _mesh_data_access(obj):
+        attribute = mesh.attributes.active
+        _set_values(attribute, get_selection_mask(mesh, attribute.domain), value)
+        mesh.update()
+
+
+def assign_attribute_value(context):
+    """Assigns the value set in the Attributes panel to the selected
+    elements of the active attribute.
+    """
+    obj = context.object
+    attribute = obj.data.attributes.active
+
+    if not is_supported(attribute):
+        return
+
+    value = _get_value_to_assign(context, attribute.data_type)
+
+    if value is not None:
+        _set_selected_values(obj, value)
+
+
+def remove_attribute_value(context):
+    """Resets the active attribute of the selected elements to zero, or
+    to identity for quaternions and matrices.
+    """
+    obj = context.object
+    attribute = obj.data.attributes.active
+
+    if not is_supported(attribute):
+        return
+
+    value = _CLEARED_VALUES.get(attribute.data_type, 0)
+
+    if attribute.data_type in _VECTOR_TYPES:
+        value = (0.0,) * ATTRIBUTE_LAYOUTS[attribute.data_type][1]
+
+    _set_selected_values(obj, value)
+
+
+# Selection
+# ======================================================================
+
+def _select(mesh, domain, mask):
+    """Adds the visible elements in the mask to the selection and
+    flushes the selection to the other domains.
+    """
+    import numpy as np
+
+    mask = mask & ~_get_hidden_mask(mesh, domain)
+
+    vert_selection = _read_bools(mesh.vertices, "select")
+    edge_selection = _read_bools(mesh.edges, "select")
+    face_selection = _read_bools(mesh.polygons, "select")
+
+    edge_verts = _read_ints(mesh.edges, "vertices", size=2)
+    loop_verts = _read_ints(mesh.loops, "vertex_index")
+    loop_edges = _read_ints(mesh.loops, "edge_index")
+    loop_starts = _read_ints(mesh.polygons, "loop_start")
+    loop_totals = _read_ints(mesh.polygons, "loop_total")
+    loop_faces = np.repeat(np.arange(len(mesh.polygons)), loop_totals)
+
+    def faces_with_all(loop_selection):
+        if not len(loop_starts):
+            return np.zeros(0, dtype=bool)
+        return np.logical_and.reduceat(loop_selection, loop_starts)
+
+    if domain in {'POINT', 'CORNER'}:
+        if domain == 'CORNER':
+            vert_selection[loop_verts[mask]] = True
+        else:
+            vert_selection |= mask
+        edge_selection |= vert_selection[edge_verts].all(axis=1)
+        face_selection |= faces_with_all(vert_selection[loop_verts])
+
+    elif domain == 'EDGE':
+        edge_selection |= mask
+        vert_selection[edge_verts[edge_selection].ravel()] = True
+        face_selection |= faces_with_all(edge_selection[loop_edges])
+
+    elif domain == 'FACE':
+        face_selection |= mask
+        selected_loops = face_selection[loop_faces]
+        vert_selection[loop_verts[selected_loops]] = True
+        edge_selection[loop_edges[selected_loops]] = True
+
+    mesh.vertices.foreach_set("select", vert_selection)
+    mesh.edges.foreach_set("select", edge_selection)
+    mesh.polygons.foreach_set("select", face_selection)
+    mesh.update()
+
+
+def select_by_attribute(context):
+    """Selects the elements where the active attribute isn't zero."""
+    obj = context.object
+    attribute = obj.data.attributes.active
+
+    if not is_supported(attribute):
+        return
+
+    if obj.mode == 'EDIT':
+        context.tool_settings.mesh_select_mode = _SELECT_MODES[attribute.domain]
+
+        if _bmesh_select(obj.data, attribute):
+            return
+
+    with _mesh_data_access(obj):
+        mesh = obj.data
+        attribute = mesh.attributes.active
+        mask = read_attribute(attribute).any(axis=1)
+        _select(mesh, attribute.domain, mask)
+
+
+def add_selection_group(context, domain):
+    """Adds a boolean attribute of the given domain and assigns the
+    current selection to it.
+    """
+    names = {'POINT': "Vertex_Group", 'EDGE': "Edge_Group", 'FACE': "Face_Group"}
+    obj = context.object
+
+    mesh = obj.data
+    name = mesh.attributes.new(names[domain], 'BOOLEAN', domain).name
+    mesh.attributes.active = mesh.attributes[name]
+
+    if obj.mode == 'EDIT' and _bmesh_set_selected_values(mesh, mesh.attributes[name], True):
+        return
+
+    with _mesh_data_access(obj):
+        _write_attribute(mesh.attributes[name], get_selection_mask(mesh, domain))
+        mesh.update()
+
+
+# Statistics
+# ======================================================================
+
+def compute_attribute_stats(attribute, bins=16):
+    """Returns a dictionary of statistics of the attribute: element
+    count, per component min, max and mean, the number of elements which
+    aren't zero and a histogram. The histogram is computed from the
+    values of scalar attributes and from the lengths of the values of
+    other attributes.
+    """
+    import numpy as np
+
+    values = read_attribute(attribute)
+    stats = {
+        "count": len(values),
+        "size": values.shape[1],
+        "non_zero": int(np.count_nonzero(values.any(axis=1))),
+    }
+
+    if not len(values):
+        stats.update(min=(), max=(), mean=(), histogram=[], histogram_range=(0.0, 0.0))
+        return stats
+
+    values = values.astype(np.float64)
+    stats["min"] = tuple(values.min(axis=0))
+    stats["max"] = tuple(values.max(axis=0))
+    stats["mean"] = tuple(values.mean(axis=0))
+
+    if attribute.data_type == 'BOOLEAN':
+        true_count = stats["non_zero"]
+        stats["histogram"] = [stats["count"] - true_count, true_count]
+        stats["histogram_range"] = (0.0, 1.0)
+        return stats
+
+    if values.shape[1] == 1:
+        samples = values[:, 0]
+    else:
+        samples = np.linalg.norm(values, axis=1)
+
+    samples = samples[np.isfinite(samples)]
+
+    if not len(samples):
+        stats["histogram"] = []
+        stats["histogram_range"] = (0.0, 0.0)
+        return stats
+
+    histogram, edges = np.histogram(samples, bins=bins)
+    stats["histogram"] = histogram.tolist()
+    stats["histogram_range"] = (float(edges[0]), float(edges[-1]))
+
+    return stats
@@ -0,0 +1,623 @@
+"""Implementation of the Edit Mesh modifier operators.
+
+This module isn't imported when the add-on is enabled. The operators in
+operators/edit_mesh.py import it when they are executed for the first
+time.
+"""
+
+from contextlib import contextmanager
+
+import bpy
+
+from .utils import estimate_mesh_bytes, is_edit_mesh_modifier
+
+
+def edit_mesh_node_group():
+    edit_mesh = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = "Edit Mesh")
+
+    edit_mesh.color_tag = 'NONE'
+    edit_mesh.description = ""
+    edit_mesh.is_modifier = True
+
+    #edit_mesh interface
+    #Socket Geometry
+    geometry_socket = edit_mesh.interface.new_socket(name = "Geometry", in_out='OUTPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket.attribute_domain = 'POINT'
+
+    #Socket Geometry
+    geometry_socket_1 = edit_mesh.interface.new_socket(name = "Geometry", in_out='INPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket_1.attribute_domain = 'POINT'
+
+
+    #initialize edit_mesh nodes
+    #node Group Input
+    group_input = edit_mesh.nodes.new("NodeGroupInput")
+    group_input.name = "Group Input"
+
+    #Socket Index
+    index_socket = edit_mesh.interface.new_socket(name = "Index", in_out='INPUT', socket_type = 'NodeSocketInt')
+    index_socket.default_value = 0
+    index_socket.min_value = -2147483648
+    index_socket.max_value = 2147483647
+    index_socket.subtype = 'NONE'
+    index_socket.attribute_domain = 'POINT'
+
+
+    #node Group Output
+    group_output = edit_mesh.nodes.new("NodeGroupOutput")
+    group_output.name = "Group Output"
+    group_output.is_active_output = True
+
+    #Set locations
+    group_input.location = (-340.0, 0.0)
+    group_output.location = (200.0, 0.0)
+
+    #Set dimensions
+    group_input.width, group_input.height = 140.0, 100.0
+    group_output.width, group_output.height = 140.0, 100.0
+
+    #initialize edit_mesh links
+    #group_input.Geometry -> group_output.Geometry
+    edit_mesh.links.new(group_input.outputs[0], group_output.inputs[0])
+    return edit_mesh
+
+
+@contextmanager
+def object_mode():
+    """Leaves Edit Mode for the duration of the with block and enters it
+    again afterwards. Swapping the data of an object is only possible in
+    Object Mode.
+    """
+    in_edit_mode = bpy.context.mode == 'EDIT_MESH'
+
+    if in_edit_mode:
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    try:
+        yield
+    finally:
+        if in_edit_mode:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+
+def set_modifiers_visibility(obj, show_viewport, show_render):
+    """Sets the visibility of all modifiers of the object from the given
+    sequences of booleans with one write per property.
+    """
+    obj.modifiers.foreach_set("show_viewport", show_viewport)
+    obj.modifiers.foreach_set("show_render", show_render)
+    # foreach_set doesn't run the RNA update, so the object has to be
+    # tagged for the depsgraph to evaluate the new visibility
+    obj.update_tag()
+
+
+def apply_modifiers(obj):
+    """Replaces the data of the object with its evaluated mesh and hides
+    all modifiers. The object needs to be in Object Mode.
+
+    Returns the object, which is a new object when a curve was converted.
+    """
+    if not obj:
+        return None
+
+    context = bpy.context
+    depsgraph = context.evaluated_depsgraph_get()
+    object_eval = obj.evaluated_get(depsgraph)
+    mesh_from_eval = bpy.data.meshes.new_from_object(object_eval, depsgraph=depsgraph)
+
+    if obj.type == 'MESH':
+        old_mesh = obj.data
+        name = old_mesh.name
+        obj.data = mesh_from_eval
+
+        # Remove the old mesh if nothing else uses it and keep its name
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+            mesh_from_eval.name = name
+
+        hidden = [False] * len(obj.modifiers)
+        set_modifiers_visibility(obj, hidden, hidden)
+
+        return obj
+
+    if obj.type == 'CURVE':
+        name = obj.name
+        was_active = context.view_layer.objects.active == obj
+
+        new_obj = bpy.data.objects.new("temp_mesh", mesh_from_eval)
+        obj.users_collection[0].objects.link(new_obj)
+        new_obj.matrix_world = obj.matrix_world
+        new_obj.select_set(True)
+        bpy.data.objects.remove(obj)
+
+        new_obj.name = name # restore the original name
+
+        if was_active:  #set the new object as active if the old object was active
+            context.view_layer.objects.active = new_obj
+
+        return new_obj
+
+    bpy.data.meshes.remove(mesh_from_eval)
+    return obj
+
+
+# Backups
+# ======================================================================
+
+# A backup is either a full copy of the mesh or, when only the vertex
+# positions differ from an earlier full backup (the anchor), a small
+# mesh which only contains the moved vertices. Their offsets are stored
+# as vertex positions and their indices in an integer attribute.
+
+DELTA_MARKER = "ml_edit_mesh_delta"
+ANCHOR_KEY = "ml_edit_mesh_anchor"
+DELTA_INDEX_ATTRIBUTE = "ml_vertex_index"
+
+# Number of components and the NumPy dtype per attribute data type.
+# STRING attributes can't be read in bulk, so they are not included.
+_ATTRIBUTE_LAYOUTS = {
+    'FLOAT': ("value", 1, 'float32'),
+    'INT': ("value", 1, 'int32'),
+    'INT8': ("value", 1, 'int32'),
+    'BOOLEAN': ("value", 1, 'bool'),
+    'FLOAT_VECTOR': ("vector", 3, 'float32'),
+    'FLOAT2': ("vector", 2, 'float32'),
+    'INT32_2D': ("value", 2, 'int32'),
+    'FLOAT_COLOR': ("color", 4, 'float32'),
+    'BYTE_COLOR': ("color", 4, 'float32'),
+    'QUATERNION': ("value", 4, 'float32'),
+    'FLOAT4X4': ("value", 16, 'float32'),
+}
+
+
+def _read_attribute(attribute):
+    import numpy as np
+
+    value_key, size, dtype = _ATTRIBUTE_LAYOUTS[attribute.data_type]
+    values = np.empty(len(attribute.data) * size, dtype=dtype)
+    attribute.data.foreach_get(value_key, values)
+    return values
+
+
+def _read_positions(mesh):
+    import numpy as np
+
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    return positions.reshape(-1, 3)
+
+
+def _read_topology(mesh):
+    import numpy as np
+
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    return edge_verts, loop_verts, loop_starts
+
+
+def _meshes_match_except_positions(mesh, other_mesh):
+    """Check if the given meshes have the same topology, materials and
+    attributes apart from the vertex positions.
+    """
+    import numpy as np
+
+    if (len(mesh.vertices) != len(other_mesh.vertices)
+            or len(mesh.edges) != len(other_mesh.edges)
+            or len(mesh.loops) != len(other_mesh.loops)
+            or len(mesh.polygons) != len(other_mesh.polygons)):
+        return False
+
+    if mesh.shape_keys or other_mesh.shape_keys:
+        return False
+
+    if list(mesh.materials) != list(other_mesh.materials):
+        return False
+
+    for array, other_array in zip(_read_topology(mesh), _read_topology(other_mesh)):
+        if not np.array_equal(array, other_array):
+            return False
+
+    attributes = {attr.name: attr for attr in mesh.attributes if attr.name != "position"}
+    other_attributes = {attr.name: attr for attr in other_mesh.attributes
+                        if attr.name != "position"}
+
+    if attributes.keys() != other_attributes.keys():
+        return False
+
+    for name, attr in attributes.items():
+        other_attr = other_attributes[name]
+        if attr.domain != other_attr.domain or attr.data_type != other_attr.data_type:
+            return False
+        if attr.data_type not in _ATTRIBUTE_LAYOUTS:
+            return False
+        if not np.array_equal(_read_attribute(attr), _read_attribute(other_attr)):
+            return False
+
+    return True
+
+
+def is_delta_backup(mesh):
+    return bool(mesh.get(DELTA_MARKER))
+
+
+def _get_backup_name(obj, index):
+    base_name = obj.data.name.split("_edit_mesh_")[0]
+    return base_name + "_edit_mesh_" + str(index)
+
+
+def _find_anchor(obj, backups):
+    """Find the latest full backup of the object which only differs
+    from the current mesh by vertex positions.
+    """
+    # Vertex group weights can't be compared in bulk
+    if obj.vertex_groups:
+        return None
+
+    for backup in reversed(backups):
+        if backup is None or is_delta_backup(backup):
+            continue
+        if _meshes_match_except_positions(obj.data, backup):
+            return backup
+        # Only the latest full backup is tried to keep this fast
+        break
+
+    return None
+
+
+def create_backup(obj, backups, index):
+    """Create a backup of the current mesh of the object.
+
+    backups is the list of existing backup meshes of the object from
+    the oldest to the newest. If the latest full backup only differs
+    from the current mesh by vertex positions, a delta backup is
+    created against it; otherwise the mesh is copied.
+    """
+    import numpy as np
+
+    name = _get_backup_name(obj, index)
+    anchor = _find_anchor(obj, backups)
+
+    if anchor is None:
+        backup = obj.data.copy()
+        backup.name = name
+        backup.use_fake_user = True
+        return backup
+
+    offsets = _read_positions(obj.data) - _read_positions(anchor)
+    moved = np.flatnonzero(np.any(offsets != 0, axis=1))
+
+    backup = bpy.data.meshes.new(name)
+    backup.vertices.add(len(moved))
+    backup.vertices.foreach_set("co", offsets[moved].ravel())
+    index_attr = backup.attributes.new(DELTA_INDEX_ATTRIBUTE, 'INT', 'POINT')
+    index_attr.data.foreach_set("value", moved.astype(np.int32))
+    backup[DELTA_MARKER] = True
+    backup[ANCHOR_KEY] = anchor
+    backup.use_fake_user = True
+
+    return backup
+
+
+def restore_backup(backup):
+    """Return a full mesh of the given backup.
+
+    A delta backup is applied onto a copy of its anchor and removed.
+    """
+    import numpy as np
+
+    if not is_delta_backup(backup):
+        return backup
+
+    anchor = backup[ANCHOR_KEY]
+    mesh = anchor.copy()
+    mesh.use_fake_user = False
+
+    moved = np.empty(len(backup.vertices), dtype=np.int32)
+    backup.attributes[DELTA_INDEX_ATTRIBUTE].data.foreach_get("value", moved)
+
+    positions = _read_positions(mesh)
+    positions[moved] += _read_positions(backup)
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.update()
+
+    name = backup.name
+    bpy.data.meshes.remove(backup)
+    mesh.name = name
+
+    return mesh
+
+
+def expand_delta_backups(obj, anchor):
+    """Turn the delta backups of the object which use the given anchor
+    into full backups. This needs to be done before the anchor is used
+    as object data again, since it can then be edited.
+    """
+    for index, backup in _get_backups(obj):
+        if backup is not None and is_delta_backup(backup) and backup[ANCHOR_KEY] == anchor:
+            full_backup = restore_backup(backup)
+            full_backup.use_fake_user = True
+            _set_backup(obj, index, full_backup)
+
+
+# Backup storage
+# ======================================================================
+
+# Backups are stored in Object.ml_edit_mesh.backups. The name of each
+# entry is the index stored in the Edit Mesh modifier. Files saved with
+# older versions store them in "edit_mesh_data_<index>" custom
+# properties, which are still read.
+
+LEGACY_PROP_PREFIX = "edit_mesh_data_"
+
+
+def _get_legacy_prop_names(obj):
+    return [key for key in obj.keys() if key.startswith(LEGACY_PROP_PREFIX)]
+
+
+def _get_backups(obj):
+    """Returns (index, mesh) pairs of the backups stored on the object,
+    from the oldest to the newest.
+    """
+    backups = [(int(prop_name[len(LEGACY_PROP_PREFIX):]), obj[prop_name])
+               for prop_name in _get_legacy_prop_names(obj)]
+    backups.extend((int(entry.name), entry.mesh) for entry in obj.ml_edit_mesh.backups)
+    backups.sort(key=lambda backup: backup[0])
+    return backups
+
+
+def _store_backup(obj, mesh):
+    """Stores the mesh as a new backup and returns its index."""
+    ml_edit_mesh = obj.ml_edit_mesh
+    index = ml_edit_mesh.next_index
+
+    # Skip indices used by backups stored in an older version
+    while LEGACY_PROP_PREFIX + str(index) in obj:
+        index += 1
+
+    entry = ml_edit_mesh.backups.add()
+    entry.name = str(index)
+    entry.mesh = mesh
+    ml_edit_mesh.next_index = index + 1
+
+    return index
+
+
+def _get_backup(obj, index):
+    entry = obj.ml_edit_mesh.backups.get(str(index))
+
+    if entry is not None:
+        return entry.mesh
+
+    return obj.get(LEGACY_PROP_PREFIX + str(index))
+
+
+def _set_backup(obj, index, mesh):
+    entry = obj.ml_edit_mesh.backups.get(str(index))
+
+    if entry is not None:
+        entry.mesh = mesh
+    else:
+        obj[LEGACY_PROP_PREFIX + str(index)] = mesh
+
+
+def _remove_backup(obj, index):
+    backups = obj.ml_edit_mesh.backups
+    entry_index = backups.find(str(index))
+
+    if entry_index != -1:
+        backups.remove(entry_index)
+
+    prop_name = LEGACY_PROP_PREFIX + str(index)
+    if prop_name in obj:
+        del obj[prop_name]
+
+
+def _clear_backups(obj):
+    obj.ml_edit_mesh.backups.clear()
+    obj.ml_edit_mesh.next_index = 0
+
+    for prop_name in _get_legacy_prop_names(obj):
+        del obj[prop_name]
+
+
+def add_edit_mesh_modifier(obj, insert_after_active=False):
+    """Stores a backup of the mesh of the given object, applies the
+    modifiers and adds an Edit Mesh modifier which references the
+    backup.
+    """
+    with object_mode():
+        _add_edit_mesh_modifier(obj, insert_after_active)
+
+
+def _add_edit_mesh_modifier(obj, insert_after_active):
+    index = obj.ml_edit_mesh.next_index
+    backup_mesh_data = create_backup(obj, [backup for _, backup in _get_backups(obj)], index)
+
+    index = _store_backup(obj, backup_mesh_data)
+    # The index may have been bumped past backups of an older version
+    backup_mesh_data.name = _get_backup_name(obj, index)
+
+    mod_count = len(obj.modifiers)
+    show_viewport = [False] * mod_count
+    show_render = [False] * mod_count
+
+    if insert_after_active:
+        active_mod_index = obj.ml_modifier_active_index
+
+        # Hide the modifiers after the active one so they aren't applied
+        obj.modifiers.foreach_get("show_viewport", show_viewport)
+        obj.modifiers.foreach_get("show_render", show_render)
+        was_visible = show_viewport[active_mod_index + 1:]
+        show_viewport[active_mod_index + 1:] = [False] * len(was_visible)
+        show_render[active_mod_index + 1:] = [False] * len(was_visible)
+        set_modifiers_visibility(obj, show_viewport, show_render)
+
+    obj = apply_modifiers(obj)  # apply all modifiers with current modifers
+
+    for mod in obj.modifiers:
+        if mod.use_pin_to_last:
+            mod.use_pin_to_last = False # set all pined modifes to unpinned, since otherwise it will be before the edit mesh modifier
+
+    if not "Edit Mesh" in bpy.data.node_groups:
+        edit_mesh_node_group()
+
+    edit_mesh_modifier = obj.modifiers.new(name="Edit Mesh", type='NODES')
+    if insert_after_active: # move the edit_mesh_modifier after the active modifier
+        obj.modifiers.move(len(obj.modifiers) - 1, active_mod_index + 1)
+
+    # add new node group to the modifier
+    edit_mesh_modifier.node_group = bpy.data.node_groups['Edit Mesh']
+    edit_mesh_modifier.show_group_selector = False
+    edit_mesh_modifier["Socket_2"] = index # we store a index of the number of the mesh data block
+    edit_mesh_modifier.show_viewport = False
+
+    if insert_after_active:
+        # Restore the visibility of the modifiers after the Edit Mesh
+        # modifier, which apply_modifiers has hidden
+        show_viewport = [False] * (active_mod_index + 2) + was_visible
+        set_modifiers_visibility(obj, show_viewport, show_viewport)
+
+
+def clear_edit_mesh_modifier(context, obj, active_mod):
+    """Removes the given Edit Mesh modifier and restores the mesh stored
+    for it. Returns False if the stored mesh couldn't be found.
+    """
+    backup_index = active_mod["Socket_2"]
+    amount_of_edit_mesh_modifiers = 0
+    old_mesh_data = obj.data
+
+    obj.modifiers.remove(active_mod) # remove Edit Mesh Modifier
+
+    object_mode = True
+    if context.mode != 'OBJECT':
+        object_mode = False
+        bpy.ops.object.editmode_toggle()
+
+    data = _get_backup(obj, backup_index)
+
+    if data is not None:
+        expand_delta_backups(obj, data)
+        data = restore_backup(data)
+        obj.data = data # restore the original mesh data
+        # The object keeps the mesh alive now, a fake user would leak it
+        # once the object stops using it
+        data.use_fake_user = False
+
+        _remove_backup(obj, backup_index)
+
+        if not object_mode:
+            bpy.ops.ed.undo_push()
+            bpy.ops.object.editmode_toggle()
+
+        # restore modifiers, we only do it until the next Edit Mesh Modifier!
+        for mod in reversed(obj.modifiers):
+            if mod.type == 'NODES':
+                if mod.node_group and mod.node_group.name == "Edit Mesh":
+                    break # we reached another Edit Mesh mod, break loop
+                else:
+                    mod.show_viewport = True
+                    mod.show_render = True
+            else:
+                mod.show_viewport = True
+                mod.show_render = True
+
+        # if not used by another object, delete the old mesh data
+        if old_mesh_data.users == 0:
+            bpy.data.meshes.remove(old_mesh_data) # delete old mesh data
+
+    else:
+        return False
+
+    # cleanup obj properites if no edit mesh modifiers
+    for m in obj.modifiers:
+        if m.type == 'NODES' and m.node_group:
+            if "Edit Mesh" in m.node_group.name:
+                amount_of_edit_mesh_modifiers += 1
+
+    # if no edit mesh mdifers left, cleanup all stored backups, just in case
+    if amount_of_edit_mesh_modifiers == 0:
+        _clear_backups(obj)
+
+    return True
+
+
+# Memory report
+# ======================================================================
+
+def get_edit_mesh_backup_report():
+    """Returns a list of (mesh, owner, is_reachable) tuples for every
+    Edit Mesh backup in the file.
+
+    owner is the object the backup is stored on or None. A backup is
+    reachable when an Edit Mesh modifier of its owner uses it, directly
+    or as the anchor of a delta backup.
+    """
+    owners = {}
+    reachable = set()
+
+    for ob in bpy.data.objects:
+        if ob.type != 'MESH':
+            continue
+
+        used_indices = {mod.get("Socket_2") for mod in ob.modifiers
+                        if is_edit_mesh_modifier(mod)}
+
+        for index, backup in _get_backups(ob):
+            if backup is None:
+                continue
+
+            owners[backup] = ob
+            anchor = backup.get(ANCHOR_KEY)
+
+            if anchor is not None:
+                owners.setdefault(anchor, ob)
+
+            if index in used_indices:
+                reachable.add(backup)
+                if anchor is not None:
+                    reachable.add(anchor)
+
+    # Meshes used as object data are never backups
+    object_data = {ob.data for ob in bpy.data.objects if ob.type == 'MESH'}
+
+    report = []
+
+    for mesh in bpy.data.meshes:
+        if mesh.library or mesh in object_data:
+            continue
+
+        if mesh in owners or is_delta_backup(mesh) or "_edit_mesh_" in mesh.name:
+            report.append((mesh, owners.get(mesh), mesh in reachable))
+
+    report.sort(key=lambda item: (item[1].name if item[1] else "", item[0].name))
+
+    return report
+
+
+def purge_unreachable_backups():
+    """Deletes all Edit Mesh backups which aren't used by any Edit Mesh
+    modifier. Returns the number of deleted meshes and the estimated
+    amount of freed memory in bytes.
+    """
+    unreachable = {mesh for mesh, _, is_reachable in get_edit_mesh_backup_report()
+                   if not is_reachable}
+
+    if not unreachable:
+        return 0, 0
+
+    freed_bytes = sum(estimate_mesh_bytes(mesh) for mesh in unreachable)
+
+    for ob in bpy.data.objects:
+        if ob.type != 'MESH':
+            continue
+        for index, backup in _get_backups(ob):
+            if backup in unreachable:
+                _remove_backup(ob, index)
+
+    bpy.data.batch_remove(unreachable)
+
+    return len(unreachable), freed_bytes
@@ -0,0 +1,129 @@
+"""Automatic hiding of heavy modifiers in Edit Mode.
+
+When an object enters Edit Mode, show_in_editmode is disabled for its
+modifiers of the chosen types or whose evaluation takes longer than the
+threshold, and enabled again when the object leaves Edit Mode. The
+policy is set in the preferences and can be overridden per object with
+Object.ml_edit_mode_auto_hide.
+
+The hidden modifiers are stored in Object.ml_edit_mode_hidden_modifiers
+by persistent_uid, so they are restored even if the file was saved in
+Edit Mode. The changes are made from a msgbus callback, so they don't
+add undo steps. The evaluation times are read from the last evaluation
+of the view layer, so entering Edit Mode doesn't force an evaluation of
+the Object Mode stack.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .. import __package__ as base_package
+
+
+# Owner of the msgbus subscription
+_msgbus_owner = object()
+
+
+def _uses_auto_hide(ob, prefs):
+    policy = ob.ml_edit_mode_auto_hide
+
+    if policy == 'GLOBAL':
+        return prefs.edit_mode_auto_hide
+
+    return policy == 'ALWAYS'
+
+
+def _get_modifiers_to_hide(ob, prefs):
+    threshold = prefs.edit_mode_auto_hide_threshold / 1000
+    types = prefs.edit_mode_auto_hide_types
+    ob_eval = None
+
+    if threshold > 0:
+        ob_eval = ob.evaluated_get(bpy.context.view_layer.depsgraph)
+
+    for i, mod in enumerate(ob.modifiers):
+        if not mod.show_in_editmode:
+            continue
+
+        if mod.type in types:
+            yield mod
+        elif ob_eval is not None and i < len(ob_eval.modifiers):
+            if ob_eval.modifiers[i].execution_time > threshold:
+                yield mod
+
+
+def _hide(ob, prefs):
+    hidden_modifiers = ob.ml_edit_mode_hidden_modifiers
+
+    for mod in list(_get_modifiers_to_hide(ob, prefs)):
+        mod.show_in_editmode = False
+        hidden_modifiers.add().persistent_uid = mod.persistent_uid
+
+
+def _restore(ob):
+    hidden_modifiers = ob.ml_edit_mode_hidden_modifiers
+    hidden_uids = {hidden_mod.persistent_uid for hidden_mod in hidden_modifiers}
+
+    for mod in ob.modifiers:
+        if mod.persistent_uid in hidden_uids:
+            mod.show_in_editmode = True
+
+    hidden_modifiers.clear()
+
+
+def _on_mode_change():
+    prefs = bpy.context.preferences.addons[base_package].preferences
+    view_layer = bpy.context.view_layer
+
+    if view_layer is None:
+        return
+
+    for ob in view_layer.objects:
+        if not ob.modifiers or ob.library:
+            continue
+
+        is_hidden = bool(ob.ml_edit_mode_hidden_modifiers)
+
+        if ob.mode == 'EDIT':
+            if not is_hidden and _uses_auto_hide(ob, prefs):
+                _hide(ob, prefs)
+        elif is_hidden:
+            _restore(ob)
+
+
+def _subscribe():
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "mode"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=_on_mode_change)
+
+
+@persistent
+def _resubscribe_after_loading_file(dummy):
+    # Subscriptions are cleared when a file is loaded
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    _subscribe()
+    _on_mode_change()
+
+
+def register():
+    bpy.types.Object.ml_edit_mode_auto_hide = bpy.props.EnumProperty(
+        name="Auto Hide In Edit Mode",
+        description="Whether to hide heavy modifiers of this object in Edit Mode",
+        items=(
+            ('GLOBAL', "Use Preferences", "Use the setting in the add-on preferences"),
+            ('ALWAYS', "Always", "Always hide heavy modifiers of this object in Edit Mode"),
+            ('NEVER', "Never", "Never hide modifiers of this object in Edit Mode"),
+        ),
+        default='GLOBAL')
+
+    _subscribe()
+    bpy.app.handlers.load_post.append(_resubscribe_after_loading_file)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(_resubscribe_after_loading_file)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+
+    del bpy.types.Object.ml_edit_mode_auto_hide
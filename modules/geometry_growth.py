@@ -0,0 +1,130 @@
+"""Geometry growth through a modifier stack.
+
+The object is evaluated with the modifiers enabled up to each index, so
+it can be seen how the vertex, edge and face counts and the estimated
+memory grow with every modifier, e.g. which Array or Subdivision Surface
+modifier multiplies the mesh.
+
+The results are cached per object until its geometry or stack changes.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+
+# Object name: (stack signature, steps)
+_cache = {}
+
+# Updates caused by profiling don't invalidate the cache
+_is_profiling = False
+
+
+def _get_stack_signature(ob):
+    data_name = ob.data.name if ob.data else ""
+    return data_name, tuple((mod.persistent_uid, mod.show_viewport) for mod in ob.modifiers)
+
+
+def profile_geometry_growth(context, ob):
+    """Evaluates the object with the modifiers enabled up to each index.
+
+    Returns a list of (vertices, edges, faces, estimated bytes) where the
+    first item is the geometry without modifiers and the item at i + 1
+    the geometry after the modifier at index i. Instances aren't
+    included.
+
+    Every step is a separate evaluation of the stack up to the modifier,
+    since Blender doesn't expose the geometry between modifiers, so the
+    object is evaluated up to len(modifiers) + 1 times and the cost grows
+    with the square of the stack length. The result is cached, so the
+    stack isn't profiled again until it changes, and progress is shown
+    on the cursor.
+    """
+    global _is_profiling
+
+    from .modifier_profiling import get_geometry_size
+
+    cached_steps = get_geometry_growth(ob)
+
+    if cached_steps is not None:
+        return cached_steps
+
+    mods = ob.modifiers
+    show_viewport = [mod.show_viewport for mod in mods]
+    visibility = show_viewport.copy()
+    steps = [None] * (len(mods) + 1)
+
+    wm = context.window_manager
+    wm.progress_begin(0, len(mods) + 1)
+    _is_profiling = True
+
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        steps[-1] = get_geometry_size(ob.evaluated_get(depsgraph))
+
+        # Go down the stack, disabling one more modifier per step. Hidden
+        # modifiers don't change the geometry, so their step is the same
+        # as the previous one and the object isn't evaluated for them.
+        for i in reversed(range(len(mods))):
+            if not show_viewport[i]:
+                steps[i] = steps[i + 1]
+                continue
+
+            visibility[i] = False
+            # foreach_set doesn't run RNA updates, so the object has to
+            # be tagged to be evaluated again
+            mods.foreach_set("show_viewport", visibility)
+            ob.update_tag()
+            depsgraph = context.evaluated_depsgraph_get()
+            steps[i] = get_geometry_size(ob.evaluated_get(depsgraph))
+            wm.progress_update(len(mods) - i + 1)
+    finally:
+        mods.foreach_set("show_viewport", show_viewport)
+        ob.update_tag()
+        context.evaluated_depsgraph_get()
+        _is_profiling = False
+        wm.progress_end()
+
+    _cache[ob.name] = (_get_stack_signature(ob), steps)
+
+    return steps
+
+
+def get_geometry_growth(ob):
+    """Returns the cached steps of the object or None if the object
+    hasn't been profiled or its stack has changed since.
+    """
+    cached = _cache.get(ob.name)
+
+    if cached is None or cached[0] != _get_stack_signature(ob):
+        return None
+
+    return cached[1]
+
+
+@persistent
+def _invalidate_cache(scene, depsgraph):
+    if _is_profiling or not _cache:
+        return
+
+    for update in depsgraph.updates:
+        id_data = update.id.original
+
+        if isinstance(id_data, bpy.types.Object) and update.is_updated_geometry:
+            _cache.pop(id_data.name, None)
+
+
+@persistent
+def _clear_cache(dummy):
+    _cache.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_invalidate_cache)
+    bpy.app.handlers.load_post.append(_clear_cache)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(_invalidate_cache)
+    bpy.app.handlers.load_post.remove(_clear_cache)
+    _cache.clear()
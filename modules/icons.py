@@ -1,54 +1,114 @@
 import os
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.utils import previews
 from .. import __package__ as base_package
 
 
+# One preview collection per icon color, so switching the color doesn't
+# need to read the files again.
 _preview_collections = {}
+_active_color = None
+
+# Names of the icons that have been checked to be valid since the last
+# file load.
+_validated_icons = set()
+
+
+class _Icons:
+    """Gives access to the icons of the active icon color.
+
+    Icons are loaded when they are requested for the first time. After
+    loading a file, each icon is checked once and reloaded only if its
+    preview has become invalid.
+    """
+
+    def __getitem__(self, name):
+        color = _active_color or _get_icon_color_from_prefs()
+        pcoll = _get_preview_collection(color)
+        key = (color, name)
+
+        if key in _validated_icons:
+            return pcoll[name]
+
+        preview = pcoll.get(name)
+
+        if preview is not None:
+            try:
+                if preview.icon_id == 0:
+                    preview.reload()
+            except ReferenceError:
+                pcoll.pop(name)
+                preview = None
+
+        if preview is None:
+            icon_file = os.path.join(_get_icons_dir(color), name + ".png")
+            preview = pcoll.load(name, icon_file, 'IMAGE')
+
+        _validated_icons.add(key)
+
+        return preview
+
+
+_icons = _Icons()
 
 
 def get_icons():
-    """Returns the preview collection containing all icons."""
-    return _preview_collections["main"]
+    """Returns an object from which icons can be accessed by name."""
+    return _icons
+
+
+def _get_icon_color_from_prefs():
+    prefs = bpy.context.preferences.addons[base_package].preferences
+    return prefs.icon_color
 
 
-def load_icons():
-    """Loads/reloads icons from the icons directory.
+def _get_icons_dir(color):
+    return os.path.join(os.path.dirname(__file__), os.path.pardir, "icons", color)
+
+
+def _get_preview_collection(color):
+    pcoll = _preview_collections.get(color)
+
+    if pcoll is None:
+        pcoll = previews.new()
+        _preview_collections[color] = pcoll
+
+    return pcoll
+
+
+def set_icon_color(color):
+    """Sets the color of the icons returned by get_icons.
 
     This is also used in a callback function in addon preferences, which
     makes changing icon color possible without reloading the addon.
     """
-    # === Remove the current icons and clear preview_collections ===
+    global _active_color
+    _active_color = color
+
+
+def _remove_preview_collections():
     for pcoll in _preview_collections.values():
         previews.remove(pcoll)
 
     _preview_collections.clear()
+    _validated_icons.clear()
 
-    # === Load new icons ===
-    pcoll = previews.new()
 
-    prefs = bpy.context.preferences.addons[base_package].preferences
-    color = prefs.icon_color
-
-    icons_dir = os.path.join(os.path.dirname(__file__), os.path.pardir, "icons", color)
-    icons_dir_files = os.listdir(icons_dir)
-
-    all_icon_files = [icon for icon in icons_dir_files if icon.endswith(".png")]
-    all_icon_names = [icon[0:-4] for icon in all_icon_files]
-    all_icon_files_and_names = zip(all_icon_names, all_icon_files)
-
-    for icon_name, icon_file in all_icon_files_and_names:
-        pcoll.load(icon_name, os.path.join(icons_dir, icon_file), 'IMAGE')
-
-    _preview_collections["main"] = pcoll
+@persistent
+def validate_icons_after_loading_file(dummy):
+    """Sometimes icons become invalid after loading a file due to a
+    Blender bug, so check them again the next time they are drawn.
+    """
+    _validated_icons.clear()
 
 
 def register():
-    load_icons()
+    set_icon_color(_get_icon_color_from_prefs())
+    bpy.app.handlers.load_post.append(validate_icons_after_loading_file)
 
 
 def unregister():
-    for pcoll in _preview_collections.values():
-        previews.remove(pcoll)
-    _preview_collections.clear()
+    bpy.app.handlers.load_post.remove(validate_icons_after_loading_file)
+    _remove_preview_collections()
@@ -1,33 +1,156 @@
+"""Modifier categories and the features each modifier type supports.
+
+The tables derived from Blender's modifier type enum are cached on the
+disk per Blender version and build, so importing this module is a
+single file read instead of walking the RNA enum.
+"""
+
+import json
+import os
+
 import bpy
+from .. import __package__ as base_package
 
 
 BLENDER_VERSION_MAJOR_POINT_MINOR = float(bpy.app.version_string[0:4].strip("."))
 
-_mods_enum = bpy.types.Modifier.bl_rna.properties['type'].enum_items
-# There's' a modifier called "Surface" which needs to be filtered out
-# because it's not meant to be seen by users.
+# Bump this when the contents of the cache change
+CACHE_VERSION = 1
+
 auto_smooth = ('Auto Smooth', 'MOD_EDGESPLIT', 'AUTO_SMOOTH')
 edit_mesh = ('Edit Mesh', 'EDITMODE_HLT', 'EDIT_MESH')
-_mods =[(mod.name, mod.icon, mod.identifier) for mod in _mods_enum
-                                   if mod.name != "Surface" and "GREASE_PENCIL" not in mod.identifier]
-_mods.insert(next(_mods.index(mod) for mod in _mods if mod[0] == "Array"), auto_smooth)
-_mods.insert(next(_mods.index(mod) for mod in _mods if mod[0] == "Array"), edit_mesh)
+
+
+# Feature flags
+# ======================================================================
+
+SUPPORTS_SHOW_IN_EDITMODE = 1 << 0
+SUPPORTS_SHOW_ON_CAGE = 1 << 1
+SUPPORTS_APPLY_ON_SPLINE = 1 << 2
+SUPPORTS_APPLY_AS_SHAPE_KEY = 1 << 3
+SUPPORTS_COPY = 1 << 4
+HAS_GIZMO_PROPERTY = 1 << 5
+
+
+def supports(modifier_type, flag):
+    """Returns True if the given modifier type has the given feature
+    flag(s).
+    """
+    return MODIFIER_FLAGS.get(modifier_type, 0) & flag == flag
+
+
+# Cache
+# ======================================================================
+
+def _cache_file():
+    config_dir = bpy.utils.user_resource('CONFIG')
+    return os.path.join(config_dir, base_package, "modifier_categories_cache.json")
+
+
+def _cache_key():
+    # The modification time of this file is included so that changes to
+    # the tables invalidate the cache.
+    return {
+        "version": CACHE_VERSION,
+        "blender_version": bpy.app.version_string,
+        "build_hash": bpy.app.build_hash.decode(errors='replace'),
+        "source_mtime": os.stat(__file__).st_mtime_ns
+    }
+
+
+def _read_cache(key):
+    cache_file = _cache_file()
+
+    if not os.path.exists(cache_file):
+        return None
+
+    with open(cache_file, encoding='utf-8') as f:
+        try:
+            cache = json.load(f)
+        except json.decoder.JSONDecodeError:
+            return None
+
+    if cache.get("key") != key:
+        return None
+
+    return cache
+
+
+def _write_cache(cache):
+    cache_file = _cache_file()
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"{base_package}: Couldn't write the modifier categories cache: {e}")
+
+
+def _build_tables(key):
+    """Walks the modifier type enum once and builds the modifier list,
+    the category boundaries and the types of all modifiers.
+    """
+    mods = []
+    all_types = []
+    first_index_of_name = {}
+
+    for mod in bpy.types.Modifier.bl_rna.properties['type'].enum_items:
+        all_types.append(mod.identifier)
+
+        # There's' a modifier called "Surface" which needs to be filtered
+        # out because it's not meant to be seen by users.
+        if mod.name == "Surface" or "GREASE_PENCIL" in mod.identifier:
+            continue
+
+        if mod.name == "Array":
+            for extra_mod in (auto_smooth, edit_mesh):
+                first_index_of_name.setdefault(extra_mod[0], len(mods))
+                mods.append(extra_mod)
+
+        first_index_of_name.setdefault(mod.name, len(mods))
+        mods.append((mod.name, mod.icon, mod.identifier))
+
+    all_types.extend((auto_smooth[2], edit_mesh[2]))
+
+    categories = {
+        "edit": (0, first_index_of_name["Edit Mesh"] + 1),
+        "generate": (first_index_of_name["Array"], first_index_of_name["Wireframe"] + 1),
+        "deform": (first_index_of_name["Armature"], first_index_of_name["Wave"] + 1),
+        "simulate": (first_index_of_name["Cloth"], first_index_of_name["Soft Body"] + 1),
+    }
+
+    return {
+        "key": key,
+        "modifiers": mods,
+        "categories": categories,
+        "all_types": all_types
+    }
+
+
+def _load_tables():
+    key = _cache_key()
+    cache = _read_cache(key)
+
+    if cache is None:
+        cache = _build_tables(key)
+        _write_cache(cache)
+
+    mods = [tuple(mod) for mod in cache["modifiers"]]
+    categories = {name: slice(*bounds) for name, bounds in cache["categories"].items()}
+
+    return mods, categories, cache["all_types"]
+
+
+_mods, _categories, _all_types = _load_tables()
 
 ALL_MODIFIERS_NAMES_ICONS_TYPES = _mods
 
 # === All modifier by categories ===
-_edit_end = next(_mods.index(mod) + 1 for mod in _mods if mod[0] == "Edit Mesh")
-_gen_start = next(_mods.index(mod) for mod in _mods if mod[0] == "Array")
-_gen_end = next(_mods.index(mod) + 1 for mod in _mods if mod[0] == "Wireframe")
-_def_start = next(_mods.index(mod) for mod in _mods if mod[0] == "Armature")
-_def_end = next(_mods.index(mod) + 1 for mod in _mods if mod[0] == "Wave")
-_sim_start = next(_mods.index(mod) for mod in _mods if mod[0] == "Cloth")
-_sim_end = next(_mods.index(mod) + 1 for mod in _mods if mod[0] == "Soft Body")
-
-ALL_EDIT_NAMES_ICONS_TYPES = [mod for mod in _mods[0:_edit_end]]
-ALL_GENERATE_NAMES_ICONS_TYPES = [mod for mod in _mods[_gen_start:_gen_end]]
-ALL_DEFORM_NAMES_ICONS_TYPES = [mod for mod in _mods[_def_start:_def_end]]
-ALL_SIMULATE_NAMES_ICONS_TYPES = [mod for mod in _mods[_sim_start:_sim_end]]
+ALL_EDIT_NAMES_ICONS_TYPES = _mods[_categories["edit"]]
+ALL_GENERATE_NAMES_ICONS_TYPES = _mods[_categories["generate"]]
+ALL_DEFORM_NAMES_ICONS_TYPES = _mods[_categories["deform"]]
+ALL_SIMULATE_NAMES_ICONS_TYPES = _mods[_categories["simulate"]]
 
 # === Mesh modifiers by categories ===
 # Modifiers that don't apply to meshes need to be filtered out
@@ -244,7 +367,6 @@ SUPPORT_USE_APPLY_ON_SPLINE = {
 }
 
 # === Support apply_as_shape_key ===
-_deform_mods = {mod for name, icon, mod in ALL_DEFORM_NAMES_ICONS_TYPES}
 _other_shape_key_mods = {'CLOTH', 'SOFT_BODY', 'MESH_CACHE'}
 SUPPORT_APPLY_AS_SHAPE_KEY = _deform_mods.union(_other_shape_key_mods)
 
@@ -273,3 +395,26 @@ HAVE_GIZMO_PROPERTY = {
     'SIMPLE_DEFORM': "origin",
     'WAVE': "start_position_object"
 }
+
+
+# === Feature flags per modifier type ===
+def _calc_modifier_flags(modifier_type):
+    flags = 0
+
+    if modifier_type not in DONT_SUPPORT_SHOW_IN_EDITMODE:
+        flags |= SUPPORTS_SHOW_IN_EDITMODE
+    if modifier_type in SUPPORT_SHOW_ON_CAGE:
+        flags |= SUPPORTS_SHOW_ON_CAGE
+    if modifier_type in SUPPORT_USE_APPLY_ON_SPLINE:
+        flags |= SUPPORTS_APPLY_ON_SPLINE
+    if modifier_type in SUPPORT_APPLY_AS_SHAPE_KEY:
+        flags |= SUPPORTS_APPLY_AS_SHAPE_KEY
+    if modifier_type not in DONT_SUPPORT_COPY:
+        flags |= SUPPORTS_COPY
+    if modifier_type in HAVE_GIZMO_PROPERTY:
+        flags |= HAS_GIZMO_PROPERTY
+
+    return flags
+
+
+MODIFIER_FLAGS = {mod_type: _calc_modifier_flags(mod_type) for mod_type in _all_types}
@@ -0,0 +1,228 @@
+"""Profiling of modifier evaluation.
+
+The viewport timings in the modifier list only show the cost of the
+current frame with viewport settings. The functions here measure the
+evaluation time (Modifier.execution_time) of modifiers over a range of
+frames, so costs which depend on animation, e.g. of simulations or Ocean
+modifiers, can be found, and with the render settings of the modifiers,
+so render costs can be estimated without rendering.
+"""
+
+import csv
+import json
+import statistics
+from contextlib import contextmanager
+
+
+# Frame range profiling
+# ======================================================================
+
+def profile_frame_range(context, objects, frame_start, frame_end, frame_step=1):
+    """Steps through the frame range and records the evaluation time of
+    the modifiers of the objects on every frame. The current frame is
+    restored afterwards.
+
+    Returns a dict with the profiled frames, the total time per frame
+    and (object name, modifier name, modifier type, times per frame)
+    for every modifier. Times are in seconds.
+    """
+    scene = context.scene
+    frames = list(range(frame_start, frame_end + 1, max(frame_step, 1)))
+    objects = [ob for ob in objects if ob.modifiers]
+    timings = [(ob, mod, []) for ob in objects for mod in ob.modifiers]
+    frame_totals = []
+
+    original_frame = scene.frame_current
+    original_subframe = scene.frame_subframe
+
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            depsgraph = context.evaluated_depsgraph_get()
+            evaluated = {ob: ob.evaluated_get(depsgraph) for ob in objects}
+            frame_total = 0.0
+
+            for ob, mod, times in timings:
+                t = 0.0
+                if mod.show_viewport:
+                    mod_eval = evaluated[ob].modifiers.get(mod.name)
+                    if mod_eval is not None:
+                        t = mod_eval.execution_time
+                times.append(t)
+                frame_total += t
+
+            frame_totals.append(frame_total)
+    finally:
+        scene.frame_set(original_frame, subframe=original_subframe)
+
+    return {
+        "frames": frames,
+        "frame_totals": frame_totals,
+        "modifiers": [(ob.name, mod.name, mod.type, times) for ob, mod, times in timings],
+    }
+
+
+def summarize_frame_range_profile(profile, spike_factor=2.0):
+    """Returns per modifier statistics sorted from the highest peak and
+    the frames whose total time is more than spike_factor times the
+    median total time.
+
+    Modifier statistics are (object name, modifier name, average, peak,
+    peak frame). Spikes are (frame, total time, object name, modifier
+    name) where the modifier is the costliest one on the frame.
+    """
+    frames = profile["frames"]
+
+    if not frames:
+        return [], []
+
+    modifier_stats = []
+    for ob_name, mod_name, _, times in profile["modifiers"]:
+        peak = max(times)
+        peak_frame = frames[times.index(peak)]
+        modifier_stats.append((ob_name, mod_name, statistics.fmean(times), peak, peak_frame))
+
+    modifier_stats.sort(key=lambda stats: stats[3], reverse=True)
+
+    frame_totals = profile["frame_totals"]
+    threshold = statistics.median(frame_totals) * spike_factor
+    spikes = []
+
+    for i, (frame, total) in enumerate(zip(frames, frame_totals)):
+        if total <= threshold or total <= 0:
+            continue
+        ob_name, mod_name, _, _ = max(profile["modifiers"], key=lambda item: item[3][i])
+        spikes.append((frame, total, ob_name, mod_name))
+
+    return modifier_stats, spikes
+
+
+def export_frame_range_profile(profile, filepath):
+    """Writes the profile to a CSV or JSON file depending on the
+    extension of the path. Times are written in milliseconds.
+    """
+    if filepath.lower().endswith(".json"):
+        data = {
+            "frames": profile["frames"],
+            "frame_totals_ms": [t * 1000 for t in profile["frame_totals"]],
+            "modifiers": [
+                {
+                    "object": ob_name,
+                    "modifier": mod_name,
+                    "type": mod_type,
+                    "times_ms": [t * 1000 for t in times],
+                }
+                for ob_name, mod_name, mod_type, times in profile["modifiers"]
+            ],
+        }
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return
+
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "object", "modifier", "type", "time_ms"])
+        for ob_name, mod_name, mod_type, times in profile["modifiers"]:
+            for frame, t in zip(profile["frames"], times):
+                writer.writerow([frame, ob_name, mod_name, mod_type, f"{t * 1000:.4f}"])
+
+
+# Render settings profiling
+# ======================================================================
+
+# Viewport properties which are set to the value of the render property
+# of the same modifier for a render evaluation
+RENDER_SETTINGS = {
+    'SUBSURF': (("levels", "render_levels"),),
+    'MULTIRES': (("levels", "render_levels"),),
+    'OCEAN': (("viewport_resolution", "resolution"),),
+}
+
+
+@contextmanager
+def render_settings(objects):
+    """Temporarily sets the viewport settings of the modifiers of the
+    objects to their render settings, e.g. show_viewport to show_render
+    and Subdivision Surface levels to render levels.
+    """
+    changes = []
+
+    try:
+        for ob in objects:
+            for mod in ob.modifiers:
+                settings = (("show_viewport", "show_render"),) + RENDER_SETTINGS.get(mod.type, ())
+                for viewport_prop, render_prop in settings:
+                    value = getattr(mod, render_prop)
+                    original_value = getattr(mod, viewport_prop)
+                    if original_value != value:
+                        changes.append((mod, viewport_prop, original_value))
+                        setattr(mod, viewport_prop, value)
+        yield
+    finally:
+        for mod, prop, value in reversed(changes):
+            setattr(mod, prop, value)
+
+
+def get_geometry_size(ob_eval):
+    """Returns the vertex, edge and face count and the estimated size in
+    bytes of the evaluated geometry of the object. Instances aren't
+    included.
+    """
+    from .utils import estimate_mesh_bytes
+
+    mesh = ob_eval.to_mesh()
+
+    if mesh is None:
+        return 0, 0, 0, 0
+
+    try:
+        return (len(mesh.vertices), len(mesh.edges), len(mesh.polygons),
+                estimate_mesh_bytes(mesh))
+    finally:
+        ob_eval.to_mesh_clear()
+
+
+def _get_evaluation(context, objects):
+    depsgraph = context.evaluated_depsgraph_get()
+    evaluation = {}
+
+    for ob in objects:
+        ob_eval = ob.evaluated_get(depsgraph)
+        times = [mod_eval.execution_time if mod.show_viewport else 0.0
+                 for mod, mod_eval in zip(ob.modifiers, ob_eval.modifiers)]
+        evaluation[ob] = (times, get_geometry_size(ob_eval))
+
+    return evaluation
+
+
+def profile_render_settings(context, objects):
+    """Evaluates the objects with their current viewport settings and
+    then with the render settings of their modifiers, without
+    rendering. The viewport settings are restored afterwards.
+
+    Objects from libraries without overrides are skipped, since their
+    modifiers can't be changed. Geometry Nodes which check whether they
+    are evaluated for the viewport are still evaluated for the viewport.
+
+    Returns a list of (object name, modifier rows, viewport geometry,
+    render geometry), where modifier rows are (modifier name, viewport
+    time, render time) and geometry is (vertices, edges, faces, bytes).
+    """
+    objects = [ob for ob in objects
+               if ob.modifiers and not (ob.library and not ob.override_library)]
+
+    viewport_evaluation = _get_evaluation(context, objects)
+
+    with render_settings(objects):
+        render_evaluation = _get_evaluation(context, objects)
+
+    result = []
+    for ob in objects:
+        viewport_times, viewport_geometry = viewport_evaluation[ob]
+        render_times, render_geometry = render_evaluation[ob]
+        modifier_rows = [(mod.name, viewport_time, render_time)
+                         for mod, viewport_time, render_time
+                         in zip(ob.modifiers, viewport_times, render_times)]
+        result.append((ob.name, modifier_rows, viewport_geometry, render_geometry))
+
+    return result
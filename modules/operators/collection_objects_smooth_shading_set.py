@@ -2,6 +2,8 @@ import bpy
 from bpy.props import *
 from bpy.types import Operator
 
+from ..utils import set_smooth_shading
+
 
 class Collection_OT_ml_smooth_shading_set(Operator):
     bl_idname = "collection.ml_objects_smooth_shading_set"
@@ -15,9 +17,6 @@ class Collection_OT_ml_smooth_shading_set(Operator):
     def execute(self, context):
         collection = bpy.data.collections[self.collection_name]
 
-        for ob in collection.all_objects:
-            if ob.type == 'MESH':
-                for p in ob.data.polygons:
-                    p.use_smooth = self.shade_smooth
+        set_smooth_shading(collection.all_objects, self.shade_smooth)
 
         return {'FINISHED'}
@@ -1,16 +1,82 @@
+import bpy
+from bpy.app.handlers import persistent
 from bpy.props import *
 from bpy.types import Operator
 
 from ..utils import get_ml_active_object
 
 
+# Enum items per object name, together with the name of the object's
+# data. Keeping the items here also keeps references to their strings,
+# which Blender requires for dynamic enum items to stay valid.
+_attribute_catalogue_cache = {}
+
+
+def _build_attribute_catalogue(context, ob):
+    """Returns enum items for the vertex groups and attributes of the
+    object, including the attributes which only exist on the evaluated
+    geometry, e.g. ones created by Geometry Nodes modifiers.
+    """
+    items = [(group.name, f"Point > {group.name}", "Vertex group")
+             for group in ob.vertex_groups if not group.name.startswith(".")]
+    names = {group.name for group in ob.vertex_groups}
+
+    attributes = getattr(ob.data, "attributes", None)
+    if attributes is not None:
+        for attr in attributes:
+            if attr.name.startswith(".") or attr.name in names:
+                continue
+            names.add(attr.name)
+            items.append((attr.name, f"{attr.domain.capitalize()} > {attr.name}",
+                          attr.data_type.capitalize()))
+
+    ob_eval = ob.evaluated_get(context.evaluated_depsgraph_get())
+    eval_attributes = getattr(ob_eval.data, "attributes", None)
+    if eval_attributes is not None:
+        for attr in eval_attributes:
+            if attr.name.startswith(".") or attr.name in names:
+                continue
+            names.add(attr.name)
+            items.append((attr.name, f"{attr.domain.capitalize()} > {attr.name} (Evaluated)",
+                          f"{attr.data_type.capitalize()}, only exists after modifiers"))
+
+    return items
+
+
 def attr_or_vertex_group_name_enum_items(self, context):
     ob = get_ml_active_object()
-    groups = [(group.name, f"Point > {group.name}", "")
-              for group in ob.vertex_groups if not group.name.startswith(".")]
-    attrs = [(attr.name, f"{attr.domain.capitalize()} > {attr.name}", "")
-             for attr in ob.data.attributes if not attr.name.startswith(".")]
-    return groups + attrs
+    cached = _attribute_catalogue_cache.get(ob.name)
+
+    if cached is None or cached[0] != ob.data.name:
+        cached = (ob.data.name, _build_attribute_catalogue(context, ob))
+        _attribute_catalogue_cache[ob.name] = cached
+
+    return cached[1]
+
+
+@persistent
+def invalidate_attribute_catalogue_cache(scene, depsgraph):
+    if not _attribute_catalogue_cache:
+        return
+
+    for update in depsgraph.updates:
+        # Transform and selection changes don't change the attributes
+        if not update.is_updated_geometry:
+            continue
+
+        id_data = update.id.original
+
+        if isinstance(id_data, bpy.types.Object):
+            _attribute_catalogue_cache.pop(id_data.name, None)
+        elif id_data.id_type in {'MESH', 'CURVES', 'POINTCLOUD', 'CURVE'}:
+            for ob_name, (data_name, _) in list(_attribute_catalogue_cache.items()):
+                if data_name == id_data.name:
+                    del _attribute_catalogue_cache[ob_name]
+
+
+@persistent
+def clear_attribute_catalogue_cache(dummy):
+    _attribute_catalogue_cache.clear()
 
 
 class OBJECT_OT_ml_geometry_nodes_attribute_search(Operator):
@@ -42,3 +108,14 @@ class OBJECT_OT_ml_geometry_nodes_attribute_search(Operator):
     def invoke(self, context, event):
         context.window_manager.invoke_search_popup(self)
         return {'CANCELLED'}
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_attribute_catalogue_cache)
+    bpy.app.handlers.load_post.append(clear_attribute_catalogue_cache)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_attribute_catalogue_cache)
+    bpy.app.handlers.load_post.remove(clear_attribute_catalogue_cache)
+    _attribute_catalogue_cache.clear()
@@ -15,6 +15,6 @@ class OBJECT_OT_ml_gizmo_object_delete(Operator):
         active_mod_index = ob.ml_modifier_active_index
         active_mod = ob.modifiers[active_mod_index]
         gizmo_ob = get_gizmo_object_from_modifier(active_mod)
-        delete_gizmo_object(self, gizmo_ob)
+        delete_gizmo_object(self, gizmo_ob, active_mod)
 
         return {'FINISHED'}
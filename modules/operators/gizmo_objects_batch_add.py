@@ -0,0 +1,49 @@
+from bpy.props import *
+from bpy.types import Operator
+
+from ..utils import assign_gizmo_objects_to_modifiers
+
+
+class OBJECT_OT_ml_gizmo_objects_batch_add(Operator):
+    bl_idname = "object.ml_gizmo_objects_batch_add"
+    bl_label = "Add Gizmos To Selected"
+    bl_description = ("Add gizmo objects to all modifiers of the selected objects which "
+                      "can use a gizmo but don't have one yet.\n"
+                      "\n"
+                      "Placement:\n"
+                      "Shift: 3D Cursor.\n"
+                      "Ctrl: world origin.\n"
+                      "If in Edit Mode and there is a selection: the average location of "
+                      "the selected elements.\n"
+                      "Else: the object's origin")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    placement: EnumProperty(default='OBJECT', items=(
+        ('CURSOR', '3D Cursor', ''),
+        ('WORLD_ORIGIN', 'World Origin', ''),
+        ('OBJECT', 'Object Origin', ''),
+    ),
+    options={'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.selected_objects)
+
+    def execute(self, context):
+        gizmo_count = assign_gizmo_objects_to_modifiers(self, context, context.selected_objects,
+                                                        placement=self.placement)
+
+        if gizmo_count:
+            self.report({'INFO'}, f"Added {gizmo_count} gizmo object(s)")
+        else:
+            self.report({'INFO'}, "No modifiers without a gizmo found")
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if event.shift:
+            self.placement = 'CURSOR'
+        elif event.ctrl:
+            self.placement = 'WORLD_ORIGIN'
+
+        return self.execute(context)
@@ -0,0 +1,44 @@
+import bpy
+from bpy.types import Operator
+
+from ..utils import (
+    delete_empty_ml_collection,
+    find_orphan_gizmo_objects,
+    find_unused_ml_vertex_groups,
+    update_gizmo_registry
+)
+
+
+class OBJECT_OT_ml_gizmo_objects_cleanup(Operator):
+    bl_idname = "object.ml_gizmo_objects_cleanup"
+    bl_label = "Clean Up Unused Gizmos"
+    bl_description = ("Delete all gizmo objects in the file which aren't used by anything "
+                      "and all vertex groups created by Modifier List (prefixed with \"ML_\") "
+                      "which aren't used by any modifier")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        update_gizmo_registry()
+        orphan_gizmos = find_orphan_gizmo_objects()
+        unused_vert_groups = find_unused_ml_vertex_groups()
+
+        # Also remove lattice data which would be left without users
+        ids_to_remove = set(orphan_gizmos)
+        ids_to_remove.update(ob.data for ob in orphan_gizmos
+                             if ob.type == 'LATTICE' and ob.data.users == 1)
+
+        if ids_to_remove:
+            bpy.data.batch_remove(ids_to_remove)
+
+        for ob, vert_group in unused_vert_groups:
+            ob.vertex_groups.remove(vert_group)
+
+        delete_empty_ml_collection()
+
+        self.report({'INFO'}, f"Deleted {len(orphan_gizmos)} gizmo object(s) and "
+                              f"{len(unused_vert_groups)} vertex group(s)")
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
@@ -1,5 +1,3 @@
-import numpy as np
-
 import bpy
 from bpy.props import *
 from bpy.types import Operator
@@ -1,5 +1,3 @@
-import numpy as np
-
 import bpy
 from bpy.props import *
 from bpy.types import Operator
@@ -62,7 +60,7 @@ class OBJECT_OT_ml_modifier_move_down(Operator):
             with context.temp_override(id=ml_active_ob): ### Draise - added "with" for Blender 4.0.0 compatibility
                 bpy.ops.object.modifier_move_to_index(use_selected_objects=self.selected_objects, modifier=active_mod_name, index=active_mod_index + 1)
 
-                ml_active_ob.ml_modifier_active_index = np.clip(active_mod_index + 1, 0, mods_max_index)
+                ml_active_ob.ml_modifier_active_index = min(max(active_mod_index + 1, 0), mods_max_index)
 
         return {'FINISHED'}
 
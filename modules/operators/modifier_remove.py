@@ -1,5 +1,3 @@
-import numpy as np
-
 import bpy
 from bpy.props import *
 from bpy.types import Operator
@@ -59,7 +57,7 @@ class OBJECT_OT_ml_modifier_remove(Operator):
         ### Draise - added "with" for Blender 4.0.0 compatibility
         with context.temp_override(id=ml_active_ob):
             bpy.ops.object.modifier_remove('INVOKE_DEFAULT', modifier=active_mod.name)
-        ml_active_ob.ml_modifier_active_index = np.clip(active_mod_index - 1, 0, 999)
+        ml_active_ob.ml_modifier_active_index = min(max(active_mod_index - 1, 0), 999)
 
         return {'FINISHED'}
 
@@ -85,7 +83,7 @@ class OBJECT_OT_ml_modifier_remove(Operator):
                 switch_into_editmode = True
 
         gizmo_ob = get_gizmo_object_from_modifier(modifier)
-        delete_gizmo_object(self, gizmo_ob)
+        delete_gizmo_object(self, gizmo_ob, modifier)
 
         if modifier.type == 'LATTICE':
             context.view_layer.objects.active = object
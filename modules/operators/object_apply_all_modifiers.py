@@ -4,8 +4,6 @@ meta-androcto, saidenka and lijenstina.
 https://wiki.blender.org/wiki/Extensions:2.6/Py/Scripts/3D_interaction/modifier_tools
 """
 
-import numpy as np
-
 import bpy
 from bpy.props import *
 from bpy.types import Operator
@@ -203,7 +201,7 @@ class VIEW3D_OT_ml_apply_all_modifiers(Operator):
                 # Make sure some modifier is always active even if all
                 # modifiers can't be applied
                 mods_len = len(mods) - 1
-                new_index = np.clip(mods_len, 0, 99)
+                new_index = min(max(mods_len, 0), 99)
                 ob.ml_modifier_active_index = new_index
 
 
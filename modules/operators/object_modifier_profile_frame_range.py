@@ -0,0 +1,190 @@
+import bpy
+from bpy.props import *
+from bpy.types import Operator
+
+from .. import viewport_governor
+from ..utils import get_ml_active_object, get_selected_and_ml_active_objects
+from ..ui.ui_common import sparkline
+
+
+# The result of the last profiling run, shown in the report popup
+_frame_range_profile = {}
+
+
+class OBJECT_OT_ml_profile_frame_range(Operator):
+    bl_idname = "object.ml_profile_frame_range"
+    bl_label = "Profile Frame Range"
+    bl_description = ("Step through a frame range and record the evaluation time of the "
+                      "modifiers of the selected objects on every frame, to find the frames "
+                      "where playback slows down and the modifiers causing it")
+    bl_options = {'REGISTER'}
+
+    frame_start: IntProperty(name="Start")
+    frame_end: IntProperty(name="End")
+    frame_step: IntProperty(name="Step", default=1, min=1)
+    spike_factor: FloatProperty(
+        name="Spike Factor",
+        description="Report the frames which take longer than this many times the median "
+                    "frame time",
+        default=2.0,
+        min=1.0)
+
+    @classmethod
+    def poll(cls, context):
+        return get_ml_active_object() is not None
+
+    def execute(self, context):
+        from .. import modifier_profiling
+
+        if self.frame_end < self.frame_start:
+            self.report({'ERROR'}, "The end frame is before the start frame")
+            return {'CANCELLED'}
+
+        with viewport_governor.ignore_updates():
+            profile = modifier_profiling.profile_frame_range(
+                context, get_selected_and_ml_active_objects(context),
+                self.frame_start, self.frame_end, self.frame_step)
+
+        if not profile["modifiers"]:
+            self.report({'INFO'}, "The selected objects have no modifiers")
+            return {'CANCELLED'}
+
+        _frame_range_profile.clear()
+        _frame_range_profile.update(profile)
+        _frame_range_profile["spike_factor"] = self.spike_factor
+
+        bpy.ops.object.ml_profile_frame_range_report('INVOKE_DEFAULT')
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        self.frame_step = 1
+
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class OBJECT_OT_ml_profile_frame_range_report(Operator):
+    bl_idname = "object.ml_profile_frame_range_report"
+    bl_label = "Frame Range Profile"
+    bl_description = "Show the result of the last frame range profiling"
+    bl_options = {'INTERNAL'}
+
+    max_rows = 20
+
+    # The number of frames shown in the graph
+    graph_width = 80
+
+    @classmethod
+    def poll(cls, context):
+        return bool(_frame_range_profile)
+
+    def draw(self, context):
+        from .. import modifier_profiling
+
+        layout = self.layout
+        profile = _frame_range_profile
+        frames = profile["frames"]
+        frame_totals = profile["frame_totals"]
+
+        modifier_stats, spikes = modifier_profiling.summarize_frame_range_profile(
+            profile, profile["spike_factor"])
+
+        layout.label(text=f"Frames {frames[0]}-{frames[-1]}, "
+                          f"peak {max(frame_totals) * 1000:.1f} ms, "
+                          f"average {sum(frame_totals) / len(frame_totals) * 1000:.1f} ms")
+
+        # Graph of the total time per frame. Long ranges are reduced by
+        # showing the highest total of each group of frames.
+        group_size = -(-len(frame_totals) // self.graph_width)
+        graph_values = [max(frame_totals[i:i + group_size])
+                        for i in range(0, len(frame_totals), group_size)]
+        layout.label(text=sparkline(graph_values))
+
+        layout.separator()
+
+        col = layout.column(align=True)
+        row = col.row()
+        row.label(text="Object")
+        row.label(text="Modifier")
+        row.label(text="Average")
+        row.label(text="Peak")
+        row.label(text="Peak Frame")
+        for ob_name, mod_name, average, peak, peak_frame in modifier_stats[:self.max_rows]:
+            row = col.row()
+            row.label(text=ob_name, icon='OBJECT_DATA')
+            row.label(text=mod_name, icon='MODIFIER')
+            row.label(text=f"{average * 1000:.2f} ms")
+            row.label(text=f"{peak * 1000:.2f} ms")
+            row.label(text=str(peak_frame))
+
+        if len(modifier_stats) > self.max_rows:
+            col.label(text=f"... and {len(modifier_stats) - self.max_rows} more")
+
+        if spikes:
+            layout.separator()
+            layout.label(text=f"{len(spikes)} spike frame(s):", icon='ERROR')
+            col = layout.column(align=True)
+            for frame, total, ob_name, mod_name in spikes[:self.max_rows]:
+                col.label(text=f"Frame {frame}: {total * 1000:.1f} ms, "
+                               f"mostly {ob_name} > {mod_name}")
+            if len(spikes) > self.max_rows:
+                col.label(text=f"... and {len(spikes) - self.max_rows} more")
+
+        layout.separator()
+
+        row = layout.row(align=True)
+        row.operator("object.ml_profile_frame_range_export", text="Export CSV",
+                     icon='EXPORT').file_format = 'CSV'
+        row.operator("object.ml_profile_frame_range_export", text="Export JSON",
+                     icon='EXPORT').file_format = 'JSON'
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_popup(self, width=700)
+
+
+class OBJECT_OT_ml_profile_frame_range_export(Operator):
+    bl_idname = "object.ml_profile_frame_range_export"
+    bl_label = "Export Frame Range Profile"
+    bl_description = "Export the result of the last frame range profiling"
+    bl_options = {'INTERNAL'}
+
+    filepath: StringProperty(subtype="FILE_PATH")
+    file_format: EnumProperty(
+        name="Format",
+        items=(
+            ('CSV', "CSV", "One row per frame and modifier"),
+            ('JSON', "JSON", "The times of each modifier as a list"),
+        ))
+
+    @classmethod
+    def poll(cls, context):
+        return bool(_frame_range_profile)
+
+    def execute(self, context):
+        from .. import modifier_profiling
+
+        extension = ".json" if self.file_format == 'JSON' else ".csv"
+        filepath = bpy.path.ensure_ext(self.filepath, extension)
+
+        try:
+            modifier_profiling.export_frame_range_profile(_frame_range_profile, filepath)
+        except OSError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Exported to {filepath}")
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        extension = ".json" if self.file_format == 'JSON' else ".csv"
+        self.filepath = bpy.path.ensure_ext("frame_range_profile", extension)
+        context.window_manager.fileselect_add(self)
+
+        return {'RUNNING_MODAL'}
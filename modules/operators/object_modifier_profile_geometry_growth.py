@@ -0,0 +1,66 @@
+from bpy.types import Operator
+
+from .. import geometry_growth, viewport_governor
+from ..utils import get_ml_active_object
+
+
+class OBJECT_OT_ml_profile_geometry_growth(Operator):
+    bl_idname = "object.ml_profile_geometry_growth"
+    bl_label = "Profile Geometry Growth"
+    bl_description = ("Evaluate the active object with the modifiers enabled up to each "
+                      "modifier and show how the geometry and its memory grow through the "
+                      "stack. The result is also shown in the modifier list when Geometry "
+                      "Growth is enabled in the list options")
+
+    # Growth factor from which a step is highlighted
+    alert_growth = 4.0
+
+    @classmethod
+    def poll(cls, context):
+        ob = get_ml_active_object()
+        return ob is not None and bool(ob.modifiers)
+
+    def draw(self, context):
+        from ..utils import format_bytes
+
+        layout = self.layout
+        ob = get_ml_active_object()
+        steps = geometry_growth.get_geometry_growth(ob)
+
+        if steps is None:
+            layout.label(text="The stack has changed")
+            return
+
+        col = layout.column(align=True)
+        row = col.row()
+        row.label(text="")
+        row.label(text="Vertices")
+        row.label(text="Edges")
+        row.label(text="Faces")
+        row.label(text="Memory")
+        row.label(text="Growth")
+
+        names = ["Original"] + [mod.name for mod in ob.modifiers]
+        previous_bytes = 0
+
+        for i, (name, (verts, edges, faces, size)) in enumerate(zip(names, steps)):
+            growth = size / previous_bytes if previous_bytes else 1.0
+            previous_bytes = size
+
+            row = col.row()
+            row.alert = growth >= self.alert_growth
+            row.label(text=name, icon='MESH_DATA' if i == 0 else 'MODIFIER')
+            row.label(text=f"{verts:,}")
+            row.label(text=f"{edges:,}")
+            row.label(text=f"{faces:,}")
+            row.label(text=format_bytes(size))
+            row.label(text=f"{growth:.2f}x" if i else "")
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        with viewport_governor.ignore_updates():
+            geometry_growth.profile_geometry_growth(context, get_ml_active_object())
+
+        return context.window_manager.invoke_popup(self, width=600)
@@ -0,0 +1,79 @@
+from bpy.types import Operator
+
+from .. import viewport_governor
+from ..utils import get_ml_active_object, get_selected_and_ml_active_objects
+
+
+# The result of the last profiling run, shown in the popup
+_render_settings_profile = []
+
+
+class OBJECT_OT_ml_profile_render_settings(Operator):
+    bl_idname = "object.ml_profile_render_settings"
+    bl_label = "Profile Render Settings"
+    bl_description = ("Evaluate the selected objects with the render settings of their "
+                      "modifiers, e.g. render levels, without rendering, and compare the "
+                      "evaluation time and geometry size with the viewport settings")
+
+    max_modifier_rows = 10
+
+    @classmethod
+    def poll(cls, context):
+        return get_ml_active_object() is not None
+
+    def draw(self, context):
+        from ..utils import format_bytes
+
+        layout = self.layout
+
+        if not _render_settings_profile:
+            layout.label(text="The selected objects have no modifiers")
+            return
+
+        total_time = sum(render_time for _, rows, _, _ in _render_settings_profile
+                         for _, _, render_time in rows)
+        total_bytes = sum(render_geometry[3] for _, _, _, render_geometry
+                          in _render_settings_profile)
+        layout.label(text=f"Render evaluation: {total_time * 1000:.1f} ms, "
+                          f"{format_bytes(total_bytes)}")
+
+        for ob_name, rows, viewport_geometry, render_geometry in _render_settings_profile:
+            box = layout.box()
+            box.label(text=ob_name, icon='OBJECT_DATA')
+
+            col = box.column(align=True)
+            row = col.row()
+            row.label(text="")
+            row.label(text="Viewport")
+            row.label(text="Render")
+            for mod_name, viewport_time, render_time in rows[:self.max_modifier_rows]:
+                row = col.row()
+                row.alert = render_time > viewport_time * 2 and render_time > 0.01
+                row.label(text=mod_name, icon='MODIFIER')
+                row.label(text=f"{viewport_time * 1000:.2f} ms")
+                row.label(text=f"{render_time * 1000:.2f} ms")
+            if len(rows) > self.max_modifier_rows:
+                col.label(text=f"... and {len(rows) - self.max_modifier_rows} more")
+
+            col = box.column(align=True)
+            for label, index in (("Vertices", 0), ("Faces", 2)):
+                row = col.row()
+                row.label(text=label)
+                row.label(text=f"{viewport_geometry[index]:,}")
+                row.label(text=f"{render_geometry[index]:,}")
+            row = col.row()
+            row.label(text="Memory")
+            row.label(text=format_bytes(viewport_geometry[3]))
+            row.label(text=format_bytes(render_geometry[3]))
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        from .. import modifier_profiling
+
+        with viewport_governor.ignore_updates():
+            _render_settings_profile[:] = modifier_profiling.profile_render_settings(
+                context, get_selected_and_ml_active_objects(context))
+
+        return context.window_manager.invoke_popup(self, width=500)
@@ -0,0 +1,98 @@
+import bpy
+from bpy.props import *
+from bpy.types import Operator
+
+from ..utils import (
+    capture_visibility_snapshot,
+    get_ml_active_object,
+    get_selected_and_ml_active_objects,
+    remove_visibility_snapshot,
+    restore_visibility_snapshot
+)
+
+# Name of the snapshot which stores the visibility before soloing
+SOLO_SNAPSHOT = "Solo"
+
+
+class OBJECT_OT_ml_visibility_snapshot_capture(Operator):
+    bl_idname = "object.ml_visibility_snapshot_capture"
+    bl_label = "Capture Visibility Snapshot"
+    bl_description = ("Store the viewport and render visibility of the modifiers of the "
+                      "selected objects under a name, so it can be restored later")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(name="Name", default="Snapshot")
+
+    @classmethod
+    def poll(cls, context):
+        return get_ml_active_object() is not None
+
+    def execute(self, context):
+        count = capture_visibility_snapshot(get_selected_and_ml_active_objects(context), self.name)
+        self.report({'INFO'}, f"Captured \"{self.name}\" on {count} object(s)")
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class OBJECT_OT_ml_visibility_snapshot_restore(Operator):
+    bl_idname = "object.ml_visibility_snapshot_restore"
+    bl_label = "Restore Visibility Snapshot"
+    bl_description = ("Restore the modifier visibility stored in the snapshot on the "
+                      "selected objects")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(options={'HIDDEN'})
+
+    def execute(self, context):
+        count = restore_visibility_snapshot(get_selected_and_ml_active_objects(context), self.name)
+        self.report({'INFO'}, f"Restored \"{self.name}\" on {count} object(s)")
+
+        return {'FINISHED'}
+
+
+class OBJECT_OT_ml_visibility_snapshot_remove(Operator):
+    bl_idname = "object.ml_visibility_snapshot_remove"
+    bl_label = "Remove Visibility Snapshot"
+    bl_description = "Remove the snapshot from the selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(options={'HIDDEN'})
+
+    def execute(self, context):
+        remove_visibility_snapshot(get_selected_and_ml_active_objects(context), self.name)
+
+        return {'FINISHED'}
+
+
+class OBJECT_OT_ml_modifier_solo(Operator):
+    bl_idname = "object.ml_modifier_solo"
+    bl_label = "Solo Active Modifier"
+    bl_description = ("Hide all modifiers of the active object except the active one in the "
+                      "viewport. Use again to restore the previous visibility")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        ob = get_ml_active_object()
+        return ob is not None and bool(ob.modifiers)
+
+    def execute(self, context):
+        ob = get_ml_active_object()
+
+        if SOLO_SNAPSHOT in ob.ml_visibility_snapshots:
+            restore_visibility_snapshot([ob], SOLO_SNAPSHOT, remove=True)
+            return {'FINISHED'}
+
+        if not capture_visibility_snapshot([ob], SOLO_SNAPSHOT):
+            return {'CANCELLED'}
+
+        show_viewport = [False] * len(ob.modifiers)
+        show_viewport[ob.ml_modifier_active_index] = True
+        ob.modifiers.foreach_set("show_viewport", show_viewport)
+        # foreach_set doesn't run the RNA update
+        ob.update_tag()
+
+        return {'FINISHED'}
@@ -2,6 +2,8 @@ import bpy
 from bpy.props import *
 from bpy.types import Operator
 
+from ..utils import set_smooth_shading
+
 
 class OBJECT_OT_ml_smooth_shading_set(Operator):
     bl_idname = "object.ml_smooth_shading_set"
@@ -35,8 +37,6 @@ class OBJECT_OT_ml_smooth_shading_set(Operator):
                 if mod.name == 'Smooth by Angle':
                     ob.modifiers.remove(mod)
 
-            for p in ob.data.polygons:
-                p.use_smooth = self.shade_smooth
-
+            set_smooth_shading([ob], self.shade_smooth)
 
         return {'FINISHED'}
@@ -9,13 +9,14 @@ from bpy.props import *
 from bpy.types import Operator
 from ... import __package__ as base_package
 
-from ..utils import get_ml_active_object
+from ..utils import (
+    capture_visibility_snapshot,
+    get_ml_active_object,
+    restore_visibility_snapshot
+)
 
-visibility_modifer_list = {}
-visibility_modifier_dict = {}
-
-def get_ml_active_object():
-    return bpy.context.view_layer.objects.active
+# Name of the visibility snapshot used by "Only Toggle Visible"
+TOGGLE_VISIBLE_SNAPSHOT = "Toggle Visible"
 
 
 class VIEW3D_OT_ml_toggle_all_modifiers(Operator):
@@ -24,7 +25,7 @@ class VIEW3D_OT_ml_toggle_all_modifiers(Operator):
     bl_description = """Toggle the visibility of all modifiers of the selected object(s). 
 The active object must have modifiers."
 
-Hold Shift to toggle modifiers based on current viewport on state.
+Hold Shift to hide the visible modifiers and show them again on the next click.
 """
     bl_options = {'REGISTER', 'UNDO'}
 
@@ -43,17 +44,13 @@ Hold Shift to toggle modifiers based on current viewport on state.
         return ml_act_ob is not None and bool(ml_act_ob.modifiers)
 
     def execute(self, context):
-        global visibility_modifer_list 
-        global visibility_modifier_dict
-
-        if self.only_toggle_visible == False:
-            ml_act_ob = get_ml_active_object()
-            sel_obs = context.selected_objects
-            obs = sel_obs.copy()
+        ml_act_ob = get_ml_active_object()
+        obs = context.selected_objects.copy()
 
-            if ml_act_ob not in obs:
-                obs.append(ml_act_ob)
+        if ml_act_ob not in obs:
+            obs.append(ml_act_ob)
 
+        if self.only_toggle_visible == False:
             ml_act_ob_all_mods_vis = [mod.show_viewport for mod in ml_act_ob.modifiers]
             show_mods = not any(ml_act_ob_all_mods_vis)
             skipped_linked_obs = False
@@ -79,28 +76,23 @@ Hold Shift to toggle modifiers based on current viewport on state.
                 self.report({'INFO'}, message + skipped_linked_obs_message)
 
         else:
-            if bpy.context.active_object is not None:
-                    active_object_name = bpy.context.view_layer.objects.active.name
-
-                    if active_object_name not in visibility_modifier_dict:
-                        visibility_modifier_dict[active_object_name] = []
-
-                    visibility_modifier_list = visibility_modifier_dict[active_object_name]
-
-                    if len(visibility_modifier_list) <= 0:
-                        ml_act_ob = get_ml_active_object()
-                        for mod in ml_act_ob.modifiers:
-                            if mod.show_viewport:
-                                visibility_modifier_list.append(mod)
-                                mod.show_viewport = False
-                    else:
-                        ml_act_ob = get_ml_active_object()
-                        hidden_modifiers = []
-                        for mod in ml_act_ob.modifiers:
-                            if mod in visibility_modifier_list:
-                                mod.show_viewport = True
-                                hidden_modifiers.append(mod)
-                        visibility_modifier_list = [mod for mod in visibility_modifier_list if mod not in hidden_modifiers]
-                        visibility_modifier_dict[active_object_name] = visibility_modifier_list
+            # Per object, hide the visible modifiers and store which ones
+            # they were, or show them again if they were hidden. Deciding
+            # per object keeps a stored snapshot from being overwritten.
+            hidden_obs = [ob for ob in obs
+                          if TOGGLE_VISIBLE_SNAPSHOT in ob.ml_visibility_snapshots]
+            visible_obs = [ob for ob in obs
+                           if TOGGLE_VISIBLE_SNAPSHOT not in ob.ml_visibility_snapshots]
+
+            restore_visibility_snapshot(hidden_obs, TOGGLE_VISIBLE_SNAPSHOT, remove=True)
+            capture_visibility_snapshot(visible_obs, TOGGLE_VISIBLE_SNAPSHOT)
+
+            for ob in visible_obs:
+                if ob.library and not ob.override_library:
+                    continue
+                ob.modifiers.foreach_set("show_viewport", [False] * len(ob.modifiers))
+                # foreach_set doesn't run the RNA update
+                ob.update_tag()
+
         return {'FINISHED'}
             
\ No newline at end of file
@@ -0,0 +1,79 @@
+from bpy.props import *
+from bpy.types import Operator
+
+from .. import quality_profiles
+
+
+class SCENE_OT_ml_quality_profile_capture(Operator):
+    bl_idname = "scene.ml_quality_profile_capture"
+    bl_label = "Capture Quality Profile"
+    bl_description = ("Store the quality settings of the modifiers, e.g. subdivision levels "
+                      "and Boolean solver, as a profile which can be applied with one click")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(name="Name", default="Preview")
+    use_selected: BoolProperty(
+        name="Selected Objects Only",
+        description="Only store the settings of the modifiers of the selected objects")
+
+    def execute(self, context):
+        objects = context.selected_objects if self.use_selected else context.scene.objects
+        count = quality_profiles.capture_profile(context.scene, self.name, objects)
+        self.report({'INFO'}, f"Stored {count} setting(s) in \"{self.name}\"")
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class SCENE_OT_ml_quality_profile_apply(Operator):
+    bl_idname = "scene.ml_quality_profile_apply"
+    bl_label = "Apply Quality Profile"
+    bl_description = ("Apply the stored quality settings to the modifiers. The current values "
+                      "are kept, so they can be restored")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(options={'HIDDEN'})
+
+    def execute(self, context):
+        count = quality_profiles.apply_profile(context.scene, self.name)
+
+        if count is None:
+            self.report({'ERROR'}, f"No profile named \"{self.name}\"")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Changed {count} setting(s)")
+
+        return {'FINISHED'}
+
+
+class SCENE_OT_ml_quality_profile_restore(Operator):
+    bl_idname = "scene.ml_quality_profile_restore"
+    bl_label = "Restore Original Quality"
+    bl_description = "Restore the quality settings from before a profile was applied"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.scene.modifier_list.quality_profile_originals.settings)
+
+    def execute(self, context):
+        count = quality_profiles.restore_originals(context.scene)
+        self.report({'INFO'}, f"Restored {count} setting(s)")
+
+        return {'FINISHED'}
+
+
+class SCENE_OT_ml_quality_profile_remove(Operator):
+    bl_idname = "scene.ml_quality_profile_remove"
+    bl_label = "Remove Quality Profile"
+    bl_description = "Remove the quality profile"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(options={'HIDDEN'})
+
+    def execute(self, context):
+        quality_profiles.remove_profile(context.scene, self.name)
+
+        return {'FINISHED'}
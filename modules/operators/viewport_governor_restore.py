@@ -0,0 +1,33 @@
+from bpy.types import Operator
+
+from .. import viewport_governor
+
+
+class OBJECT_OT_ml_viewport_governor_restore(Operator):
+    bl_idname = "object.ml_viewport_governor_restore"
+    bl_label = "Restore"
+    bl_description = "Restore all modifiers hidden or downgraded by the viewport governor"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(viewport_governor.get_changes(context.scene))
+
+    def execute(self, context):
+        viewport_governor.restore_all(context.scene, reason="Restored manually")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_ml_viewport_governor_log_clear(Operator):
+    bl_idname = "object.ml_viewport_governor_log_clear"
+    bl_label = "Clear Log"
+    bl_description = "Clear the log of the changes made by the viewport governor"
+    bl_options = {'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(viewport_governor.get_log())
+
+    def execute(self, context):
+        viewport_governor.clear_log()
+        return {'FINISHED'}
@@ -8,7 +8,7 @@ from bpy.props import *
 from bpy.types import AddonPreferences, PropertyGroup
 from mathutils import Vector
 
-from .icons import load_icons
+from .icons import set_icon_color
 from .modifier_categories import ALL_MODIFIERS_NAMES_ICONS_TYPES
 from .ui.properties_editor import register_DATA_PT_modifiers, reregister_DATA_PT_modifiers
 from .ui.ui_common import box_with_header, favourite_modifiers_configuration_layout
@@ -140,7 +140,7 @@ def sidebar_category_callback(self, context):
 
 
 def icon_color_callback(self, context):
-    load_icons()
+    set_icon_color(self.icon_color)
     prefs_callback(self, context)
 
 
@@ -594,6 +594,46 @@ class Preferences(AddonPreferences):
         options={'ENUM_FLAG'},
         update=prefs_callback)
 
+    profile_startup: BoolProperty(
+        name="Log Startup Timings",
+        description="Print how long importing modules, registering classes, register functions "
+                    "and file load handlers take into the system console (requires restart). "
+                    "Can also be enabled with the MODIFIER_LIST_PROFILE_STARTUP environment variable",
+        update=prefs_callback)
+
+    edit_mode_auto_hide: BoolProperty(
+        name="Auto Hide Heavy Modifiers In Edit Mode",
+        description="When entering Edit Mode, disable Edit Mode display of modifiers of the "
+                    "chosen types or above the time threshold and restore it when leaving Edit "
+                    "Mode. Can be overridden per object",
+        update=prefs_callback)
+
+    edit_mode_auto_hide_types_items = [
+        ("SUBSURF", "Subdivision Surface", ""),
+        ("MULTIRES", "Multiresolution", ""),
+        ("BOOLEAN", "Boolean", ""),
+        ("BEVEL", "Bevel", ""),
+        ("REMESH", "Remesh", ""),
+        ("SOLIDIFY", "Solidify", ""),
+        ("ARRAY", "Array", ""),
+        ("NODES", "Geometry Nodes", ""),
+    ]
+    edit_mode_auto_hide_types: EnumProperty(
+        items=edit_mode_auto_hide_types_items,
+        name="Types",
+        description="Modifier types to hide in Edit Mode",
+        default={'SUBSURF', 'BOOLEAN', 'BEVEL'},
+        options={'ENUM_FLAG'},
+        update=prefs_callback)
+
+    edit_mode_auto_hide_threshold: FloatProperty(
+        name="Time Threshold (ms)",
+        description="Also hide modifiers of other types whose evaluation takes longer than this. "
+                    "0 disables the threshold",
+        default=20.0,
+        min=0.0,
+        update=prefs_callback)
+
     # === Popup settings ===
     popup_width: IntProperty(
         name="Width",
@@ -622,8 +662,25 @@ class Preferences(AddonPreferences):
     match_gizmo_size_to_object: BoolProperty(
         name="Match Gizmo Size To Active Object",
         description="Automatically match the size of the gizmo to the largest dimension of the "
-                    "active object (before modifiers).\n"
-                    "NOTE: This can be a bit slow on heavy meshes",
+                    "active object (before modifiers)",
+        update=prefs_callback)
+
+    match_gizmo_size_to_evaluated_bounds: BoolProperty(
+        name="Use Bounds After Modifiers",
+        description="When matching the size of the gizmo, use the bounds of the active object "
+                    "after modifiers instead of its base mesh",
+        update=prefs_callback)
+
+    lattice_fit_mode_items = [
+        ("AXIS_ALIGNED", "Object Axes", "Align the lattice with the axes of the object"),
+        ("ORIENTED", "Oriented", "Rotate the lattice to fit the selection or vertex group "
+                                 "as tightly as possible")
+    ]
+    lattice_fit_mode: EnumProperty(
+        items=lattice_fit_mode_items,
+        name="Lattice Fit",
+        description="How a new lattice gizmo is fitted to the selected vertices or the vertex "
+                    "group of the modifier",
         update=prefs_callback)
 
     always_delete_gizmo: BoolProperty(
@@ -751,6 +808,14 @@ class Preferences(AddonPreferences):
             split.label(text="Show Info Messages For")
             split.row().prop(self, "batch_ops_reports", expand=True)
 
+            box.prop(self, "profile_startup")
+
+            box.prop(self, "edit_mode_auto_hide")
+            col = box.column()
+            col.active = self.edit_mode_auto_hide
+            col.prop(self, "edit_mode_auto_hide_types")
+            col.prop(self, "edit_mode_auto_hide_threshold")
+
         # === Popup ===
         _, box = box_with_header(layout, "Popup", prefs_ui_props, "popup_expand")
 
@@ -771,6 +836,12 @@ class Preferences(AddonPreferences):
         if prefs_ui_props.gizmo_expand:
             box.prop(self, "parent_new_gizmo_to_object")
             box.prop(self, "match_gizmo_size_to_object")
+            row = box.row()
+            row.active = self.match_gizmo_size_to_object
+            row.prop(self, "match_gizmo_size_to_evaluated_bounds")
+            split = box.split()
+            split.label(text="Lattice Fit")
+            split.row().prop(self, "lattice_fit_mode", expand=True)
             box.prop(self, "always_delete_gizmo")
 
         # === Modifier Defaults ===
@@ -24,6 +24,15 @@ def modifier_active_index_set(self, value):
         mods[value].is_active = True
 
 
+def on_governor_enabled_change(self, context):
+    from . import viewport_governor
+
+    if self.governor_enabled:
+        viewport_governor.start()
+    else:
+        viewport_governor.restore_all(self.id_data)
+
+
 def pinned_object_ensure_users(scene):
     """Handler for making sure a pinned object which is only used by
     pinned_object, i.e. an object which was deleted while it was
@@ -244,10 +253,103 @@ class VolumeModifiersCollection(PropertyGroup):
 # Property groups
 # ======================================================================
 
+class ML_GizmoObjectProperties(PropertyGroup):
+    # Set on gizmo objects created by the add-on so the modifier that
+    # uses a gizmo can be found without searching all objects. The owner
+    # is stored by name instead of as a pointer, so a gizmo doesn't keep
+    # its deleted owner alive.
+    owner_name: StringProperty()
+    modifier_uid: IntProperty()
+    property: StringProperty()
+
+
+class ML_EditMeshBackup(PropertyGroup):
+    # The name is the index stored in the Edit Mesh modifier
+    mesh: PointerProperty(type=bpy.types.Mesh)
+
+
+class ML_EditMeshBackups(PropertyGroup):
+    backups: CollectionProperty(type=ML_EditMeshBackup)
+    # Index for the next backup, so it doesn't have to be searched for
+    next_index: IntProperty()
+
+
+class ML_ModifierVisibility(PropertyGroup):
+    # Modifiers are identified by persistent_uid, which stays the same
+    # when a modifier is renamed or moved
+    persistent_uid: IntProperty()
+    show_viewport: BoolProperty()
+    show_render: BoolProperty()
+
+
+class ML_VisibilitySnapshot(PropertyGroup):
+    modifiers: CollectionProperty(type=ML_ModifierVisibility)
+
+
+class ML_HiddenModifier(PropertyGroup):
+    persistent_uid: IntProperty()
+
+
+class ML_QualitySetting(PropertyGroup):
+    object: PointerProperty(type=bpy.types.Object)
+    modifier_uid: IntProperty()
+    property: StringProperty()
+    value_type: EnumProperty(items=(
+        ('INT', "Integer", ""),
+        ('FLOAT', "Float", ""),
+        ('ENUM', "Enum", ""),
+    ))
+    value_float: FloatProperty()
+    value_string: StringProperty()
+
+
+class ML_QualityProfile(PropertyGroup):
+    settings: CollectionProperty(type=ML_QualitySetting)
+
+
 class ML_SceneProperties(PropertyGroup):
     pinned_object: PointerProperty(
         type=bpy.types.Object,
         update=on_pinned_object_change)
+    governor_enabled: BoolProperty(
+        name="Viewport Governor",
+        description="Temporarily hide or downgrade the costliest modifiers in the scene "
+                    "while the viewport is too slow during interaction or playback. They "
+                    "are restored when the scene is idle, before rendering and before saving",
+        update=on_governor_enabled_change)
+    governor_time_budget: FloatProperty(
+        name="Time Budget",
+        description="Maximum total evaluation time of the modifiers in the viewport in "
+                    "milliseconds",
+        default=33.0,
+        min=1.0)
+    governor_min_fps: FloatProperty(
+        name="Minimum Playback FPS",
+        description="Frame rate below which modifiers are degraded during playback",
+        default=20.0,
+        min=1.0)
+    governor_restore_delay: FloatProperty(
+        name="Restore After",
+        description="Seconds of idle time after which the modifiers are restored",
+        default=2.0,
+        min=0.0)
+    governor_action: EnumProperty(
+        name="Action",
+        items=(
+            ('HIDE', "Hide", "Hide the modifiers in the viewport"),
+            ('DOWNGRADE', "Downgrade", "Set the viewport levels of Subdivision Surface and "
+                                       "Multiresolution modifiers to 0 and hide others"),
+        ),
+        default='HIDE')
+    # Original values of the settings changed by the governor. They are
+    # stored in the scene, so they follow undo and are restored after
+    # loading a file which was saved without restoring them, e.g. an
+    # autosave.
+    governor_changes: CollectionProperty(type=ML_QualitySetting)
+    quality_profiles: CollectionProperty(type=ML_QualityProfile)
+    # Values from before a profile was applied for the first time
+    quality_profile_originals: PointerProperty(type=ML_QualityProfile)
+    active_quality_profile: StringProperty()
 
 
 class ML_PreferencesUIProperties(PropertyGroup):
@@ -288,6 +390,15 @@ class ML_WindowManagerProperties(PropertyGroup):
     preferences_ui_props: PointerProperty(type=ML_PreferencesUIProperties)
     active_favourite_modifier_slot_index: IntProperty()
     gizmo_object_settings_expand: BoolProperty()
+    attribute_stats_expand: BoolProperty()
+    attribute_stats_use_evaluated: BoolProperty(
+        name="Evaluated",
+        description="Show the statistics of the mesh after modifiers, e.g. to inspect "
+                    "attributes created by Geometry Nodes")
+    attribute_stats_evaluated_attribute: StringProperty(
+        name="Attribute",
+        description="Attribute of the evaluated mesh to show the statistics of. "
+                    "When empty, the active attribute is used")
 
 
 # Registering
@@ -302,6 +413,14 @@ classes = (
     PointcloudModifiersCollection,
     SurfaceModifiersCollection,
     VolumeModifiersCollection,
+    ML_GizmoObjectProperties,
+    ML_EditMeshBackup,
+    ML_EditMeshBackups,
+    ML_ModifierVisibility,
+    ML_VisibilitySnapshot,
+    ML_HiddenModifier,
+    ML_QualitySetting,
+    ML_QualityProfile,
     ML_SceneProperties,
     ML_PreferencesUIProperties,
     ML_WindowManagerProperties
@@ -319,6 +438,12 @@ def register():
         get=modifier_active_index_get,
         set=modifier_active_index_set)
 
+    bpy.types.Object.ml_gizmo = PointerProperty(type=ML_GizmoObjectProperties)
+    bpy.types.Object.ml_edit_mesh = PointerProperty(type=ML_EditMeshBackups)
+    bpy.types.Object.ml_visibility_snapshots = CollectionProperty(type=ML_VisibilitySnapshot)
+    # Modifiers hidden in Edit Mode by edit_mode_auto_hide
+    bpy.types.Object.ml_edit_mode_hidden_modifiers = CollectionProperty(type=ML_HiddenModifier)
+
     wm = bpy.types.WindowManager
     wm.modifier_list = PointerProperty(type=ML_WindowManagerProperties)
 
@@ -340,6 +465,10 @@ def unregister():
     bpy.app.handlers.load_post.remove(on_file_load)
 
     del bpy.types.Object.ml_modifier_active_index
+    del bpy.types.Object.ml_gizmo
+    del bpy.types.Object.ml_edit_mesh
+    del bpy.types.Object.ml_visibility_snapshots
+    del bpy.types.Object.ml_edit_mode_hidden_modifiers
     del bpy.types.WindowManager.modifier_list
     del bpy.types.Scene.modifier_list
 
@@ -0,0 +1,185 @@
+"""Scene quality profiles.
+
+A profile stores the quality related settings of modifiers, e.g. the
+levels of Subdivision Surface modifiers or the solver of Boolean
+modifiers, so they can be switched for many modifiers at once, e.g.
+between "Preview" and "Final". Before a profile is applied for the first
+time, the current values of the affected settings are stored, so they
+can be restored.
+
+Profiles are stored in Scene.modifier_list.quality_profiles. Modifiers
+are identified by their object and persistent_uid, so renaming doesn't
+break profiles.
+"""
+
+
+# Quality related properties per modifier type
+QUALITY_PROPERTIES = {
+    'SUBSURF': ("levels", "render_levels"),
+    'MULTIRES': ("levels", "render_levels"),
+    'BOOLEAN': ("solver",),
+    'REMESH': ("voxel_size", "octree_depth"),
+    'DECIMATE': ("ratio",),
+    'ARRAY': ("count",),
+    'OCEAN': ("resolution", "viewport_resolution"),
+}
+
+
+def _get_quality_settings(ob):
+    """Yields (modifier, property name) for the quality related
+    properties of the modifiers of the object.
+    """
+    for mod in ob.modifiers:
+        for prop in QUALITY_PROPERTIES.get(mod.type, ()):
+            if hasattr(mod, prop):
+                yield mod, prop
+
+
+def store_value(setting, mod, prop):
+    value = getattr(mod, prop)
+
+    if isinstance(value, str):
+        setting.value_type = 'ENUM'
+        setting.value_string = value
+    elif isinstance(value, int):
+        setting.value_type = 'INT'
+        setting.value_float = value
+    else:
+        setting.value_type = 'FLOAT'
+        setting.value_float = value
+
+
+def get_stored_value(setting):
+    if setting.value_type == 'ENUM':
+        return setting.value_string
+    if setting.value_type == 'INT':
+        return round(setting.value_float)
+    return setting.value_float
+
+
+def _store_settings(profile, settings_to_store):
+    for ob, mod, prop in settings_to_store:
+        setting = profile.settings.add()
+        setting.object = ob
+        setting.modifier_uid = mod.persistent_uid
+        setting.property = prop
+        store_value(setting, mod, prop)
+
+
+def capture_profile(scene, name, objects):
+    """Stores the quality settings of the modifiers of the given objects
+    as a profile with the given name, replacing an existing one.
+
+    Returns the number of stored settings.
+    """
+    profiles = scene.modifier_list.quality_profiles
+    profile = profiles.get(name)
+
+    if profile is None:
+        profile = profiles.add()
+        profile.name = name
+    else:
+        profile.settings.clear()
+
+    settings_to_store = [(ob, mod, prop) for ob in objects
+                         for mod, prop in _get_quality_settings(ob)]
+    _store_settings(profile, settings_to_store)
+
+    return len(settings_to_store)
+
+
+def _resolve_settings(profile):
+    """Returns (object, modifier, property, stored value) for the
+    settings of the profile whose modifier still exists. The modifiers
+    of each object are looked up only once.
+    """
+    modifiers_by_object = {}
+    resolved = []
+
+    for setting in profile.settings:
+        ob = setting.object
+
+        if ob is None:
+            continue
+
+        modifiers = modifiers_by_object.get(ob)
+        if modifiers is None:
+            modifiers = {mod.persistent_uid: mod for mod in ob.modifiers}
+            modifiers_by_object[ob] = modifiers
+
+        mod = modifiers.get(setting.modifier_uid)
+
+        if mod is not None and hasattr(mod, setting.property):
+            resolved.append((ob, mod, setting.property, get_stored_value(setting)))
+
+    return resolved
+
+
+def _write_settings(resolved):
+    changed_count = 0
+
+    for ob, mod, prop, value in resolved:
+        if ob.library and not ob.override_library:
+            continue
+        if getattr(mod, prop) != value:
+            setattr(mod, prop, value)
+            changed_count += 1
+
+    return changed_count
+
+
+def apply_profile(scene, name):
+    """Applies the profile with the given name. The original values of
+    the settings are stored first, unless they are already stored.
+
+    Returns the number of changed settings or None if there's no
+    profile with the name.
+    """
+    ml_props = scene.modifier_list
+    profile = ml_props.quality_profiles.get(name)
+
+    if profile is None:
+        return None
+
+    resolved = _resolve_settings(profile)
+    originals = ml_props.quality_profile_originals
+
+    # Store the values of settings which haven't been stored yet, so
+    # switching between profiles keeps the values from before the first
+    # switch
+    stored = {(setting.object, setting.modifier_uid, setting.property)
+              for setting in originals.settings}
+    _store_settings(originals, [(ob, mod, prop) for ob, mod, prop, _ in resolved
+                                if (ob, mod.persistent_uid, prop) not in stored])
+
+    changed_count = _write_settings(resolved)
+    ml_props.active_quality_profile = name
+
+    return changed_count
+
+
+def restore_originals(scene):
+    """Restores the values from before the first profile was applied.
+
+    Returns the number of changed settings.
+    """
+    ml_props = scene.modifier_list
+    originals = ml_props.quality_profile_originals
+
+    changed_count = _write_settings(_resolve_settings(originals))
+    originals.settings.clear()
+    ml_props.active_quality_profile = ""
+
+    return changed_count
+
+
+def remove_profile(scene, name):
+    ml_props = scene.modifier_list
+    profiles = ml_props.quality_profiles
+    index = profiles.find(name)
+
+    if index != -1:
+        profiles.remove(index)
+
+    if ml_props.active_quality_profile == name:
+        ml_props.active_quality_profile = ""
@@ -1,13 +1,167 @@
 import bpy
+from bpy.app.handlers import persistent
+
+from .ui_common import box_with_header, sparkline
 from ..utils import get_ml_active_object
 
-def update_atri_float_value(self, context):
-    wm = context.window_manager
-    bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_float=wm.atri_float_value)
 
-def atri_update_float_color_value(self, context):
-    wm = context.window_manager
-    bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_color=wm.atri_float_color_value)
+# Attribute statistics
+# ======================================================================
+
+# Statistics are cached until the geometry of the mesh or the object
+# changes. Keys: (("MESH", mesh name) or ("OBJECT", object name) for
+# the evaluated mesh, attribute name, domain, data type)
+_attribute_stats_cache = {}
+
+
+@persistent
+def invalidate_attribute_stats_cache(scene, depsgraph):
+    if not _attribute_stats_cache:
+        return
+
+    ids_to_invalidate = set()
+
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+
+        id_data = update.id.original
+
+        if isinstance(id_data, bpy.types.Object):
+            ids_to_invalidate.add(("OBJECT", id_data.name))
+            if id_data.type == 'MESH':
+                ids_to_invalidate.add(("MESH", id_data.data.name))
+        elif isinstance(id_data, bpy.types.Mesh):
+            ids_to_invalidate.add(("MESH", id_data.name))
+
+    if ids_to_invalidate:
+        for key in [key for key in _attribute_stats_cache if key[0] in ids_to_invalidate]:
+            del _attribute_stats_cache[key]
+
+
+@persistent
+def clear_attribute_stats_cache(dummy):
+    _attribute_stats_cache.clear()
+
+
+def _get_attribute_stats(id_key, attribute):
+    from .. import attribute_utils
+
+    key = (id_key, attribute.name, attribute.domain, attribute.data_type)
+    stats = _attribute_stats_cache.get(key)
+
+    if stats is None:
+        stats = attribute_utils.compute_attribute_stats(attribute)
+        _attribute_stats_cache[key] = stats
+
+    return stats
+
+
+def _format_values(values):
+    return ", ".join(f"{value:.4g}" for value in values)
+
+
+def attribute_stats_ui(context, layout, ob):
+    ml_props = context.window_manager.modifier_list
+
+    _, box = box_with_header(layout, "Statistics", ml_props, "attribute_stats_expand")
+
+    if not ml_props.attribute_stats_expand:
+        return
+
+    box.prop(ml_props, "attribute_stats_use_evaluated")
+
+    if ml_props.attribute_stats_use_evaluated:
+        depsgraph = context.evaluated_depsgraph_get()
+        mesh = ob.evaluated_get(depsgraph).data
+        id_key = ("OBJECT", ob.name)
+        box.prop_search(ml_props, "attribute_stats_evaluated_attribute", mesh, "attributes",
+                        text="")
+        attribute_name = ml_props.attribute_stats_evaluated_attribute
+        if not attribute_name and ob.data.attributes.active:
+            attribute_name = ob.data.attributes.active.name
+        attribute = mesh.attributes.get(attribute_name)
+    else:
+        mesh = ob.data
+        id_key = ("MESH", mesh.name)
+        attribute = mesh.attributes.active
+        if ob.mode == 'EDIT':
+            box.label(text="Updated when leaving Edit Mode", icon='INFO')
+
+    if attribute is None:
+        box.label(text="No attribute")
+        return
+
+    if attribute.data_type == 'STRING':
+        box.label(text="String attributes are not supported")
+        return
+
+    stats = _get_attribute_stats(id_key, attribute)
+
+    col = box.column(align=True)
+    col.label(text=f"Elements: {stats['count']}")
+    col.label(text=f"Non-Zero: {stats['non_zero']}")
+
+    if not stats["count"]:
+        return
+
+    col.label(text=f"Min: {_format_values(stats['min'])}")
+    col.label(text=f"Max: {_format_values(stats['max'])}")
+    col.label(text=f"Mean: {_format_values(stats['mean'])}")
+
+    if stats["histogram"]:
+        col.separator()
+        low, high = stats["histogram_range"]
+        histogram_of = "Values" if stats["size"] == 1 else "Lengths"
+        col.label(text=f"{histogram_of} {low:.4g} to {high:.4g}:")
+        col.label(text=sparkline(stats["histogram"]))
+
+
+# Assigning values
+# ======================================================================
+
+# Seconds to wait after a value change before assigning it, so dragging
+# a slider doesn't write the attribute on every step
+ASSIGN_DELAY = 0.1
+
+# Window, area and object name of the last value change. The timer has
+# no context of its own, so the assignment runs with this one.
+_pending_assign = {}
+
+
+def _assign_pending_value():
+    from .. import attribute_utils
+
+    window = _pending_assign.pop("window", None)
+    area = _pending_assign.pop("area", None)
+    obj = bpy.data.objects.get(_pending_assign.pop("object", ""))
+
+    if window is None or window not in bpy.context.window_manager.windows[:]:
+        return None
+    if obj is None or obj.type != 'MESH' or obj.mode not in {'OBJECT', 'EDIT'}:
+        return None
+    if area is not None and area not in window.screen.areas[:]:
+        area = None
+
+    with bpy.context.temp_override(window=window, area=area, object=obj, active_object=obj):
+        attribute_utils.assign_attribute_value(bpy.context)
+        bpy.ops.ed.undo_push(message="Assign Attribute Value")
+
+    return None
+
+
+def update_atri_value(self, context):
+    obj = context.object
+
+    if obj is None or context.window is None:
+        return
+
+    _pending_assign.update(window=context.window, area=context.area, object=obj.name)
+
+    if bpy.app.timers.is_registered(_assign_pending_value):
+        bpy.app.timers.unregister(_assign_pending_value)
+    bpy.app.timers.register(_assign_pending_value, first_interval=ASSIGN_DELAY)
+
 
 def attributes_ui(context, layout, num_of_rows=5):
     mesh = get_ml_active_object().data
@@ -32,25 +186,36 @@ def attributes_ui(context, layout, num_of_rows=5):
 
     col.menu("MESH_MT_attribute_context_menu", icon='DOWNARROW_HLT', text="")
 
-    if context.active_object.mode == 'EDIT':
+    if context.active_object.mode in {'OBJECT', 'EDIT'}:
         wm = context.window_manager
-        row = layout.row(align=True)
-        if bpy.context.object.data.attributes.active and bpy.context.object.data.attributes.active.data_type == "BOOLEAN":
-            row.operator("object.ml_atri_op", text="Assign").type = "Assign"
+        active_attribute = context.object.data.attributes.active
+        data_type = active_attribute.data_type if active_attribute else None
+
+        if data_type == "FLOAT":
+            layout.prop(wm, "atri_float_value", text="Float Value")
+        elif data_type in {"INT", "INT8", "INT32_2D"}:
+            layout.prop(wm, "atri_int_value", text="Integer Value")
+        elif data_type in {"FLOAT_VECTOR", "FLOAT2"}:
+            layout.row(align=True).prop(wm, "atri_vector_value", text="")
+        elif data_type in {"FLOAT_COLOR", "BYTE_COLOR"}:
+            layout.prop(wm, "atri_float_color_value", text="")
+
+        if data_type and data_type != "STRING":
+            row = layout.row(align=True)
+            if data_type not in {"QUATERNION", "FLOAT4X4"}:
+                row.operator("object.ml_atri_op", text="Assign").type = "Assign"
             row.operator("object.ml_atri_op", text="Remove").type = "Remove"
             row.operator("object.ml_atri_op", text="Select").type = "Select"
-        if bpy.context.object.data.attributes.active and bpy.context.object.data.attributes.active.data_type == "FLOAT":
-            row.prop(wm, "atri_float_value", text="Float Value")
-        if bpy.context.object.data.attributes.active and bpy.context.object.data.attributes.active.data_type == "FLOAT_COLOR":
-            row.operator("object.ml_atri_op", text="Assign").type = "Assign"
-            row.operator("object.ml_atri_op", text="Remove").type = "Remove"
-            row.prop(wm, "atri_float_color_value", text="")
 
         row = layout.row(align=True)
         row.operator("object.ml_atri_op", text="Vertex Group", icon="VERTEXSEL").type = "Vertex"
         row.operator("object.ml_atri_op", text="Edge Group", icon="EDGESEL").type = "Edge"
         row.operator("object.ml_atri_op", text="Face Group", icon="FACESEL").type = "Face"
 
+    ob = get_ml_active_object()
+    if ob.type == 'MESH':
+        attribute_stats_ui(context, layout, ob)
+
 
 
 class AtriOP(bpy.types.Operator):
@@ -63,61 +228,48 @@ class AtriOP(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return context.active_object is not None and context.active_object.mode == 'EDIT'
+        ob = context.active_object
+        return ob is not None and ob.type == 'MESH' and ob.mode in {'OBJECT', 'EDIT'}
 
     def execute(self, context):
-        wm = context.window_manager
-        sel_mode = context.tool_settings.mesh_select_mode[:]
-        active_type = bpy.context.object.data.attributes.active
+        from .. import attribute_utils
+
         if self.type == "Assign":
-            if active_type and active_type.data_type == "BOOLEAN":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_bool=True)
-            if active_type and active_type.data_type == "FLOAT":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_float=wm.atri_float_value)
-            if active_type and active_type.data_type == "FLOAT_COLOR":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_color=wm.atri_float_color_value)
+            attribute_utils.assign_attribute_value(context)
         elif self.type == "Remove":
-            if active_type and active_type.data_type == "BOOLEAN":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_bool=False)
-            if active_type and active_type.data_type == "FLOAT":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_float=0.0)
-            if active_type and active_type.data_type == "FLOAT_COLOR":
-                bpy.ops.mesh.attribute_set('EXEC_DEFAULT', True, value_color=(0.0, 0.0, 0.0, 0.0))
+            attribute_utils.remove_attribute_value(context)
         elif self.type == "Select":
-            # need to change to the select mode first of the attribute, otherwise it will not work
-            if active_type and active_type.domain == "POINT":
-                context.tool_settings.mesh_select_mode = (True, False, False)
-            elif active_type and active_type.domain == "EDGE":
-                context.tool_settings.mesh_select_mode = (False, True, False)
-            elif active_type and active_type.domain == "FACE":
-                context.tool_settings.mesh_select_mode = (False, False, True)
-            bpy.ops.mesh.select_by_attribute()
-           
-
+            attribute_utils.select_by_attribute(context)
         elif self.type == "Vertex":
-            context.tool_settings.mesh_select_mode = (True, False, False)
-            bpy.ops.geometry.attribute_add(name="Vertex_Group", data_type='BOOLEAN', domain='POINT')
-            bpy.ops.object.ml_atri_op(type="Assign")
-            context.tool_settings.mesh_select_mode = (sel_mode[0], sel_mode[1], sel_mode[2])
+            attribute_utils.add_selection_group(context, 'POINT')
         elif self.type == "Edge":
-            context.tool_settings.mesh_select_mode = (False, True, False)
-            bpy.ops.geometry.attribute_add(name="Edge_Group", data_type='BOOLEAN', domain='EDGE')
-            bpy.ops.object.ml_atri_op(type="Assign")
-            context.tool_settings.mesh_select_mode = (sel_mode[0], sel_mode[1], sel_mode[2])
+            attribute_utils.add_selection_group(context, 'EDGE')
         elif self.type == "Face":
-            context.tool_settings.mesh_select_mode = (False, False, True)
-            bpy.ops.geometry.attribute_add(name="Face_Group", data_type='BOOLEAN', domain='FACE')
-            bpy.ops.object.ml_atri_op(type="Assign")
-            context.tool_settings.mesh_select_mode = (sel_mode[0], sel_mode[1], sel_mode[2])
+            attribute_utils.add_selection_group(context, 'FACE')
 
         return {'FINISHED'}
 
 def register():
-    bpy.types.WindowManager.atri_float_value = bpy.props.FloatProperty(name="Float Value", default=1.0, update=update_atri_float_value)
-    bpy.types.WindowManager.atri_float_color_value = bpy.props.FloatVectorProperty(size=4, subtype="COLOR", name="Float Color Value", default=(1.0, 1.0, 1.0, 1.0), min=0.0, max=1.0, update=atri_update_float_color_value)
+    bpy.types.WindowManager.atri_float_value = bpy.props.FloatProperty(name="Float Value", default=1.0, update=update_atri_value)
+    bpy.types.WindowManager.atri_int_value = bpy.props.IntProperty(name="Integer Value", default=1, update=update_atri_value)
+    bpy.types.WindowManager.atri_vector_value = bpy.props.FloatVectorProperty(size=3, name="Vector Value", default=(0.0, 0.0, 0.0), update=update_atri_value)
+    bpy.types.WindowManager.atri_float_color_value = bpy.props.FloatVectorProperty(size=4, subtype="COLOR", name="Float Color Value", default=(1.0, 1.0, 1.0, 1.0), min=0.0, max=1.0, update=update_atri_value)
+
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_attribute_stats_cache)
+    bpy.app.handlers.load_post.append(clear_attribute_stats_cache)
 
 def unregister():
+    if bpy.app.timers.is_registered(_assign_pending_value):
+        bpy.app.timers.unregister(_assign_pending_value)
+    _pending_assign.clear()
+
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_attribute_stats_cache)
+    bpy.app.handlers.load_post.remove(clear_attribute_stats_cache)
+    _attribute_stats_cache.clear()
+
     del bpy.types.WindowManager.atri_float_value
+    del bpy.types.WindowManager.atri_int_value
+    del bpy.types.WindowManager.atri_vector_value
     del bpy.types.WindowManager.atri_float_color_value
 
 
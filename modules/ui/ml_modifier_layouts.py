@@ -1,21 +1,36 @@
 import bpy
 
-# Check if the modifier layouts can be imported from Blender. If not,
-# import the layouts included in this addon. This is needed for 2.90 and
-# later because the modifier layouts have been moved from Python into C
-# in Blender 2.90 since 5.6.2020.
-from bl_ui import properties_data_modifier
-if hasattr(properties_data_modifier.DATA_PT_modifiers, "ARRAY"):
-    from bl_ui.properties_data_modifier import DATA_PT_modifiers
-else:
-    from .properties_data_modifier import DATA_PT_modifiers
-
 from..utils import get_gizmo_object_from_modifier
 
 
+_DATA_PT_modifiers = None
+
+
+def get_DATA_PT_modifiers():
+    """Returns the panel class containing the modifier layouts.
+
+    Check if the modifier layouts can be imported from Blender. If not,
+    import the layouts included in this addon. This is needed for 2.90
+    and later because the modifier layouts have been moved from Python
+    into C in Blender 2.90 since 5.6.2020. The included layouts are big,
+    so they are only imported when a layout is drawn for the first time.
+    """
+    global _DATA_PT_modifiers
+
+    if _DATA_PT_modifiers is None:
+        from bl_ui import properties_data_modifier
+        if hasattr(properties_data_modifier.DATA_PT_modifiers, "ARRAY"):
+            _DATA_PT_modifiers = properties_data_modifier.DATA_PT_modifiers
+        else:
+            from .properties_data_modifier import DATA_PT_modifiers
+            _DATA_PT_modifiers = DATA_PT_modifiers
+
+    return _DATA_PT_modifiers
+
+
 def BOOLEAN(layout, ob, md):
     context = bpy.context
-    mp = DATA_PT_modifiers(context)
+    mp = get_DATA_PT_modifiers()(context)
     mp.BOOLEAN(layout, ob, md)
 
     if ((md.operand_type == 'OBJECT' and not md.object)
@@ -163,5 +178,5 @@ def LATTICE(layout, ob, md):
 
         layout.separator()
 
-    mp = DATA_PT_modifiers(context)
+    mp = get_DATA_PT_modifiers()(context)
     mp.LATTICE(layout, ob, md)
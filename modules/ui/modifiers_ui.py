@@ -1,28 +1,18 @@
-import numpy as np
-
 import bpy
 from bpy.props import *
 from bpy.types import Menu, Panel, UIList
 from ... import __package__ as base_package
 
-# Check if the modifier layouts can be imported from Blender. If not,
-# import the layouts included in this addon. This is needed for 2.90 and
-# later because the modifier layouts have been moved from Python into C
-# in Blender 2.90 since 5.6.2020.
-from bl_ui import properties_data_modifier
-if hasattr(properties_data_modifier.DATA_PT_modifiers, "ARRAY"):
-    from bl_ui.properties_data_modifier import DATA_PT_modifiers
-else:
-    from .properties_data_modifier import DATA_PT_modifiers
-
 from . import ml_modifier_layouts
 from .ui_common import box_with_header
 from ..icons import get_icons
-from .. import modifier_categories
+from .. import geometry_growth, modifier_categories
 from ..utils import (
     favourite_modifiers_names_icons_types,
     get_gizmo_object_from_modifier,
+    get_gizmo_owner,
     get_ml_active_object,
+    is_gizmo_object,
     is_modifier_disabled,
     is_modifier_local,
     is_edit_mesh_modifier
@@ -129,7 +119,7 @@ def _batch_operators(layout, pcoll, use_with_stack=False):
 def _show_in_editmode_button(modifier, layout, pcoll, use_in_list):
     row = layout.row(align=True)
 
-    if modifier.type in modifier_categories.DONT_SUPPORT_SHOW_IN_EDITMODE:
+    if not modifier_categories.supports(modifier.type, modifier_categories.SUPPORTS_SHOW_IN_EDITMODE):
         empy_icon = pcoll['EMPTY_SPACE']
         row.label(text="", translate=False, icon_value=empy_icon.icon_id)
         return
@@ -152,7 +142,7 @@ def _show_in_editmode_button(modifier, layout, pcoll, use_in_list):
 def _use_apply_on_spline_button(modifier, layout, pcoll, use_in_list):
     row = layout.row(align=True)
 
-    if modifier.type not in modifier_categories.SUPPORT_USE_APPLY_ON_SPLINE:
+    if not modifier_categories.supports(modifier.type, modifier_categories.SUPPORTS_APPLY_ON_SPLINE):
         empy_icon = pcoll['EMPTY_SPACE']
         row.label(text="", translate=False, icon_value=empy_icon.icon_id)
         return
@@ -165,9 +155,10 @@ def _use_apply_on_spline_button(modifier, layout, pcoll, use_in_list):
 
 
 def _show_on_cage_button(object, modifier, layout, pcoll, use_in_list):
-    support_show_on_cage = modifier_categories.SUPPORT_SHOW_ON_CAGE
+    modifier_flags = modifier_categories.MODIFIER_FLAGS
+    show_on_cage_flag = modifier_categories.SUPPORTS_SHOW_ON_CAGE
 
-    if modifier.type not in support_show_on_cage:
+    if not modifier_flags.get(modifier.type, 0) & show_on_cage_flag:
         return False
 
     mods = object.modifiers
@@ -176,10 +167,10 @@ def _show_on_cage_button(object, modifier, layout, pcoll, use_in_list):
     # Check if some modifier before this has show_in_editmode on
     # and doesn't have show_on_cage setting.
     is_before_show_in_editmode_on = False
-    end_index = np.clip(mod_index, 1, 99)
+    end_index = min(max(mod_index, 1), 99)
 
     for mod in mods[0:end_index]:
-        if mod.show_in_editmode and mod.type not in support_show_on_cage:
+        if mod.show_in_editmode and not modifier_flags.get(mod.type, 0) & show_on_cage_flag:
             is_before_show_in_editmode_on = True
             break
 
@@ -494,8 +485,12 @@ def _gizmo_object_settings(layout):
     op.object_name = gizmo_ob.name
     op.unhide_object = True
 
-    if gizmo_ob.type in {'EMPTY', 'LATTICE'} and "_Gizmo" in gizmo_ob.name:
-        layout.operator("object.ml_gizmo_object_delete")
+    if is_gizmo_object(gizmo_ob):
+        owner, owner_mod = get_gizmo_owner(gizmo_ob)
+        if owner_mod is not None and owner_mod != active_mod:
+            layout.label(text=f"Created for {owner.name}: {owner_mod.name}", icon='INFO')
+        else:
+            layout.operator("object.ml_gizmo_object_delete")
 
 
 def _modifier_extras_button(context, layout, use_in_popup=False):
@@ -687,6 +682,12 @@ def draw_time_props(self, context):
         row.prop(bpy.context.scene, "compact_timing", text="In Seconds")
         row = layout.row()
         row.prop(bpy.context.scene, "total_time", text="Show Total Time")
+        row = layout.row()
+        row.prop(bpy.context.scene, "cost_heatmap", text="Cost Heatmap")
+        row.prop(bpy.context.scene, "sort_modifiers_by_cost", text="Sort By Cost")
+        row = layout.row()
+        row.prop(bpy.context.scene, "show_geometry_growth", text="Geometry Growth")
+        row.operator("object.ml_profile_geometry_growth", text="", icon='FILE_REFRESH')
 
 def time_to_string(t):
     if bpy.context.scene.compact_timing == False:
@@ -751,18 +752,17 @@ def _get_all_modifier_times():
     
 prev_ms_times = {}
 
-def _get_modifier_times(mod): # we should not call it per modifier, but only once per object
-    global prev_ms_times
-    obj = get_ml_active_object()
+# The number when a modifier is disabled and should be shown as 0.0 ms
+DISABLED_MODIFIER_TIME = 0.0015
 
-    depsgraph = bpy.context.view_layer.depsgraph
-    ob_eval = obj.evaluated_get(depsgraph)
 
-    ms_times = ob_eval.modifiers[mod.name].execution_time
+def _get_modifier_time(obj, mod, mod_eval):
+    global prev_ms_times
+
+    ms_times = mod_eval.execution_time
 
     if not mod.show_viewport or not mod.show_in_editmode and bpy.context.mode == 'EDIT_MESH':
-        #the number when a modifier is disabled and should be 0.0 ms
-        ms_times = 0.0015
+        ms_times = DISABLED_MODIFIER_TIME
     else:
         if ms_times >= 1e-4:
             obj_name = obj.name
@@ -770,23 +770,138 @@ def _get_modifier_times(mod): # we should not call it per modifier, but only onc
                 prev_ms_times[obj_name] = {}
             prev_ms_times[obj_name][mod.name] = ms_times
         else:
-            obj_name = bpy.context.object.name
+            obj_name = obj.name
             if obj_name in prev_ms_times and mod.name in prev_ms_times[obj_name]:
                 ms_times = prev_ms_times[obj_name][mod.name]
     return ms_times
+
+
+def _get_modifier_times(mod): # we should not call it per modifier, but only once per object
+    obj = get_ml_active_object()
+
+    depsgraph = bpy.context.view_layer.depsgraph
+    ob_eval = obj.evaluated_get(depsgraph)
+
+    return _get_modifier_time(obj, mod, ob_eval.modifiers[mod.name])
+
+
+# Timings of the modifiers of each object shown in a list, taken once
+# per redraw of the list in filter_items:
+# object name: (time per modifier name, cumulative time per modifier name, total time)
+# Snapshots of objects which no longer exist are removed when a new
+# snapshot is taken.
+_timing_snapshots = {}
+
+
+def _take_timing_snapshot(obj):
+    depsgraph = bpy.context.view_layer.depsgraph
+    ob_eval = obj.evaluated_get(depsgraph)
+
+    times = {}
+    cumulative_times = {}
+    total = 0.0
+
+    for mod, mod_eval in zip(obj.modifiers, ob_eval.modifiers):
+        t = _get_modifier_time(obj, mod, mod_eval)
+        if t != DISABLED_MODIFIER_TIME:
+            total += t
+        times[mod.name] = t
+        cumulative_times[mod.name] = total
+
+    snapshot = (times, cumulative_times, total)
+
+    objects = bpy.data.objects
+    for obj_name in [name for name in _timing_snapshots if name not in objects]:
+        del _timing_snapshots[obj_name]
+
+    _timing_snapshots[obj.name] = snapshot
+
+    return snapshot
+
+
+def _format_count(count):
+    if count >= 1e6:
+        return f"{count / 1e6:.1f}M"
+    if count >= 1e3:
+        return f"{count / 1e3:.1f}k"
+    return str(count)
+
+
+def _draw_geometry_growth(layout, ob, mod):
+    """Draws the vertex count after the modifier, if the geometry growth
+    of the object has been profiled.
+    """
+    steps = geometry_growth.get_geometry_growth(ob)
+
+    if steps is None:
+        return
+
+    index = ob.modifiers.find(mod.name)
+    previous_bytes = steps[index][3]
+    verts, _, _, size = steps[index + 1]
+
+    row = layout.row(align=True)
+    row.scale_x = 0.6
+    row.alert = previous_bytes > 0 and size / previous_bytes >= 4
+    row.label(text=_format_count(verts))
+
+
+def _uses_timings(scene):
+    return scene.show_timings or scene.cost_heatmap or scene.sort_modifiers_by_cost
+
     
 class OBJECT_UL_modifier_list(UIList):
+    def filter_items(self, context, data, propname):
+        mods = getattr(data, propname)
+        scene = context.scene
+
+        flt_flags = []
+        if self.filter_name:
+            flt_flags = bpy.types.UI_UL_list.filter_items_by_name(
+                self.filter_name, self.bitflag_filter_item, mods, "name")
+
+        if not _uses_timings(scene):
+            flt_neworder = []
+            if self.use_filter_sort_alpha:
+                flt_neworder = bpy.types.UI_UL_list.sort_items_by_name(mods, "name")
+            return flt_flags, flt_neworder
+
+        times, _, _ = _take_timing_snapshot(data)
+
+        flt_neworder = []
+        if scene.sort_modifiers_by_cost:
+            # Disabled modifiers are shown as 0 ms, so sort them as such
+            costs = [times.get(mod.name, 0.0) for mod in mods]
+            costs = [0.0 if t == DISABLED_MODIFIER_TIME else t for t in costs]
+            order = sorted(range(len(mods)), key=lambda i: costs[i], reverse=True)
+            flt_neworder = [0] * len(mods)
+            for new_index, old_index in enumerate(order):
+                flt_neworder[old_index] = new_index
+        elif self.use_filter_sort_alpha:
+            flt_neworder = bpy.types.UI_UL_list.sort_items_by_name(mods, "name")
+
+        return flt_flags, flt_neworder
+
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
         global list_of_frozen_modifiers
         prefs = bpy.context.preferences.addons[base_package].preferences
-        show_times = bpy.context.scene.show_timings
+        scene = bpy.context.scene
+        show_times = scene.show_timings
+        show_heatmap = scene.cost_heatmap
 
         mod = item
         over_100ms = False
-        if show_times:
-                text_modifier_left = _get_modifier_times(mod)
+        cost_factor = 0.0
+        if show_times or show_heatmap:
+                snapshot = _timing_snapshots.get(data.name) or _take_timing_snapshot(data)
+                times, cumulative_times, total_time = snapshot
+                text_modifier_left = times.get(mod.name, 0.0)
                 if text_modifier_left > 0.1:
                     over_100ms = True
+                if total_time > 0 and text_modifier_left != DISABLED_MODIFIER_TIME:
+                    cost_factor = text_modifier_left / total_time
+                cumulative_percentage = (cumulative_times.get(mod.name, 0.0) / total_time * 100
+                                         if total_time > 0 else 0.0)
                 text_modifier_left = time_to_string(text_modifier_left)
         else:
             text_modifier_left = ""
@@ -818,7 +933,15 @@ class OBJECT_UL_modifier_list(UIList):
                 else:
                     row.label(text="", translate=False, icon="EDITMODE_HLT")
 
-                if show_times:
+                if show_heatmap:
+                    # Share of the stack's total time, and the cumulative
+                    # share of the stack up to this modifier
+                    row_label = row.row(align=True)
+                    row_label.scale_x = 0.9
+                    row_label.alert = over_100ms
+                    row_label.progress(factor=cost_factor, type='BAR',
+                                       text=f"{text_modifier_left} | {cumulative_percentage:.0f}%")
+                elif show_times:
                     row_label = row.row(align=True)
                     row_label.scale_x = 0.65
                     if over_100ms:
@@ -826,6 +949,10 @@ class OBJECT_UL_modifier_list(UIList):
                     row_label.label(text=text_modifier_left)
                 
                 layout.prop(mod, "name", text="", emboss=False)
+
+                if scene.show_geometry_growth:
+                    _draw_geometry_growth(layout, data, mod)
+
                 # only draw after the last edit mesh modifier
                 if is_edit_mesh_modifies and mod not in list_of_frozen_modifiers:
                     layout.label(text="", translate=False, icon_value=empy_icon.icon_id)
@@ -887,6 +1014,14 @@ class OBJECT_UL_modifier_list(UIList):
         bpy.types.Scene.show_timings = bpy.props.BoolProperty(default=True)
         bpy.types.Scene.compact_timing = bpy.props.BoolProperty(default=False)
         bpy.types.Scene.total_time = bpy.props.BoolProperty(default=False)
+        bpy.types.Scene.cost_heatmap = bpy.props.BoolProperty(
+            description="Show the evaluation time of each modifier as a bar relative to the "
+                        "total time of the stack, with the cumulative share up to the modifier")
+        bpy.types.Scene.sort_modifiers_by_cost = bpy.props.BoolProperty(
+            description="Sort the modifier list from the slowest to the fastest modifier")
+        bpy.types.Scene.show_geometry_growth = bpy.props.BoolProperty(
+            description="Show the vertex count after each modifier. The stack has to be "
+                        "profiled again after it changes")
         bpy.types.PROPERTIES_PT_options.prepend(draw_time_props)
         
     def unregister():
@@ -894,6 +1029,9 @@ class OBJECT_UL_modifier_list(UIList):
         del bpy.types.Scene.show_timings
         del bpy.types.Scene.compact_timing
         del bpy.types.Scene.total_time
+        del bpy.types.Scene.cost_heatmap
+        del bpy.types.Scene.sort_modifiers_by_cost
+        del bpy.types.Scene.show_geometry_growth
 
 class ShowNodeGroupInModifiersList(bpy.types.Operator):
     bl_idname = "object.geometry_node_show_node_group"
@@ -939,7 +1077,7 @@ class ModifierExtrasBase:
                 layout.separator()
 
             if ob.type in {'CURVE', 'FONT', 'LATTICE', 'MESH', 'SURFACE'} and active_mod:
-                if (active_mod.type in modifier_categories.HAVE_GIZMO_PROPERTY
+                if (modifier_categories.supports(active_mod.type, modifier_categories.HAS_GIZMO_PROPERTY)
                         or active_mod.type == 'UV_PROJECT'):
                     row, box = box_with_header(layout, "Gizmo", ml_props,
                                                "gizmo_object_settings_expand")
@@ -986,6 +1124,33 @@ class ModifierExtrasBase:
 
         layout.separator()
 
+        layout.operator("object.ml_gizmo_objects_batch_add", icon='EMPTY_ARROWS')
+        layout.operator("object.ml_gizmo_objects_cleanup", icon='TRASH')
+        layout.operator("object.ml_edit_mesh_backups_report", icon='EDITMODE_HLT')
+        layout.operator("object.ml_profile_geometry_growth", icon='MOD_ARRAY')
+
+        layout.separator()
+
+        layout.prop(ob, "ml_edit_mode_auto_hide")
+
+        layout.separator()
+
+        layout.label(text="Modifier Visibility Snapshots:")
+        row = layout.row(align=True)
+        row.operator("object.ml_visibility_snapshot_capture", text="Capture", icon='ADD')
+        solo_active = "Solo" in ob.ml_visibility_snapshots
+        row.operator("object.ml_modifier_solo", text="Solo", icon='SOLO_ON', depress=solo_active)
+
+        col = layout.column(align=True)
+        for snapshot in ob.ml_visibility_snapshots:
+            row = col.row(align=True)
+            row.operator("object.ml_visibility_snapshot_restore",
+                         text=snapshot.name, icon='RESTRICT_VIEW_OFF').name = snapshot.name
+            row.operator("object.ml_visibility_snapshot_remove", text="",
+                         icon='X').name = snapshot.name
+
+        layout.separator()
+
         layout.label(text="Syncronize Modifiers Between Instances:")
         layout.operator("object.ml_sync_active_modifier_between_instances", text="Active Only")
         layout.operator("object.ml_sync_all_modifiers_between_instances", text="All")
@@ -1224,7 +1389,7 @@ def modifiers_ui_with_list(context, layout, num_of_rows=False, use_in_popup=Fals
             icon = pcoll['APPLY_MODIFIER']
             sub.operator("object.ml_modifier_apply", text="", icon_value=icon.icon_id)
 
-            if active_mod.type in modifier_categories.SUPPORT_APPLY_AS_SHAPE_KEY:
+            if modifier_categories.supports(active_mod.type, modifier_categories.SUPPORTS_APPLY_AS_SHAPE_KEY):
                 icon = pcoll['APPLY_MODIFIER_AS_SHAPEKEY']
                 sub.operator("object.ml_modifier_apply_as_shapekey", text="",
                             icon_value=icon.icon_id)
@@ -1232,7 +1397,7 @@ def modifiers_ui_with_list(context, layout, num_of_rows=False, use_in_popup=Fals
                 sub.operator("object.ml_modifier_save_as_shapekey", text="",
                                 icon_value=icon.icon_id)
 
-            if active_mod.type not in modifier_categories.DONT_SUPPORT_COPY:
+            if modifier_categories.supports(active_mod.type, modifier_categories.SUPPORTS_COPY):
                 sub.operator("object.ml_modifier_copy", text="", icon='DUPLICATE')
             
             #if active_mod.use_pin_to_last:
@@ -1240,7 +1405,7 @@ def modifiers_ui_with_list(context, layout, num_of_rows=False, use_in_popup=Fals
 
         # === Gizmo object settings ===
         if ob.type in {'CURVE', 'FONT', 'LATTICE', 'MESH', 'SURFACE'} and not active_mod in list_of_frozen_modifiers and prefs.show_apply_copy_pin_bar:
-            if (active_mod.type in modifier_categories.HAVE_GIZMO_PROPERTY
+            if (modifier_categories.supports(active_mod.type, modifier_categories.HAS_GIZMO_PROPERTY)
                     or active_mod.type == 'UV_PROJECT'):
                 gizmo_ob = get_gizmo_object_from_modifier(active_mod)
 
@@ -1281,7 +1446,7 @@ def modifiers_ui_with_list(context, layout, num_of_rows=False, use_in_popup=Fals
         if active_mod.type in have_custom_layout:
             getattr(ml_modifier_layouts, active_mod.type)(col, ob, active_mod)
         else:
-            mp = DATA_PT_modifiers(context)
+            mp = ml_modifier_layouts.get_DATA_PT_modifiers()(context)
             getattr(mp, active_mod.type)(col, ob, active_mod)
 
 
@@ -5,6 +5,7 @@ from .modifiers_ui import modifiers_ui_with_list, modifiers_ui_with_stack
 from .ui_common import pin_object_button
 from .vertex_groups_ui import vertex_groups_ui
 from .attributes_ui import attributes_ui
+from .. import viewport_governor
 from ..utils import get_ml_active_object, object_type_has_modifiers
 from ... import __package__ as base_package
 
@@ -100,19 +101,95 @@ class VIEW3D_PT_ml_attributes(Panel, BasePanel):
         attributes_ui(context, layout)
 
 
+class VIEW3D_PT_ml_viewport_performance(Panel, BasePanel):
+    bl_label = "Viewport Performance"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    max_log_rows = 10
+
+    @classmethod
+    def poll(cls, context):
+        prefs = bpy.context.preferences.addons[base_package].preferences
+        return prefs.use_sidebar
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.modifier_list, "governor_enabled", text="")
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+        ml_props = context.scene.modifier_list
+
+        col = layout.column()
+        col.active = ml_props.governor_enabled
+        col.prop(ml_props, "governor_time_budget", text="Budget (ms)")
+        col.prop(ml_props, "governor_min_fps", text="Min Playback FPS")
+        col.prop(ml_props, "governor_restore_delay", text="Restore After (s)")
+        col.prop(ml_props, "governor_action")
+
+        changes = viewport_governor.get_changes(context.scene)
+        fps = viewport_governor.get_playback_fps()
+
+        layout.use_property_split = False
+        col = layout.column(align=True)
+        col.label(text=f"Degraded modifiers: {len(changes)}")
+        if fps is not None:
+            col.label(text=f"Playback: {fps:.1f} fps")
+
+        row = layout.row(align=True)
+        row.operator("object.ml_viewport_governor_restore", icon='LOOP_BACK')
+        row.operator("object.ml_viewport_governor_log_clear", icon='X')
+
+        layout.separator()
+
+        layout.label(text="Quality Profiles:")
+        row = layout.row(align=True)
+        row.operator("scene.ml_quality_profile_capture", text="Capture", icon='ADD')
+        row.operator("scene.ml_quality_profile_restore", text="Restore", icon='LOOP_BACK')
+
+        col = layout.column(align=True)
+        for profile in ml_props.quality_profiles:
+            row = col.row(align=True)
+            depress = profile.name == ml_props.active_quality_profile
+            row.operator("scene.ml_quality_profile_apply", text=profile.name,
+                         depress=depress).name = profile.name
+            row.operator("scene.ml_quality_profile_remove", text="",
+                         icon='X').name = profile.name
+
+        layout.separator()
+
+        row = layout.row(align=True)
+        row.operator("object.ml_profile_frame_range", text="Profile Frames", icon='TIME')
+        row.operator("object.ml_profile_render_settings", text="Profile Render",
+                     icon='RESTRICT_RENDER_OFF')
+
+        layout.separator()
+
+        log = viewport_governor.get_log()
+        if log:
+            col = layout.column(align=True)
+            for entry_time, action, ob_name, mod_name, cost in list(log)[-self.max_log_rows:]:
+                cost_text = f" ({cost:.1f} ms)" if cost else ""
+                col.label(text=f"{entry_time} {action}: {ob_name} > {mod_name}{cost_text}")
+
+
 def update_sidebar_category():
     bpy.utils.unregister_class(VIEW3D_PT_ml_modifiers)
     bpy.utils.unregister_class(VIEW3D_PT_ml_vertex_groups)
     bpy.utils.unregister_class(VIEW3D_PT_ml_attributes)
+    bpy.utils.unregister_class(VIEW3D_PT_ml_viewport_performance)
 
     category = bpy.context.preferences.addons[base_package].preferences.sidebar_category
     VIEW3D_PT_ml_modifiers.bl_category = category
     VIEW3D_PT_ml_vertex_groups.bl_category = category
     VIEW3D_PT_ml_attributes.bl_category = category
+    VIEW3D_PT_ml_viewport_performance.bl_category = category
 
     bpy.utils.register_class(VIEW3D_PT_ml_modifiers)
     bpy.utils.register_class(VIEW3D_PT_ml_vertex_groups)
     bpy.utils.register_class(VIEW3D_PT_ml_attributes)
+    bpy.utils.register_class(VIEW3D_PT_ml_viewport_performance)
 
 
 def register():
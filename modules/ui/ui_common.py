@@ -23,6 +23,24 @@ def box_with_header(layout, text, expand_data, expand_prop):
     return row, box
 
 
+SPARKLINE_CHARACTERS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values):
+    """Returns a string of block characters whose heights represent the
+    given values, e.g. for drawing a histogram in a label.
+    """
+    highest = max(values, default=0)
+
+    if highest <= 0:
+        return SPARKLINE_CHARACTERS[0] * len(values)
+
+    last_index = len(SPARKLINE_CHARACTERS) - 1
+
+    return "".join(SPARKLINE_CHARACTERS[round(value / highest * last_index)]
+                   for value in values)
+
+
 def favourite_modifiers_configuration_layout(context, layout):
     prefs = context.preferences.addons[base_package].preferences
     ml_props = context.window_manager.modifier_list
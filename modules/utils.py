@@ -1,6 +1,5 @@
 import bpy
 from mathutils import Matrix, Vector
-from mathutils.geometry import distance_point_to_plane
 
 from typing import Union
 from .modifier_categories import ALL_MODIFIERS_NAMES_ICONS_TYPES, HAVE_GIZMO_PROPERTY
@@ -22,6 +21,71 @@ def sync_bpy_object_props(source, dest):
             setattr(dest, p.identifier, getattr(source, p.identifier))
 
 
+def set_smooth_shading(objects, shade_smooth):
+    """Sets smooth or flat shading for all faces of the given mesh
+    objects. Each mesh is written once, even if several objects use it.
+    Meshes in Edit Mode and linked meshes are skipped.
+
+    Returns the number of meshes that were changed.
+    """
+    import numpy as np
+
+    meshes = {ob.data for ob in objects if ob.type == 'MESH'}
+    mesh_count = 0
+
+    for mesh in meshes:
+        if mesh.is_editmode or mesh.library:
+            continue
+
+        mesh.polygons.foreach_set("use_smooth", np.full(len(mesh.polygons), shade_smooth))
+        mesh.update()
+        mesh_count += 1
+
+    return mesh_count
+
+
+# Bytes per element of each attribute data type. STRING attributes are
+# not counted.
+_ATTRIBUTE_BYTES = {
+    'FLOAT': 4,
+    'INT': 4,
+    'INT8': 1,
+    'BOOLEAN': 1,
+    'FLOAT_VECTOR': 12,
+    'FLOAT2': 8,
+    'INT32_2D': 8,
+    'FLOAT_COLOR': 16,
+    'BYTE_COLOR': 4,
+    'QUATERNION': 16,
+    'FLOAT4X4': 64,
+}
+
+
+def estimate_mesh_bytes(mesh):
+    """Rough estimate of the memory used by the geometry of the mesh."""
+    size = 0
+
+    for attr in mesh.attributes:
+        size += len(attr.data) * _ATTRIBUTE_BYTES.get(attr.data_type, 0)
+
+    # Face offsets aren't stored as an attribute
+    size += len(mesh.polygons) * 4
+
+    if mesh.shape_keys:
+        size += len(mesh.shape_keys.key_blocks) * len(mesh.vertices) * 12
+
+    return size
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} GB"
+
+
 # ======================================================================
 
 def active_is_edit_mesh_modifier(mod):
@@ -89,6 +153,17 @@ def get_ml_active_object() -> Union[bpy.types.Object, None]:
     return ob
 
 
+def get_selected_and_ml_active_objects(context):
+    """Get the selected objects and the active (or pinned) object"""
+    ml_act_ob = get_ml_active_object()
+    obs = context.selected_objects.copy()
+
+    if ml_act_ob is not None and ml_act_ob not in obs:
+        obs.append(ml_act_ob)
+
+    return obs
+
+
 def is_modifier_local(object, modifier):
     """Check if the given modifier is local."""
     if object.library:
@@ -215,29 +290,57 @@ def _get_ml_collection(context):
     return ml_col
 
 
-def _create_vertex_group_from_vertices(object, vertex_indices, group_name):
-    """Create a vertex group for a modifier to use.
-    Works only in object mode."""
-    vert_group = object.vertex_groups.new(name=group_name)
-    vert_group.add(vertex_indices, 1, 'ADD')
-    return vert_group
+def _get_selected_vertex_coords(mesh):
+    """Get the local coordinates of the selected vertices of a mesh as
+    an (N, 3) array.
+    """
+    import numpy as np
+
+    verts = mesh.vertices
+    vert_count = len(verts)
+
+    select = np.empty(vert_count, dtype=bool)
+    verts.foreach_get("select", select)
 
+    if not select.any():
+        return np.empty((0, 3), dtype=np.float32)
 
-def _get_selected_points_from_curve(curve):
-    sel_points = []
+    coords = np.empty(vert_count * 3, dtype=np.float32)
+    verts.foreach_get("co", coords)
+
+    return coords.reshape(-1, 3)[select]
+
+
+def _get_selected_point_coords_from_curve(curve):
+    """Get the local coordinates of the selected control points of a
+    curve as an (N, 3) array.
+    """
+    import numpy as np
+
+    sel_coords = []
 
     for spline in curve.splines:
+        # SplinePoint.co is 4D, unlike BezierSplinePoint.co which is 3D
         if spline.type == 'BEZIER':
-            for p in spline.bezier_points:
-                if p.select_control_point:
-                    sel_points.append(p)
+            points, select_prop, co_size = spline.bezier_points, "select_control_point", 3
         else:
-            for p in spline.points:
-                if p.select:
-                    sel_points.append(p)
-                    # print(p.co)
+            points, select_prop, co_size = spline.points, "select", 4
+
+        point_count = len(points)
+        select = np.empty(point_count, dtype=bool)
+        points.foreach_get(select_prop, select)
+
+        if not select.any():
+            continue
 
-    return sel_points
+        coords = np.empty(point_count * co_size, dtype=np.float32)
+        points.foreach_get("co", coords)
+        sel_coords.append(coords.reshape(-1, co_size)[select, :3])
+
+    if not sel_coords:
+        return np.empty((0, 3), dtype=np.float32)
+
+    return np.concatenate(sel_coords)
 
 
 def _position_gizmo_object_at_object(gizmo_object, object):
@@ -252,19 +355,14 @@ def _position_gizmo_object_at_object(gizmo_object, object):
 
     if ob.type in {'CURVE', 'MESH'} and ob.mode == 'EDIT':
         if ob.type == 'MESH':
-            sel_points = [v for v in data.vertices if v.select]
+            sel_coords = _get_selected_vertex_coords(data)
         else:
-            sel_points = _get_selected_points_from_curve(data)
-        if sel_points:
+            sel_coords = _get_selected_point_coords_from_curve(data)
+        if len(sel_coords):
             place_at_verts = True
 
     if place_at_verts:
-        sel_points_coords = [v.co for v in sel_points]
-        if ob.type == 'CURVE':
-            # Make sure all coords are 3D because SplinePoint.co is
-            # 4D, unlike BezierSplinePoint.co which is 3D.
-            sel_points_coords = [co.to_3d() for co in sel_points_coords]
-        average_vert_co = sum(sel_points_coords, Vector()) / len(sel_points_coords)
+        average_vert_co = Vector(sel_coords.mean(axis=0, dtype=float))
         global_average_vert_co = ob_mat @ average_vert_co
         gizmo_object.location = global_average_vert_co
     else:
@@ -283,20 +381,31 @@ def _position_gizmo_object_at_cursor(gizmo_object):
     gizmo_object.rotation_euler = ob_mat.to_euler()
 
 
-def _match_gizmo_size_to_object(gizmo_object, object):
-    """Match the size of a gizmo to the size of the object
-    (before modifiers).
+def _match_gizmo_size_to_object(gizmo_object, object, use_evaluated_bounds=False):
+    """Match the size of a gizmo to the size of the object (before
+    modifiers unless use_evaluated_bounds is True).
     """
-    ob_scale = object.matrix_world.to_scale()
-    verts = object.data.vertices
+    import numpy as np
 
-    max_dim = 0
+    ob_scale = np.array(object.matrix_world.to_scale())
 
-    for i in range(3):
-        axis = [v.co[i] for v in verts]
-        axis_dim = (max(axis) - min(axis)) * ob_scale[i]
-        if axis_dim > max_dim:
-            max_dim = axis_dim
+    if use_evaluated_bounds or object.type != 'MESH':
+        if use_evaluated_bounds:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            bound_box = object.evaluated_get(depsgraph).bound_box
+        else:
+            bound_box = object.bound_box
+        coords = np.array([corner[:] for corner in bound_box])
+    else:
+        verts = object.data.vertices
+        if not verts:
+            return
+        coords = np.empty(len(verts) * 3, dtype=np.float32)
+        verts.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+
+    axis_dims = (coords.max(axis=0) - coords.min(axis=0)) * ob_scale
+    max_dim = max(float(axis_dims.max()), 0)
 
     max_dim_divided = max_dim / 2
     max_dim_with_offset = max_dim_divided + max_dim_divided / 9
@@ -304,7 +413,8 @@ def _match_gizmo_size_to_object(gizmo_object, object):
     gizmo_object.empty_display_size = max_dim_with_offset
 
 
-def _create_gizmo_object(self, context, modifier, placement='OBJECT', ob=None):
+def _create_gizmo_object(self, context, modifier, placement='OBJECT', ob=None, ml_col=None,
+                         update_from_editmode=True):
     """Create a gizmo (empty) object.
 
     placement: enum in {'CURSOR', 'OBJECT', 'WORLD_ORIGIN'}
@@ -312,7 +422,8 @@ def _create_gizmo_object(self, context, modifier, placement='OBJECT', ob=None):
     gizmo_ob = bpy.data.objects.new(modifier + "_Gizmo", None)
     gizmo_ob.empty_display_type = 'ARROWS'
 
-    ml_col = _get_ml_collection(context)
+    if ml_col is None:
+        ml_col = _get_ml_collection(context)
     ml_col.objects.link(gizmo_ob)
 
     prefs = bpy.context.preferences.addons[base_package].preferences
@@ -320,7 +431,7 @@ def _create_gizmo_object(self, context, modifier, placement='OBJECT', ob=None):
         ob = get_ml_active_object()
 
     # Only use update_from_editmode if necessary
-    if placement == 'OBJECT' or prefs.match_gizmo_size_to_object:
+    if update_from_editmode and (placement == 'OBJECT' or prefs.match_gizmo_size_to_object):
         if ob.mode == 'EDIT':
             ob.update_from_editmode()
 
@@ -330,70 +441,13 @@ def _create_gizmo_object(self, context, modifier, placement='OBJECT', ob=None):
         _position_gizmo_object_at_object(gizmo_ob, ob)
 
     if prefs.match_gizmo_size_to_object:
-        _match_gizmo_size_to_object(gizmo_ob, ob)
+        _match_gizmo_size_to_object(gizmo_ob, ob, prefs.match_gizmo_size_to_evaluated_bounds)
 
     return gizmo_ob
 
 
 # === Lattice ===
 
-def _calc_lattice_axis_length(vertex_coords, plane_co, plane_no):
-    max_dist = 0
-    min_dist = 0
-
-    for v in vertex_coords:
-        dist = distance_point_to_plane(v, plane_co, plane_no)
-        if dist > max_dist:
-            max_dist = dist
-        elif dist < min_dist:
-            min_dist = dist
-
-    length = max_dist + abs(min_dist)
-    return length
-
-
-def _calc_lattice_dimensions(vertex_coords, plane_co, plane_no=None):
-    normal_vecs = [Vector((1, 0, 0)), Vector((0, 1, 0)), Vector((0, 0, 1))]
-
-    # for v in normal_vecs:
-    #     v.rotate(plane_no.to_track_quat('X', 'Z'))
-
-    dims = [_calc_lattice_axis_length(vertex_coords, plane_co, normal) for normal in normal_vecs]
-    return dims
-
-
-def _calc_lattice_axis_midpoint_location(vertex_coords, plane_co, plane_no):
-    max_dist = 0
-    min_dist = 0
-
-    max_vert_co = Vector((0, 0, 0))
-    min_vert_co = Vector((0, 0, 0))
-
-    for v in vertex_coords:
-        dist = distance_point_to_plane(v, plane_co, plane_no)
-        if dist > max_dist:
-            max_dist = dist
-            max_vert_co = v
-        elif dist < min_dist:
-            min_dist = dist
-            min_vert_co = v
-
-    midpoint_co = (max_vert_co + min_vert_co) / 2
-    if midpoint_co == Vector((0, 0, 0)):
-        midpoint_co = plane_co
-    return midpoint_co
-
-
-def _calc_lattice_origin(vertex_coords, plane_co, plane_no=None):
-    normal_vecs = [Vector((1, 0, 0)), Vector((0, 1, 0)), Vector((0, 0, 1))]
-    origin = Vector((0, 0, 0))
-
-    for i, normal in enumerate(normal_vecs):
-        origin[i] = _calc_lattice_axis_midpoint_location(vertex_coords, plane_co, normal)[i]
-
-    return origin
-
-
 def _set_lattice_points(lattice_object, lattice_dimensions):
     """Set the number of points per axis for a lattice.
 
@@ -409,17 +463,42 @@ def _set_lattice_points(lattice_object, lattice_dimensions):
         setattr(lat, p, num_of_points)
 
 
-def _fit_lattice_to_selection(object, vertices, lattice_object):
-    ob_mat = object.matrix_world
-    ob_loc, ob_rot, ob_scale = ob_mat.decompose()
-    vert_locs = [Matrix.Diagonal(ob_scale) @ v.co for v in vertices]
-    avg_vert_loc = sum(vert_locs, Vector()) / len(vert_locs)
-    lat_origin = _calc_lattice_origin(vert_locs, avg_vert_loc)
+def _fit_lattice_to_selection(object, vertex_coords, lattice_object, oriented=False):
+    """Fit a lattice to the given local vertex coordinates ((N, 3)
+    array).
+
+    If oriented is True, the lattice is rotated along the principal
+    axes of the vertices, which gives a tighter fit on rotated
+    selections. Otherwise it's aligned with the object's axes.
+    """
+    import numpy as np
+
+    ob_loc, ob_rot, ob_scale = object.matrix_world.decompose()
+    coords = vertex_coords.astype(np.float64) * np.array(ob_scale)
+
+    if oriented:
+        center = coords.mean(axis=0)
+        centered = coords - center
+        # Eigenvectors of the covariance matrix, sorted from the axis
+        # with the largest spread to the smallest.
+        _, axes = np.linalg.eigh(centered.T @ centered)
+        axes = axes[:, ::-1]
+        if np.linalg.det(axes) < 0:
+            axes[:, 2] *= -1
+        projected = centered @ axes
+        min_co, max_co = projected.min(axis=0), projected.max(axis=0)
+        lat_origin = Vector(center + axes @ ((min_co + max_co) / 2))
+        lat_rot = Matrix(axes.tolist()).to_4x4()
+    else:
+        min_co, max_co = coords.min(axis=0), coords.max(axis=0)
+        lat_origin = Vector((min_co + max_co) / 2)
+        lat_rot = Matrix.Identity(4)
 
     lattice_object.matrix_world = (Matrix.Translation(ob_loc) @ ob_rot.to_matrix().to_4x4() @
-                                   Matrix.Translation(lat_origin))
+                                   Matrix.Translation(lat_origin) @ lat_rot)
 
-    dims = _calc_lattice_dimensions(vert_locs, avg_vert_loc)
+    # Treat floating point noise on flat selections as zero length
+    dims = [d if d > 1e-6 else 0 for d in (max_co - min_co).tolist()]
     # Avoid setting dimensions of a lattice to 0; it causes problems.
     ensured_dims = [d if d > 0 else 0.1 for d in dims]
 
@@ -453,118 +532,209 @@ def is_edit_mesh_modifier(mod):
                 is_edit_mesh_modifies = True
     return is_edit_mesh_modifies
 
-def _position_lattice_gizmo_object(gizmo_object):
-    """Position a lattice gizmo object"""
-    ob = get_ml_active_object()
-    mesh = ob.data
-    active_mod_index = ob.ml_modifier_active_index
-    active_mod = ob.modifiers[active_mod_index]
+def _get_vertex_group_weights(mesh, group_index):
+    """Get the weights of all vertices in the given vertex group as an
+    array. Vertices that aren't in the group get -1.
 
-    has_already_vert_group = bool(active_mod.vertex_group)
-    if has_already_vert_group:
-        vert_group_index = ob.vertex_groups[active_mod.vertex_group].index
-    else:
-        vert_group_index = None
-
-    if ob.type != 'MESH':
-        place_at_verts = False
-    elif ob.mode == 'EDIT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-        if not has_already_vert_group:
-            sel_verts = [v for v in mesh.vertices if v.select]
-            place_at_verts = len(sel_verts) >= 2
-            if place_at_verts:
-                vert_indices = [v.index for v in sel_verts]
-                vert_group = _create_vertex_group_from_vertices(ob, vert_indices, "ML_Lattice")
-                active_mod.vertex_group = vert_group.name
-        else:
-            sel_verts = [v for v in mesh.vertices if vert_group_index in
-                         [vg.group for vg in v.groups]]
-            place_at_verts = len(sel_verts) >= 2
-        bpy.ops.object.mode_set(mode='EDIT')
+    Reads the deform layer of the edit mesh in edit mode, so no mode
+    switching is needed, and mesh.vertices in object mode, so the mesh
+    isn't copied into a BMesh.
+
+    Note: Python has no bulk (foreach_get) access to vertex group
+    weights, so in both modes this is a Python loop over every vertex
+    and its groups. Only the lattice fitting that uses the result is
+    vectorized.
+    """
+    import numpy as np
+
+    if mesh.is_editmode:
+        import bmesh
+        bm = bmesh.from_edit_mesh(mesh)
+        deform_layer = bm.verts.layers.deform.active
+
+        if deform_layer is None:
+            return np.full(len(bm.verts), -1.0, dtype=np.float32)
+
+        return np.fromiter((v[deform_layer].get(group_index, -1.0) for v in bm.verts),
+                           dtype=np.float32, count=len(bm.verts))
+
+    return np.fromiter(
+        (next((g.weight for g in v.groups if g.group == group_index), -1.0)
+         for v in mesh.vertices),
+        dtype=np.float32, count=len(mesh.vertices))
+
+
+def _create_vertex_group_from_selection(object, select, group_name):
+    """Create a vertex group containing the vertices whose value in the
+    select array is True. Works in object and edit mode.
+    """
+    import numpy as np
+
+    vert_group = object.vertex_groups.new(name=group_name)
+    vert_indices = np.flatnonzero(select).tolist()
+
+    if object.mode == 'EDIT':
+        import bmesh
+        mesh = object.data
+        bm = bmesh.from_edit_mesh(mesh)
+        bm.verts.ensure_lookup_table()
+        deform_layer = bm.verts.layers.deform.verify()
+        for i in vert_indices:
+            bm.verts[i][deform_layer][vert_group.index] = 1.0
+        bmesh.update_edit_mesh(mesh)
     else:
-        if has_already_vert_group:
-            sel_verts = [v for v in mesh.vertices if vert_group_index in
-                         [vg.group for vg in v.groups]]
-            place_at_verts = len(sel_verts) >= 2
-        else:
-            place_at_verts = False
+        vert_group.add(vert_indices, 1, 'ADD')
 
-    if place_at_verts:
-        _fit_lattice_to_selection(ob, sel_verts, gizmo_object)
+    return vert_group
+
+
+def _position_lattice_gizmo_object(gizmo_object, ob=None, mod=None):
+    """Position a lattice gizmo object.
+
+    The lattice is fitted to the vertex group of the modifier or, in
+    edit mode, to the selected vertices (which are then assigned to a
+    new vertex group). Otherwise it's fitted to the whole object.
+    """
+    import numpy as np
+
+    if ob is None:
+        ob = get_ml_active_object()
+    if mod is None:
+        mod = ob.modifiers[ob.ml_modifier_active_index]
+
+    fit_coords = None
+
+    if ob.type == 'MESH':
+        mesh = ob.data
+        vert_group = ob.vertex_groups.get(mod.vertex_group) if mod.vertex_group else None
+
+        if ob.mode == 'EDIT':
+            ob.update_from_editmode()
+
+        verts = mesh.vertices
+        vert_count = len(verts)
+        fit_mask = None
+
+        if vert_group is not None:
+            fit_mask = _get_vertex_group_weights(mesh, vert_group.index) >= 0
+        elif ob.mode == 'EDIT':
+            select = np.empty(vert_count, dtype=bool)
+            verts.foreach_get("select", select)
+            if np.count_nonzero(select) >= 2:
+                vert_group = _create_vertex_group_from_selection(ob, select, "ML_Lattice")
+                mod.vertex_group = vert_group.name
+                fit_mask = select
+
+        if fit_mask is not None and np.count_nonzero(fit_mask) >= 2:
+            coords = np.empty(vert_count * 3, dtype=np.float32)
+            verts.foreach_get("co", coords)
+            fit_coords = coords.reshape(-1, 3)[fit_mask]
+
+    if fit_coords is not None:
+        prefs = bpy.context.preferences.addons[base_package].preferences
+        oriented = prefs.lattice_fit_mode == 'ORIENTED'
+        _fit_lattice_to_selection(ob, fit_coords, gizmo_object, oriented=oriented)
     else:
         _fit_lattice_to_object(ob, gizmo_object)
 
 
-def _create_lattice_gizmo_object(self, context, modifier):
+def _create_lattice_gizmo_object(self, context, modifier, ob=None, ml_col=None):
     """Create a gizmo (lattice) object"""
     lattice = bpy.data.lattices.new(modifier + "_Gizmo")
     gizmo_ob = bpy.data.objects.new(modifier + "_Gizmo", lattice)
 
-    ml_col = _get_ml_collection(context)
+    if ml_col is None:
+        ml_col = _get_ml_collection(context)
     ml_col.objects.link(gizmo_ob)
 
-    _position_lattice_gizmo_object(gizmo_ob)
+    if ob is None:
+        ob = get_ml_active_object()
+
+    _position_lattice_gizmo_object(gizmo_ob, ob, ob.modifiers[modifier])
 
     return gizmo_ob
 
 
 # ==========
 
-def assign_gizmo_object_to_modifier(self, context, modifier, placement='OBJECT', ob=None):
-    """Assign a gizmo object to the correct property of the given modifier.
+def _add_gizmo_objects_to_modifier(self, context, ob, mod, placement, ml_col,
+                                   fill_all_projectors=False, update_from_editmode=True):
+    """Create gizmo objects for the given modifier and assign them to
+    it. The view layer is not updated.
 
-    placement: enum in {'CURSOR', 'OBJECT', 'WORLD_ORIGIN'}
+    Returns a list of the created gizmo objects.
     """
-    if not ob:
-        ob = get_ml_active_object()
-    mod = ob.modifiers[modifier]
     prefs = bpy.context.preferences.addons[base_package].preferences
-    parent_gizmo = prefs.parent_new_gizmo_to_object
+    gizmo_obs = []
 
     # If modifier is UV Project, handle it differently here
     if mod.type == 'UV_PROJECT':
-        projectors = ob.modifiers[modifier].projectors
-        projector_count = ob.modifiers[modifier].projector_count
-
-        for p in projectors[0:projector_count]:
+        for p in mod.projectors[0:mod.projector_count]:
             if not p.object:
-                gizmo_ob = _create_gizmo_object(self, context, modifier, placement, ob)
+                gizmo_ob = _create_gizmo_object(self, context, mod.name, placement, ob, ml_col,
+                                                update_from_editmode)
                 p.object = gizmo_ob
-                if parent_gizmo:
-                    gizmo_ob.parent = ob
-                    gizmo_ob.matrix_parent_inverse = ob.matrix_world.inverted()
-                break
+                gizmo_obs.append(gizmo_ob)
+                if not fill_all_projectors:
+                    break
+    else:
+        if mod.type == 'LATTICE':
+            gizmo_ob = _create_lattice_gizmo_object(self, context, mod.name, ob, ml_col)
+        else:
+            gizmo_ob = _create_gizmo_object(self, context, mod.name, placement, ob, ml_col,
+                                            update_from_editmode)
 
-        return
+        if mod.type == 'ARRAY':
+            mod.use_constant_offset = False
+            mod.use_relative_offset = False
+            mod.use_object_offset = True
 
-    # If modifier is not UV Project, continue normally
-    if mod.type == 'LATTICE':
-        gizmo_ob = _create_lattice_gizmo_object(self, context, modifier)
-    else:
-        gizmo_ob = _create_gizmo_object(self, context, modifier, placement, ob)
+        setattr(mod, HAVE_GIZMO_PROPERTY[mod.type], gizmo_ob)
+        gizmo_obs.append(gizmo_ob)
+
+    gizmo_prop = "projectors" if mod.type == 'UV_PROJECT' else HAVE_GIZMO_PROPERTY[mod.type]
+    for gizmo_ob in gizmo_obs:
+        register_gizmo(gizmo_ob, ob, mod, gizmo_prop)
+
+    if prefs.parent_new_gizmo_to_object:
+        for gizmo_ob in gizmo_obs:
+            gizmo_ob.parent = ob
+            gizmo_ob.matrix_parent_inverse = ob.matrix_world.inverted()
+
+    return gizmo_obs
+
+
+def _reset_hook(context, ob, mod):
+    """If gizmo is parented in edit mode, Hook has wrong tranformation
+    if it isn't explicitly reset.
+    """
+    if mod.type == 'HOOK' and ob.mode == 'EDIT':
+        with context.temp_override(object=ob, active_object=ob):
+            bpy.ops.object.hook_reset(modifier=mod.name)
+
+
+def assign_gizmo_object_to_modifier(self, context, modifier, placement='OBJECT', ob=None):
+    """Assign a gizmo object to the correct property of the given modifier.
+
+    placement: enum in {'CURSOR', 'OBJECT', 'WORLD_ORIGIN'}
+    """
+    if not ob:
+        ob = get_ml_active_object()
+    mod = ob.modifiers[modifier]
+    prefs = bpy.context.preferences.addons[base_package].preferences
 
-    if mod.type == 'ARRAY':
-        mod.use_constant_offset = False
-        mod.use_relative_offset = False
-        mod.use_object_offset = True
+    ml_col = _get_ml_collection(context)
+    _add_gizmo_objects_to_modifier(self, context, ob, mod, placement, ml_col)
 
-    if parent_gizmo:
-        gizmo_ob.parent = ob
-        gizmo_ob.matrix_parent_inverse = ob.matrix_world.inverted()
+    if mod.type == 'UV_PROJECT':
+        return
 
+    if prefs.parent_new_gizmo_to_object:
         # Make sure modifiers use the updated transformation
         # (needed at least for Hook)
         bpy.context.view_layer.update()
 
-    gizmo_ob_prop = HAVE_GIZMO_PROPERTY[mod.type]
-
-    setattr(mod, gizmo_ob_prop, gizmo_ob)
-
-    # If gizmo is parented in edit mode, Hook has wrong tranformation
-    # if it isn't explicitly reset here.
-    if mod.type == 'HOOK' and ob.mode == 'EDIT':
-        bpy.ops.object.hook_reset(modifier=mod.name)
+    _reset_hook(context, ob, mod)
 
     if mod.type == 'LATTICE':
         if context.area.type == 'PROPERTIES':
@@ -573,6 +743,60 @@ def assign_gizmo_object_to_modifier(self, context, modifier, placement='OBJECT',
             bpy.ops.object.lattice_toggle_editmode()
 
 
+def assign_gizmo_objects_to_modifiers(self, context, objects, placement='OBJECT'):
+    """Create gizmo objects for all modifiers of the given objects that
+    can use a gizmo but don't have one yet, including empty UV Project
+    projector slots.
+
+    Unlike assign_gizmo_object_to_modifier, the gizmo collection is
+    looked up once, the view layer is updated only once at the end and
+    lattice edit mode isn't entered.
+
+    placement: enum in {'CURSOR', 'OBJECT', 'WORLD_ORIGIN'}
+
+    Returns the number of created gizmo objects.
+    """
+    ml_col = None
+    gizmo_count = 0
+    hooks_to_reset = []
+
+    for ob in objects:
+        if ob.type not in {'CURVE', 'FONT', 'LATTICE', 'MESH', 'SURFACE'} or ob.library:
+            continue
+
+        mods = [mod for mod in ob.modifiers
+                if (mod.type == 'UV_PROJECT'
+                    and any(not p.object for p in mod.projectors[0:mod.projector_count]))
+                or (mod.type in HAVE_GIZMO_PROPERTY and not get_gizmo_object_from_modifier(mod))]
+
+        if not mods:
+            continue
+
+        if ml_col is None:
+            ml_col = _get_ml_collection(context)
+
+        # Sync the edit mode data only once per object
+        if ob.mode == 'EDIT':
+            ob.update_from_editmode()
+
+        for mod in mods:
+            gizmo_obs = _add_gizmo_objects_to_modifier(self, context, ob, mod, placement, ml_col,
+                                                       fill_all_projectors=True,
+                                                       update_from_editmode=False)
+            gizmo_count += len(gizmo_obs)
+
+            if mod.type == 'HOOK' and ob.mode == 'EDIT':
+                hooks_to_reset.append((ob, mod))
+
+    if gizmo_count:
+        context.view_layer.update()
+
+    for ob, mod in hooks_to_reset:
+        _reset_hook(context, ob, mod)
+
+    return gizmo_count
+
+
 # Other gizmo functions
 # ======================================================================
 
@@ -585,7 +809,172 @@ def get_gizmo_object_from_modifier(modifier):
     return gizmo_ob
 
 
-def _delete_empty_ml_collection():
+# Gizmo registry
+# ======================================================================
+
+def register_gizmo(gizmo_object, object, modifier, prop):
+    """Store on the gizmo object which object, modifier and modifier
+    property use it.
+    """
+    gizmo_props = gizmo_object.ml_gizmo
+    gizmo_props.owner_name = object.name
+    gizmo_props.modifier_uid = modifier.persistent_uid
+    gizmo_props.property = prop
+
+
+def _modifier_uses_gizmo(modifier, gizmo_object):
+    if modifier.type == 'UV_PROJECT':
+        return any(p.object == gizmo_object for p in modifier.projectors)
+
+    gizmo_ob_prop = HAVE_GIZMO_PROPERTY.get(modifier.type)
+    return gizmo_ob_prop is not None and getattr(modifier, gizmo_ob_prop) == gizmo_object
+
+
+def get_gizmo_owner(gizmo_object):
+    """Get the object and the modifier which use the given gizmo object.
+
+    Returns a tuple (object, modifier) or (None, None) if the gizmo
+    isn't registered or isn't used by the modifier it's registered to,
+    e.g. because the owner was deleted or renamed.
+    """
+    gizmo_props = gizmo_object.ml_gizmo
+
+    if not gizmo_props.owner_name:
+        return None, None
+
+    ob = bpy.data.objects.get(gizmo_props.owner_name)
+
+    if ob is None:
+        return None, None
+
+    for mod in ob.modifiers:
+        if mod.persistent_uid == gizmo_props.modifier_uid and _modifier_uses_gizmo(mod, gizmo_object):
+            return ob, mod
+
+    return None, None
+
+
+def _get_gizmo_objects_of_modifier(modifier):
+    """Yields (gizmo object, property) for the objects assigned to the
+    gizmo properties of the modifier.
+    """
+    if modifier.type == 'UV_PROJECT':
+        for p in modifier.projectors:
+            if p.object:
+                yield p.object, "projectors"
+    elif modifier.type in HAVE_GIZMO_PROPERTY:
+        prop = HAVE_GIZMO_PROPERTY[modifier.type]
+        gizmo_ob = getattr(modifier, prop)
+        if gizmo_ob:
+            yield gizmo_ob, prop
+
+
+def update_gizmo_registry():
+    """Register gizmo objects created by the add-on which have been
+    assigned to another modifier than the one they were created for, or
+    whose owner has been renamed.
+
+    Objects which weren't created by the add-on are never registered,
+    so assigning a user's object to a modifier doesn't make it a gizmo.
+    """
+    for ob in bpy.data.objects:
+        if ob.library is not None:
+            continue
+
+        for mod in ob.modifiers:
+            for gizmo_ob, prop in _get_gizmo_objects_of_modifier(mod):
+                if gizmo_ob.library is not None or not gizmo_ob.ml_gizmo.owner_name:
+                    continue
+                if get_gizmo_owner(gizmo_ob) == (None, None):
+                    register_gizmo(gizmo_ob, ob, mod, prop)
+
+
+def is_gizmo_object(object):
+    """Check if the object is a gizmo object created by the add-on.
+
+    Gizmos created before the registry existed are recognised by their
+    name.
+    """
+    return (object.type in {'EMPTY', 'LATTICE'}
+            and (bool(object.ml_gizmo.owner_name) or "_Gizmo" in object.name))
+
+
+def _is_only_linked_to_collections(users):
+    """Check if the given IDs, which use an object, only link it to
+    collections or scenes.
+    """
+    for user in users:
+        if isinstance(user, (bpy.types.Collection, bpy.types.Scene)):
+            continue
+
+        # Deleted objects which are only kept alive by references, e.g.
+        # an object with a modifier that still references its gizmo
+        if (isinstance(user, bpy.types.Object) and not user.users_collection
+                and not user.use_fake_user):
+            continue
+
+        return False
+
+    return True
+
+
+def find_orphan_gizmo_objects():
+    """Find all gizmo objects in the file which aren't used by anything
+    except the collections they are linked to.
+
+    Anything else referencing a gizmo, e.g. a modifier, a constraint, a
+    driver, a Geometry Nodes input or a child object, keeps it.
+    """
+    candidates = {ob for ob in bpy.data.objects if ob.library is None and is_gizmo_object(ob)}
+
+    if not candidates:
+        return []
+
+    user_map = bpy.data.user_map(subset=candidates)
+
+    return [ob for ob in candidates
+            if not ob.children and _is_only_linked_to_collections(user_map[ob])]
+
+
+def _get_used_vertex_group_names(object):
+    names = set()
+
+    for mod in object.modifiers:
+        for prop in mod.bl_rna.properties:
+            if prop.type == 'STRING' and "vertex_group" in prop.identifier:
+                names.add(getattr(mod, prop.identifier))
+
+        # Geometry Nodes inputs can use vertex groups as attributes
+        if mod.type == 'NODES':
+            names.update(value for value in mod.values() if isinstance(value, str))
+
+    return names
+
+
+def find_unused_ml_vertex_groups():
+    """Find all vertex groups created by the add-on (prefixed with
+    "ML_") which aren't used by any modifier of their object.
+
+    Returns a list of (object, vertex group) tuples.
+    """
+    unused_vert_groups = []
+
+    for ob in bpy.data.objects:
+        if ob.library is not None or not ob.vertex_groups:
+            continue
+
+        ml_vert_groups = [vg for vg in ob.vertex_groups if vg.name.startswith("ML_")]
+
+        if not ml_vert_groups:
+            continue
+
+        used_names = _get_used_vertex_group_names(ob)
+        unused_vert_groups.extend((ob, vg) for vg in ml_vert_groups if vg.name not in used_names)
+
+    return unused_vert_groups
+
+
+def delete_empty_ml_collection():
     cols = bpy.data.collections
     ml_col_name = "ML_Gizmo Objects"
 
@@ -595,11 +984,19 @@ def _delete_empty_ml_collection():
             cols.remove(ml_col)
 
 
-def delete_gizmo_object(self, gizmo_object):
+def delete_gizmo_object(self, gizmo_object, modifier=None):
+    """Delete the gizmo object unless it's registered to another
+    modifier than the given one which still uses it.
+    """
     if gizmo_object:
-        if gizmo_object.type in {'EMPTY', 'LATTICE'} and "_Gizmo" in gizmo_object.name:
+        if is_gizmo_object(gizmo_object):
+            owner, owner_mod = get_gizmo_owner(gizmo_object)
+            if owner_mod is not None and owner_mod != modifier:
+                self.report({'INFO'}, f"Kept the gizmo object used by {owner.name}: {owner_mod.name}")
+                return
+
             bpy.data.objects.remove(gizmo_object)
-            _delete_empty_ml_collection()
+            delete_empty_ml_collection()
             self.report({'INFO'}, "Deleted a gizmo object")
 
 
@@ -612,6 +1009,116 @@ def delete_ml_vertex_group(object, vertex_group_name):
                 vert_group = vert_groups[vertex_group_name]
                 vert_groups.remove(vert_group)
 
+# Modifier visibility snapshots
+# ======================================================================
+
+def _read_modifier_visibility(ob):
+    import numpy as np
+
+    mods = ob.modifiers
+    uids = np.empty(len(mods), dtype=np.int32)
+    show_viewport = np.empty(len(mods), dtype=bool)
+    show_render = np.empty(len(mods), dtype=bool)
+    mods.foreach_get("persistent_uid", uids)
+    mods.foreach_get("show_viewport", show_viewport)
+    mods.foreach_get("show_render", show_render)
+
+    return uids, show_viewport, show_render
+
+
+def capture_visibility_snapshot(objects, name):
+    """Stores the viewport and render visibility of the modifiers of the
+    given objects as a snapshot with the given name on each object. An
+    existing snapshot with the same name is replaced.
+
+    Returns the number of objects a snapshot was stored on.
+    """
+    count = 0
+
+    for ob in objects:
+        if ob.library and not ob.override_library:
+            continue
+
+        snapshots = ob.ml_visibility_snapshots
+        snapshot = snapshots.get(name)
+
+        if snapshot is None:
+            snapshot = snapshots.add()
+            snapshot.name = name
+        else:
+            snapshot.modifiers.clear()
+
+        uids, show_viewport, show_render = _read_modifier_visibility(ob)
+
+        for _ in range(len(uids)):
+            snapshot.modifiers.add()
+
+        snapshot.modifiers.foreach_set("persistent_uid", uids)
+        snapshot.modifiers.foreach_set("show_viewport", show_viewport)
+        snapshot.modifiers.foreach_set("show_render", show_render)
+        count += 1
+
+    return count
+
+
+def restore_visibility_snapshot(objects, name, remove=False):
+    """Restores the modifier visibility stored in the snapshot with the
+    given name on each of the given objects. Modifiers added after the
+    snapshot was captured are left as they are.
+
+    Returns the number of objects which had the snapshot.
+    """
+    import numpy as np
+
+    count = 0
+
+    for ob in objects:
+        snapshot = ob.ml_visibility_snapshots.get(name)
+
+        if snapshot is None:
+            continue
+
+        stored = snapshot.modifiers
+        stored_uids = np.empty(len(stored), dtype=np.int32)
+        stored_viewport = np.empty(len(stored), dtype=bool)
+        stored_render = np.empty(len(stored), dtype=bool)
+        stored.foreach_get("persistent_uid", stored_uids)
+        stored.foreach_get("show_viewport", stored_viewport)
+        stored.foreach_get("show_render", stored_render)
+
+        uids, show_viewport, show_render = _read_modifier_visibility(ob)
+
+        # Match the modifiers by persistent_uid
+        is_stored = np.isin(uids, stored_uids)
+        stored_index = {uid: i for i, uid in enumerate(stored_uids.tolist())}
+        indices = np.array([stored_index[uid] for uid in uids[is_stored].tolist()], dtype=np.int64)
+
+        if len(indices):
+            show_viewport[is_stored] = stored_viewport[indices]
+            show_render[is_stored] = stored_render[indices]
+            ob.modifiers.foreach_set("show_viewport", show_viewport)
+            ob.modifiers.foreach_set("show_render", show_render)
+            # foreach_set doesn't run the RNA update
+            ob.update_tag()
+
+        if remove:
+            snapshots = ob.ml_visibility_snapshots
+            snapshots.remove(snapshots.find(name))
+
+        count += 1
+
+    return count
+
+
+def remove_visibility_snapshot(objects, name):
+    for ob in objects:
+        snapshots = ob.ml_visibility_snapshots
+        index = snapshots.find(name)
+
+        if index != -1:
+            snapshots.remove(index)
+
+
 def force_show_object(ob, select=True):
     obj_collection = ob.users_collection[0]
 
@@ -0,0 +1,375 @@
+"""Viewport performance governor.
+
+When enabled for a scene, it watches the evaluation time of modifiers
+(Modifier.execution_time) and the frame rate during playback. While the
+user is interacting with the scene or playing back animation and the
+budget is exceeded, the costliest modifiers in the scene are hidden in
+the viewport or downgraded. They are restored after the scene has been
+idle for a while, before rendering and before saving.
+
+Interaction is detected from depsgraph updates, e.g. editing or
+transforming, and from changes of the view of 3D Viewports, i.e.
+navigation. Navigation is polled with the check interval, so it's only
+detected after it has lasted that long.
+
+Only viewport settings are changed, show_render and render levels are
+never touched. The original values are stored in
+Scene.modifier_list.governor_changes, so the changes of each scene are
+kept separately and are undone together with the modifier settings.
+Autosave doesn't run save_pre, so an autosaved file can contain degraded
+modifiers; they are restored when the file is loaded. Every change is
+recorded in a log which is shown in the Viewport Performance panel.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .quality_profiles import get_stored_value, store_value
+
+
+CHECK_INTERVAL = 0.5
+
+# Seconds after the last depsgraph update during which the user is
+# considered to be interacting with the scene
+INTERACTION_WINDOW = 1.0
+
+# Modifiers which are downgraded by lowering their viewport levels
+# instead of hiding them
+_DOWNGRADABLE_TYPES = {'SUBSURF', 'MULTIRES'}
+
+MAX_LOG_ENTRIES = 200
+
+# (time string, action, object name, modifier name, cost in ms)
+_log = deque(maxlen=MAX_LOG_ENTRIES)
+
+_last_user_update = 0.0
+_ignore_updates_depth = 0
+_frame_times = deque(maxlen=12)
+
+# View matrices of the 3D Viewports at the last check
+_view_matrices = ()
+
+
+# State
+# ======================================================================
+
+def get_changes(scene):
+    return scene.modifier_list.governor_changes
+
+
+def get_log():
+    return _log
+
+
+def clear_log():
+    _log.clear()
+
+
+def get_playback_fps():
+    """Returns the frame rate measured during playback or None if there
+    aren't enough frames to measure it.
+    """
+    if len(_frame_times) < 2:
+        return None
+
+    duration = _frame_times[-1] - _frame_times[0]
+
+    if duration <= 0:
+        return None
+
+    return (len(_frame_times) - 1) / duration
+
+
+def _is_playing():
+    return any(window.screen and window.screen.is_animation_playing
+               for window in bpy.context.window_manager.windows)
+
+
+@contextmanager
+def ignore_updates():
+    """Don't treat the depsgraph updates caused in the with block as user
+    interaction, e.g. the ones caused by the governor or by profiling.
+    The depsgraph is evaluated before leaving the block, so the updates
+    are ignored no matter how long the evaluation takes.
+    """
+    global _ignore_updates_depth
+
+    _ignore_updates_depth += 1
+
+    try:
+        yield
+    finally:
+        try:
+            bpy.context.evaluated_depsgraph_get()
+        finally:
+            _ignore_updates_depth -= 1
+
+
+def _add_log_entry(action, ob_name, mod_name, cost):
+    _log.append((time.strftime("%H:%M:%S"), action, ob_name, mod_name, cost * 1000))
+
+
+# Measuring
+# ======================================================================
+
+def _get_modifier_costs(context):
+    """Returns (cost in seconds, object, modifier) for every modifier
+    which is currently evaluated in the viewport, and the total cost.
+    """
+    depsgraph = context.evaluated_depsgraph_get()
+    costs = []
+
+    for ob in context.view_layer.objects:
+        if not ob.modifiers or not ob.visible_get():
+            continue
+
+        ob_eval = ob.evaluated_get(depsgraph)
+
+        for mod, mod_eval in zip(ob.modifiers, ob_eval.modifiers):
+            if mod.show_viewport:
+                costs.append((mod_eval.execution_time, ob, mod))
+
+    return costs, sum(cost for cost, _, _ in costs)
+
+
+def _is_over_budget(ml_props, total_cost):
+    if total_cost * 1000 > ml_props.governor_time_budget:
+        return True
+
+    if _is_playing():
+        fps = get_playback_fps()
+        if fps is not None and fps < ml_props.governor_min_fps:
+            return True
+
+    return False
+
+
+def _get_view_matrices(context):
+    matrices = []
+
+    for window in context.window_manager.windows:
+        if window.screen is None:
+            continue
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                region_3d = area.spaces.active.region_3d
+                if region_3d is not None:
+                    matrices.append(tuple(map(tuple, region_3d.view_matrix)))
+
+    return tuple(matrices)
+
+
+def _is_navigating(context):
+    global _view_matrices
+
+    view_matrices = _get_view_matrices(context)
+    is_navigating = bool(_view_matrices) and view_matrices != _view_matrices
+    _view_matrices = view_matrices
+
+    return is_navigating
+
+
+# Changing and restoring
+# ======================================================================
+
+def _degrade_modifier(changes, ob, mod, use_downgrade):
+    """Hides or downgrades the modifier and records the original value.
+    Returns the name of the action.
+    """
+    if use_downgrade and mod.type in _DOWNGRADABLE_TYPES and mod.levels > 0:
+        prop = "levels"
+        value = 0
+        action = "Downgraded"
+    else:
+        prop = "show_viewport"
+        value = False
+        action = "Hidden"
+
+    change = changes.add()
+    change.object = ob
+    change.modifier_uid = mod.persistent_uid
+    change.property = prop
+    store_value(change, mod, prop)
+
+    setattr(mod, prop, value)
+
+    return action
+
+
+def _degrade_costliest(context, ml_props):
+    """Degrades the costliest modifiers until the estimated evaluation
+    time is within the budget.
+    """
+    costs, total_cost = _get_modifier_costs(context)
+
+    if not _is_over_budget(ml_props, total_cost):
+        return
+
+    changes = ml_props.governor_changes
+    changed = {(change.object, change.modifier_uid) for change in changes}
+    use_downgrade = ml_props.governor_action == 'DOWNGRADE'
+    budget = ml_props.governor_time_budget / 1000
+
+    with ignore_updates():
+        for cost, ob, mod in sorted(costs, key=lambda item: item[0], reverse=True):
+            if cost <= 0:
+                break
+
+            if (ob, mod.persistent_uid) in changed:
+                continue
+
+            if ob.library and not ob.override_library:
+                continue
+
+            action = _degrade_modifier(changes, ob, mod, use_downgrade)
+            _add_log_entry(action, ob.name, mod.name, cost)
+            total_cost -= cost
+
+            # During slow playback, take one step per check, since the
+            # frame rate can't be estimated from the costs
+            if _is_playing() or total_cost <= budget:
+                break
+
+
+def restore_all(scene, reason="Restored"):
+    """Restores every change made by the governor in the scene."""
+    changes = scene.modifier_list.governor_changes
+
+    if not changes:
+        return
+
+    with ignore_updates():
+        for change in reversed(changes):
+            ob = change.object
+
+            if ob is None:
+                continue
+
+            for mod in ob.modifiers:
+                if mod.persistent_uid == change.modifier_uid:
+                    current_value = getattr(mod, change.property)
+                    setattr(mod, change.property,
+                            type(current_value)(get_stored_value(change)))
+                    _add_log_entry(reason, ob.name, mod.name, 0.0)
+                    break
+
+        changes.clear()
+
+
+def _restore_all_scenes(reason):
+    for scene in bpy.data.scenes:
+        restore_all(scene, reason=reason)
+
+
+# Timer and handlers
+# ======================================================================
+
+def _check():
+    global _last_user_update
+
+    context = bpy.context
+    scene = context.scene
+
+    if not any(s.modifier_list.governor_enabled for s in bpy.data.scenes):
+        _restore_all_scenes("Restored")
+        return None
+
+    # Restore the changes of scenes which aren't active anymore
+    for s in bpy.data.scenes:
+        if s != scene and s.modifier_list.governor_changes:
+            restore_all(s, reason="Restored on scene change")
+
+    if scene is None or not scene.modifier_list.governor_enabled:
+        return CHECK_INTERVAL
+
+    ml_props = scene.modifier_list
+    now = time.monotonic()
+
+    if _is_navigating(context):
+        _last_user_update = now
+
+    is_active = _is_playing() or now - _last_user_update < INTERACTION_WINDOW
+
+    if is_active:
+        _degrade_costliest(context, ml_props)
+    elif ml_props.governor_changes and now - _last_user_update > ml_props.governor_restore_delay:
+        restore_all(scene, reason="Restored on idle")
+
+    return CHECK_INTERVAL
+
+
+def start():
+    if not bpy.app.timers.is_registered(_check):
+        bpy.app.timers.register(_check, first_interval=CHECK_INTERVAL)
+
+
+def stop():
+    if bpy.app.timers.is_registered(_check):
+        bpy.app.timers.unregister(_check)
+
+    _restore_all_scenes("Restored")
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    global _last_user_update
+
+    if not _ignore_updates_depth:
+        _last_user_update = time.monotonic()
+
+
+@persistent
+def _on_frame_change(scene, depsgraph):
+    if _is_playing():
+        _frame_times.append(time.monotonic())
+    else:
+        _frame_times.clear()
+
+
+@persistent
+def _restore_before_render(scene, depsgraph=None):
+    _restore_all_scenes("Restored before render")
+
+
+@persistent
+def _restore_before_save(dummy):
+    _restore_all_scenes("Restored before save")
+
+
+@persistent
+def _on_file_load(dummy):
+    global _view_matrices
+
+    _frame_times.clear()
+    _view_matrices = ()
+
+    # The file may have been saved without restoring, e.g. by autosave
+    _restore_all_scenes("Restored after loading")
+
+    if any(scene.modifier_list.governor_enabled for scene in bpy.data.scenes):
+        start()
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.frame_change_post, _on_frame_change),
+    (bpy.app.handlers.render_init, _restore_before_render),
+    (bpy.app.handlers.save_pre, _restore_before_save),
+    (bpy.app.handlers.load_post, _on_file_load),
+)
+
+
+def register():
+    for handlers, handler in _handlers:
+        handlers.append(handler)
+
+
+def unregister():
+    stop()
+
+    for handlers, handler in _handlers:
+        handlers.remove(handler)
@@ -0,0 +1,77 @@
+import csv
+import json
+
+import pytest
+
+from ...modules import modifier_profiling
+
+
+@pytest.fixture
+def frame_range_profile():
+    return {
+        "frames": [1, 2, 3, 4, 5],
+        "frame_totals": [0.003, 0.003, 0.012, 0.003, 0.003],
+        "modifiers": [
+            ("Cube", "Subdivision", 'SUBSURF', [0.002, 0.002, 0.002, 0.002, 0.002]),
+            ("Cube", "Ocean", 'OCEAN', [0.001, 0.001, 0.010, 0.001, 0.001]),
+        ],
+    }
+
+
+def test_summarize_frame_range_profile_sorts_by_peak(frame_range_profile):
+    modifier_stats, _ = modifier_profiling.summarize_frame_range_profile(frame_range_profile)
+
+    ob_name, mod_name, average, peak, peak_frame = modifier_stats[0]
+
+    assert [stats[1] for stats in modifier_stats] == ["Ocean", "Subdivision"]
+    assert (ob_name, mod_name) == ("Cube", "Ocean")
+    assert average == pytest.approx(0.0028)
+    assert peak == pytest.approx(0.010)
+    assert peak_frame == 3
+
+
+def test_summarize_frame_range_profile_finds_spikes(frame_range_profile):
+    _, spikes = modifier_profiling.summarize_frame_range_profile(
+        frame_range_profile, spike_factor=2.0)
+
+    assert spikes == [(3, 0.012, "Cube", "Ocean")]
+
+
+def test_summarize_frame_range_profile_spike_factor(frame_range_profile):
+    _, spikes = modifier_profiling.summarize_frame_range_profile(
+        frame_range_profile, spike_factor=5.0)
+
+    assert spikes == []
+
+
+def test_summarize_empty_frame_range_profile():
+    profile = {"frames": [], "frame_totals": [], "modifiers": []}
+
+    assert modifier_profiling.summarize_frame_range_profile(profile) == ([], [])
+
+
+def test_export_frame_range_profile_csv(frame_range_profile, tmp_path):
+    filepath = str(tmp_path / "profile.csv")
+    modifier_profiling.export_frame_range_profile(frame_range_profile, filepath)
+
+    with open(filepath, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ["frame", "object", "modifier", "type", "time_ms"]
+    assert len(rows) == 1 + 2 * 5
+    assert rows[3] == ["3", "Cube", "Subdivision", "SUBSURF", "2.0000"]
+    assert rows[8] == ["3", "Cube", "Ocean", "OCEAN", "10.0000"]
+
+
+def test_export_frame_range_profile_json(frame_range_profile, tmp_path):
+    filepath = str(tmp_path / "profile.JSON")
+    modifier_profiling.export_frame_range_profile(frame_range_profile, filepath)
+
+    with open(filepath, encoding="utf-8") as f:
+        data = json.load(f)
+
+    assert data["frames"] == [1, 2, 3, 4, 5]
+    assert data["frame_totals_ms"] == pytest.approx([3, 3, 12, 3, 3])
+    assert [mod["modifier"] for mod in data["modifiers"]] == ["Subdivision", "Ocean"]
+    assert data["modifiers"][1]["type"] == 'OCEAN'
+    assert data["modifiers"][1]["times_ms"] == pytest.approx([1, 1, 10, 1, 1])
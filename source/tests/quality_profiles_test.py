@@ -0,0 +1,132 @@
+import pytest
+
+import bpy
+
+from ...modules import quality_profiles
+
+
+# A Boolean solver other than 'EXACT'. The other items were renamed
+# between Blender versions, e.g. 'FAST' became 'FLOAT' in 4.5.
+OTHER_BOOLEAN_SOLVER = next(
+    item.identifier
+    for item in bpy.types.BooleanModifier.bl_rna.properties["solver"].enum_items
+    if item.identifier != 'EXACT')
+
+
+@pytest.fixture
+def scene():
+    scene = bpy.data.scenes.new("quality_profiles")
+    yield scene
+
+    bpy.data.scenes.remove(scene)
+
+
+@pytest.fixture
+def mesh_object(scene):
+    meshes = bpy.data.meshes
+    obs = bpy.data.objects
+    mesh = meshes.new(name="mesh")
+    ob = obs.new("mesh", mesh)
+    scene.collection.objects.link(ob)
+
+    subsurf = ob.modifiers.new("Subdivision", 'SUBSURF')
+    subsurf.levels = 2
+    subsurf.render_levels = 3
+    boolean = ob.modifiers.new("Boolean", 'BOOLEAN')
+    boolean.solver = 'EXACT'
+    ob.modifiers.new("Displace", 'DISPLACE')
+
+    yield ob
+
+    obs.remove(ob)
+    meshes.remove(mesh)
+
+
+def test_capture_profile_stores_quality_settings(scene, mesh_object):
+    count = quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+
+    profile = scene.modifier_list.quality_profiles["Preview"]
+    stored = {(setting.property, quality_profiles.get_stored_value(setting))
+              for setting in profile.settings}
+
+    assert count == 3
+    assert stored == {("levels", 2), ("render_levels", 3), ("solver", 'EXACT')}
+
+
+def test_capture_profile_replaces_existing_profile(scene, mesh_object):
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+    mesh_object.modifiers["Subdivision"].levels = 1
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+
+    profiles = scene.modifier_list.quality_profiles
+    levels = [quality_profiles.get_stored_value(setting)
+              for setting in profiles["Preview"].settings if setting.property == "levels"]
+
+    assert len(profiles) == 1
+    assert levels == [1]
+
+
+def test_apply_profile_and_restore_originals(scene, mesh_object):
+    subsurf = mesh_object.modifiers["Subdivision"]
+    boolean = mesh_object.modifiers["Boolean"]
+
+    subsurf.levels = 0
+    boolean.solver = OTHER_BOOLEAN_SOLVER
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+    subsurf.levels = 2
+    boolean.solver = 'EXACT'
+
+    changed_count = quality_profiles.apply_profile(scene, "Preview")
+
+    assert changed_count == 2
+    assert subsurf.levels == 0
+    assert boolean.solver == OTHER_BOOLEAN_SOLVER
+    assert scene.modifier_list.active_quality_profile == "Preview"
+
+    changed_count = quality_profiles.restore_originals(scene)
+
+    assert changed_count == 2
+    assert subsurf.levels == 2
+    assert boolean.solver == 'EXACT'
+    assert scene.modifier_list.active_quality_profile == ""
+    assert not scene.modifier_list.quality_profile_originals.settings
+
+
+def test_switching_profiles_keeps_first_originals(scene, mesh_object):
+    subsurf = mesh_object.modifiers["Subdivision"]
+
+    subsurf.levels = 0
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+    subsurf.levels = 4
+    quality_profiles.capture_profile(scene, "Final", [mesh_object])
+    subsurf.levels = 2
+
+    quality_profiles.apply_profile(scene, "Preview")
+    assert subsurf.levels == 0
+    quality_profiles.apply_profile(scene, "Final")
+    assert subsurf.levels == 4
+
+    quality_profiles.restore_originals(scene)
+    assert subsurf.levels == 2
+
+
+def test_apply_profile_skips_removed_modifiers(scene, mesh_object):
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+    mesh_object.modifiers.remove(mesh_object.modifiers["Boolean"])
+    mesh_object.modifiers["Subdivision"].levels = 1
+
+    assert quality_profiles.apply_profile(scene, "Preview") == 1
+    assert mesh_object.modifiers["Subdivision"].levels == 2
+
+
+def test_apply_missing_profile_returns_none(scene):
+    assert quality_profiles.apply_profile(scene, "Missing") is None
+
+
+def test_remove_profile_clears_active_profile(scene, mesh_object):
+    quality_profiles.capture_profile(scene, "Preview", [mesh_object])
+    quality_profiles.apply_profile(scene, "Preview")
+    quality_profiles.remove_profile(scene, "Preview")
+
+    assert "Preview" not in scene.modifier_list.quality_profiles
+    assert scene.modifier_list.active_quality_profile == ""
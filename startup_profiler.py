@@ -0,0 +1,173 @@
+"""Opt-in timing of the add-on's startup.
+
+Records the wall time of module imports, class registration, register()
+hooks and load_post handlers. Enable it by setting the environment
+variable MODIFIER_LIST_PROFILE_STARTUP to 1 (prints a table) or to json
+(prints JSON), or by enabling "Log Startup Timings" in the preferences
+(takes effect on the next startup).
+"""
+
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+ENV_VAR = "MODIFIER_LIST_PROFILE_STARTUP"
+
+# (category, name, seconds)
+_timings: list[tuple[str, str, float]] = []
+_enabled = False
+_output_format = 'TABLE'
+
+
+def _is_enabled_in_prefs() -> bool:
+    """The add-on preferences aren't registered yet when timing starts,
+    so read the setting from the preferences file directly.
+    """
+    config_dir = bpy.utils.user_resource('CONFIG')
+    prefs_file = os.path.join(config_dir, __package__, "preferences.json")
+
+    if not os.path.exists(prefs_file):
+        return False
+
+    with open(prefs_file, encoding='utf-8') as f:
+        try:
+            prefs_dict = json.load(f)
+        except json.decoder.JSONDecodeError:
+            return False
+
+    return bool(prefs_dict.get("profile_startup", False))
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def start() -> None:
+    """Clears the previous timings and checks if timing is enabled."""
+    global _enabled, _output_format
+
+    _timings.clear()
+
+    env_value = os.environ.get(ENV_VAR, "").strip().lower()
+
+    if env_value in {"", "0", "false"}:
+        _enabled = _is_enabled_in_prefs()
+        _output_format = 'TABLE'
+    else:
+        _enabled = True
+        _output_format = 'JSON' if env_value == "json" else 'TABLE'
+
+
+def record(category: str, name: str, seconds: float) -> None:
+    _timings.append((category, name, seconds))
+
+
+@contextmanager
+def timed(category: str, name: str):
+    """Records the wall time of the with block if timing is enabled."""
+    if not _enabled:
+        yield
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, name, time.perf_counter() - start_time)
+
+
+# Handlers of the add-on which are wrapped for timing:
+# (handler list, wrapper, handler)
+_wrapped_handlers = []
+
+
+def _timed_wrapper(category: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(category, f"{func.__module__}.{func.__qualname__}",
+                   time.perf_counter() - start_time)
+
+    return wrapper
+
+
+@persistent
+def _dump_after_load(dummy):
+    """Prints the timings of the load_post handlers after the first file
+    load and puts the original handlers back.
+    """
+    unwrap_handlers()
+    dump()
+
+
+def wrap_load_post_handlers(package: str) -> None:
+    """When timing is enabled, replaces the load_post handlers of the
+    add-on with timed wrappers until the first file has been loaded.
+    Call it after the modules have added their handlers.
+    """
+    if not _enabled:
+        return
+
+    handlers = bpy.app.handlers.load_post
+
+    for i, handler in enumerate(handlers):
+        if getattr(handler, "__module__", "").startswith(package + "."):
+            # functools.wraps copies the persistent flag too
+            wrapper = _timed_wrapper("load_post", handler)
+            handlers[i] = wrapper
+            _wrapped_handlers.append((handlers, wrapper, handler))
+
+    if _wrapped_handlers:
+        handlers.append(_dump_after_load)
+
+
+def unwrap_handlers() -> None:
+    """Puts the original handlers back, so they can be removed by the
+    modules which added them.
+    """
+    for handlers, wrapper, handler in _wrapped_handlers:
+        if wrapper in handlers:
+            handlers[handlers.index(wrapper)] = handler
+
+    _wrapped_handlers.clear()
+
+    if _dump_after_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_dump_after_load)
+
+
+def _print_timings(timings: list[tuple[str, str, float]]) -> None:
+    timings = sorted(timings, key=lambda timing: timing[2], reverse=True)
+
+    if _output_format == 'JSON':
+        timings_list = [{"category": category, "name": name, "ms": round(seconds * 1000, 3)}
+                        for category, name, seconds in timings]
+        print(json.dumps({"addon": __package__, "timings": timings_list}, indent=4))
+        return
+
+    name_width = max((len(name) for _, name, _ in timings), default=4)
+    category_width = max((len(category) for category, _, _ in timings), default=8)
+
+    print(f"{__package__}: Startup timings")
+    print(f"{'Category':<{category_width}}  {'Name':<{name_width}}  {'ms':>10}")
+
+    for category, name, seconds in timings:
+        print(f"{category:<{category_width}}  {name:<{name_width}}  {seconds * 1000:>10.3f}")
+
+
+def dump() -> None:
+    """Prints the recorded timings sorted from the slowest to the
+    fastest and clears them.
+    """
+    if _enabled and _timings:
+        _print_timings(_timings)
+
+    _timings.clear()